@@ -22,17 +22,26 @@ from .backend import (
     EmbeddingDynamicHandle,
     EmbeddingNamespace,
     EmbeddingSpecificModel,
+    hedged_complete,
+    hedged_respond,
     LLMDynamicHandle,
     LLMNamespace,
     LLMSpecificModel,
     LMStudioClient,
+    LMStudioRouter,
     ModelNamespace,
     SyncOngoingPrediction,
     SyncLMStudioClient,
 )
 from .dataclasses import (
+    BackpressureOpts,
     BaseLoadModelOpts,
+    ChatSession,
+    CoalesceOpts,
+    CompiledPredictionConfig,
+    DiscoveryOpts,
     DownloadedModel,
+    EarlyStopOpts,
     EmbeddingLoadModelConfig,
     InstanceReferenceModel,
     KVConfig,
@@ -66,15 +75,31 @@ from .dataclasses import (
     ModelDomainType,
     ModelQuery,
     ModelSpecifier,
+    PredictionMode,
     PredictionResult,
     QueryModel,
+    ReconnectOpts,
+    ScheduleOpts,
 )
 from .utils import (
+    AdaptiveConcurrencyLimiter,
     AsyncAbortSignal,
     ChannelError,
+    ChannelTimeoutError,
+    ConnectionLostError,
+    FairScheduler,
     get_logger,
+    JSONCodec,
+    JSONSchemaError,
+    JSONStreamError,
+    JSONStreamParser,
+    PredictionCache,
+    PredictionScheduler,
+    PRIORITY_CLASSES,
+    QueueCancelledError,
     RECV,
     RPCError,
+    RPCTimeoutError,
     SEND,
     SyncAbortSignal,
     WEBSOCKET,
@@ -86,20 +111,36 @@ The logger for the lmstudio_sdk package.
 """
 
 __all__ = [
+    "AdaptiveConcurrencyLimiter",
     "AsyncAbortSignal",
     "AsyncLMStudioClient",
     "AsyncOngoingPrediction",
+    "BackpressureOpts",
     "BaseLoadModelOpts",
+    "CoalesceOpts",
     "ChannelError",
+    "ChannelTimeoutError",
+    "ChatSession",
+    "CompiledPredictionConfig",
+    "ConnectionLostError",
     "DiagnosticsNamespace",
+    "DiscoveryOpts",
     "DownloadedModel",
     "DynamicHandle",
     "EmbeddingDynamicHandle",
+    "EarlyStopOpts",
     "EmbeddingLoadModelConfig",
     "EmbeddingNamespace",
     "EmbeddingSpecificModel",
+    "FairScheduler",
     "get_logger",
+    "hedged_complete",
+    "hedged_respond",
     "InstanceReferenceModel",
+    "JSONCodec",
+    "JSONSchemaError",
+    "JSONStreamError",
+    "JSONStreamParser",
     "KVConfig",
     "KVConfigField",
     "KVConfigLayerName",
@@ -131,15 +172,24 @@ __all__ = [
     "LLMSpecificModel",
     "LLMStructuredPredictionSetting",
     "LMStudioClient",
+    "LMStudioRouter",
     "ModelDescriptor",
     "ModelDomainType",
     "ModelNamespace",
     "ModelQuery",
     "ModelSpecifier",
+    "PredictionCache",
+    "PredictionScheduler",
+    "PredictionMode",
     "PredictionResult",
+    "PRIORITY_CLASSES",
     "QueryModel",
+    "QueueCancelledError",
+    "ReconnectOpts",
     "RECV",
     "RPCError",
+    "RPCTimeoutError",
+    "ScheduleOpts",
     "SEND",
     "SyncAbortSignal",
     "SyncLMStudioClient",
@@ -3,6 +3,7 @@
 Classes:
     AsyncLMStudioClient: asynchronous client using asyncio.
     SyncLMStudioClient: synchronous client using blocking calls.
+    LMStudioRouter: client spreading requests over several servers.
     AsyncOngoingPrediction: ongoing prediction for asynchronous clients.
     SyncOngoingPrediction: ongoing prediction for synchronous clients.
     DynamicHandle: base class for dynamic handles.
@@ -14,9 +15,18 @@ Classes:
     EmbeddingNamespace: method namespace for embedding functions.
     LLMNamespace: method namespace for LLM functions.
     ModelNamespace: method namespace for model functions.
+
+Functions:
+    hedged_complete: complete on the first of several handles to answer.
+    hedged_respond: respond on the first of several handles to answer.
 """
 
-from .client import AsyncLMStudioClient, LMStudioClient, SyncLMStudioClient
+from .client import (
+    AsyncLMStudioClient,
+    LMStudioClient,
+    LMStudioRouter,
+    SyncLMStudioClient,
+)
 from .communications import (
     AsyncOngoingPrediction,
     SyncOngoingPrediction,
@@ -27,6 +37,8 @@ from .handles import (
     EmbeddingSpecificModel,
     LLMDynamicHandle,
     LLMSpecificModel,
+    hedged_complete,
+    hedged_respond,
 )
 from .namespaces import (
     DiagnosticsNamespace,
@@ -43,10 +55,13 @@ __all__ = [
     "EmbeddingDynamicHandle",
     "EmbeddingNamespace",
     "EmbeddingSpecificModel",
+    "hedged_complete",
+    "hedged_respond",
     "LLMDynamicHandle",
     "LLMNamespace",
     "LLMSpecificModel",
     "LMStudioClient",
+    "LMStudioRouter",
     "ModelNamespace",
     "SyncOngoingPrediction",
     "SyncLMStudioClient",
@@ -1,11 +1,9 @@
 import asyncio
-import http.client
-import json
-import urllib.error
-from typing import Optional
+from typing import Optional, Union
 from typing_extensions import override
 
 
+import lmstudio_sdk.dataclasses as dc
 import lmstudio_sdk.utils as utils
 
 from .LMStudioClient import LMStudioClient
@@ -54,69 +52,95 @@ class AsyncLMStudioClient(LMStudioClient):
         diagnostics: Method namespace for server diagnostics.
     """
 
-    # TODO wait, why is this async? It's not doing anything async
     @override
     async def _is_localhost_with_given_port_lmstudio_server(
         self, port: int
     ) -> int:
-        conn = http.client.HTTPConnection("127.0.0.1", port)
         try:
-            conn.request("GET", "/lmstudio-greeting")
-            response = conn.getresponse()
-
-            if response.status != 200:
-                raise ValueError("Status is not 200.")
-
-            body = response.read().decode("utf-8")
-            json_response = json.loads(body)
-            if not json_response.get("lmstudio", False):
-                raise ValueError("Not an LM Studio server.")
-
-            return port
-        except (urllib.error.URLError, ValueError) as e:
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        except OSError as e:
+            logger.debug("Failed to connect to LM Studio on port %d.", port)
+            raise ValueError("Failed to connect to the server: %s", str(e))
+        try:
+            writer.write(
+                f"GET {utils.GREETING_PATH} HTTP/1.1\r\n"
+                f"Host: 127.0.0.1:{port}\r\n"
+                "Connection: close\r\n\r\n".encode("ascii")
+            )
+            await writer.drain()
+            response = await reader.read()
+        except OSError as e:
             logger.debug("Failed to connect to LM Studio on port %d.", port)
             raise ValueError("Failed to connect to the server: %s", str(e))
         finally:
-            conn.close()
+            writer.close()
+
+        if not utils.parse_greeting_response(response):
+            raise ValueError("Not an LM Studio server.")
+        return port
 
     @override
     async def _guess_base_url(self) -> str:
-        try:
-            port = await asyncio.wait_for(
-                asyncio.gather(
-                    *[
-                        self._is_localhost_with_given_port_lmstudio_server(
-                            port
-                        )
-                        for port in utils.lms_default_ports
-                    ],
-                    return_exceptions=True,
-                ),
-                timeout=10,
-            )
-            successful_port = next(p for p in port if isinstance(p, int))
-            logger.info(
-                "Found LM Studio server on localhost port %d.", successful_port
+        probes = [
+            asyncio.ensure_future(
+                self._is_localhost_with_given_port_lmstudio_server(port)
             )
-            return f"ws://127.0.0.1:{successful_port}"
+            for port in self._discovery_ports()
+        ]
+        try:
+            for probe in asyncio.as_completed(
+                probes, timeout=self._discovery_timeout()
+            ):
+                try:
+                    successful_port = await probe
+                except ValueError:
+                    continue
+                logger.info(
+                    "Found LM Studio server on localhost port %d.",
+                    successful_port,
+                )
+                return f"ws://127.0.0.1:{successful_port}"
         except asyncio.TimeoutError:
-            logger.error(
-                "Failed to connect to LM Studio on any of the default ports."
-            )
-            raise ValueError(
-                "Failed to connect to LM Studio on any of the default ports."
-            )
+            logger.debug("Timed out probing for LM Studio.")
+        finally:
+            for probe in probes:
+                probe.cancel()
+
+        logger.error(
+            "Failed to connect to LM Studio on any of the default ports."
+        )
+        raise ValueError(
+            "Failed to connect to LM Studio on any of the default ports."
+        )
 
     def __init__(
         self,
         base_url: Optional[str],
         client_identifier: Optional[str],
         client_passkey: Optional[str],
+        json_codec: Optional[Union[str, utils.JSONCodec]] = None,
+        timeout: Optional[float] = None,
+        reconnect: Optional[dc.ReconnectOpts] = None,
+        discovery: Optional[dc.DiscoveryOpts] = None,
+        pool_size: int = 1,
     ):
-        super().__init__(base_url, client_identifier, client_passkey)
+        super().__init__(
+            base_url,
+            client_identifier,
+            client_passkey,
+            json_codec,
+            timeout,
+            reconnect,
+            discovery,
+            pool_size,
+        )
 
     @override
     async def connect(self):
+        cached = discovered = False
+        if self.base_url is None:
+            self.base_url = self._get_cached_base_url()
+            cached = self.base_url is not None
         if self.base_url is None:
             logger.warning("base_url is None. Attempting to guess base_url.")
             try:
@@ -128,19 +152,32 @@ class AsyncLMStudioClient(LMStudioClient):
                 raise ValueError(
                     "Failed to guess base_url. Is the LM Studio server running?"
                 )
+            discovered = True
         self._validate_base_url_or_throw(self.base_url)
 
         self._create_ports(True)
 
         logger.info("Connecting to LM Studio server at %s...", self.base_url)
-        try:
-            await asyncio.gather(
-                self.llm.connect(),
-                self.embedding.connect(),
-                self.system.connect(),
-                self.diagnostics.connect(),
-            )
-        except ConnectionRefusedError:
+        results = await asyncio.gather(
+            self.llm.connect(),
+            self.embedding.connect(),
+            self.system.connect(),
+            self.diagnostics.connect(),
+            return_exceptions=True,
+        )
+        errors = [r for r in results if isinstance(r, BaseException)]
+        if errors:
+            await self.close()
+            if not isinstance(errors[0], ConnectionRefusedError):
+                raise errors[0]
+            if cached:
+                logger.warning(
+                    "Cached base_url %s is stale, discovering again.",
+                    self.base_url,
+                )
+                utils.clear_cached_base_url()
+                self.base_url = None
+                return await self.connect()
             logger.error(
                 "Failed to connect to LM Studio server at %s.", self.base_url
             )
@@ -149,6 +186,8 @@ class AsyncLMStudioClient(LMStudioClient):
             )
         logger.info("Connected to LM Studio server.")
 
+        if discovered:
+            self._cache_base_url()
         return self
 
     @override
@@ -1,7 +1,9 @@
+import os
 import urllib.parse
 from abc import ABC, abstractmethod
-from typing import Optional
+from typing import List, Optional, Union
 
+import lmstudio_sdk.dataclasses as dc
 import lmstudio_sdk.utils as utils
 import lmstudio_sdk.backend.communications as comms
 import lmstudio_sdk.backend.namespaces as ns
@@ -29,6 +31,15 @@ class LMStudioClient(ABC):
     diagnostics: ns.DiagnosticsNamespace = None
     """Method namespace for server diagnostics."""
 
+    _discovery: dc.DiscoveryOpts
+    """How to find the server if `base_url` is None."""
+
+    _lazy_connect: bool = False
+    """Whether sync ports connect on first use rather than up front."""
+
+    _pool_size: int
+    """Ports per endpoint for the llm and embedding namespaces."""
+
     def _validate_base_url_or_throw(self, base_url):
         error_msg = None
         error_info = None
@@ -78,6 +89,24 @@ class LMStudioClient(ABC):
     def _is_localhost_with_given_port_lmstudio_server(self, port: int) -> int:
         pass
 
+    def _discovery_ports(self) -> List[int]:
+        return list(self._discovery.get("ports", utils.lms_default_ports))
+
+    def _discovery_timeout(self) -> float:
+        return self._discovery.get("timeout", 1.0)
+
+    def _get_cached_base_url(self) -> Optional[str]:
+        if not self._discovery.get("cache", True):
+            return None
+        base_url = utils.get_cached_base_url()
+        if base_url is not None:
+            logger.info("Using cached LM Studio base_url %s.", base_url)
+        return base_url
+
+    def _cache_base_url(self):
+        if self._discovery.get("cache", True):
+            utils.cache_base_url(self.base_url)
+
     @abstractmethod
     def _guess_base_url(self) -> str:
         pass
@@ -129,27 +158,31 @@ class LMStudioClient(ABC):
             self.client_identifier,
         )
 
-        llm_port = ClientPort(
-            self.base_url, "llm", self.client_identifier, self.__client_passkey
-        )
-        embedding_port = ClientPort(
-            self.base_url,
-            "embedding",
-            self.client_identifier,
-            self.__client_passkey,
-        )
-        system_port = ClientPort(
-            self.base_url,
-            "system",
-            self.client_identifier,
-            self.__client_passkey,
-        )
-        diagnostics_port = ClientPort(
-            self.base_url,
-            "diagnostics",
-            self.client_identifier,
-            self.__client_passkey,
-        )
+        port_kwargs = {} if is_async else {"lazy": self._lazy_connect}
+
+        def create_port(endpoint: str) -> comms.BaseClientPort:
+            return ClientPort(
+                self.base_url,
+                endpoint,
+                self.client_identifier,
+                self.__client_passkey,
+                self._json_codec,
+                self._timeout,
+                self._reconnect,
+                **port_kwargs,
+            )
+
+        def create_pool(endpoint: str) -> comms.BaseClientPort:
+            if self._pool_size <= 1:
+                return create_port(endpoint)
+            return comms.ClientPortPool(
+                [create_port(endpoint) for _ in range(self._pool_size)]
+            )
+
+        llm_port = create_pool("llm")
+        embedding_port = create_pool("embedding")
+        system_port = create_port("system")
+        diagnostics_port = create_port("diagnostics")
 
         self.llm = ns.LLMNamespace(llm_port)
         self.embedding = ns.EmbeddingNamespace(embedding_port)
@@ -163,6 +196,11 @@ class LMStudioClient(ABC):
         base_url: Optional[str],
         client_identifier: Optional[str],
         client_passkey: Optional[str],
+        json_codec: Optional[Union[str, utils.JSONCodec]] = None,
+        timeout: Optional[float] = None,
+        reconnect: Optional[dc.ReconnectOpts] = None,
+        discovery: Optional[dc.DiscoveryOpts] = None,
+        pool_size: int = 1,
     ):
         self.client_identifier = (
             client_identifier or utils.generate_random_base64(18)
@@ -170,4 +208,10 @@ class LMStudioClient(ABC):
         self.__client_passkey = client_passkey or utils.generate_random_base64(
             18
         )
-        self.base_url = base_url
+        self.base_url = base_url or os.environ.get(utils.BASE_URL_ENV_VAR)
+        self._json_codec = utils.get_json_codec(json_codec)
+        self._timeout = timeout
+        self._reconnect = reconnect
+        self._discovery = discovery or {}
+        self._pool_size = pool_size
+        logger.debug("Using %s JSON codec.", self._json_codec.name)
@@ -1,5 +1,8 @@
 import inspect
-from typing import Any, Coroutine, Optional
+from typing import Any, Coroutine, Optional, Union
+
+import lmstudio_sdk.dataclasses as dc
+import lmstudio_sdk.utils as utils
 
 from .AsyncLMStudioClient import AsyncLMStudioClient
 from .SyncLMStudioClient import SyncLMStudioClient
@@ -10,6 +13,12 @@ def LMStudioClient(
     base_url: Optional[str] = None,
     client_identifier: Optional[str] = None,
     client_passkey: Optional[str] = None,
+    json_codec: Optional[Union[str, utils.JSONCodec]] = None,
+    timeout: Optional[float] = None,
+    reconnect: Optional[dc.ReconnectOpts] = None,
+    lazy_connect: bool = False,
+    discovery: Optional[dc.DiscoveryOpts] = None,
+    pool_size: int = 1,
 ) -> SyncLMStudioClient | Coroutine[Any, Any, AsyncLMStudioClient]:
     """Constructs an LM Studio client connected to the server.
 
@@ -17,6 +26,31 @@ def LMStudioClient(
     - base_url: The URL of the LM Studio server.
     - client_identifier: The unique identifier for the client.
     - client_passkey: The passkey for the client.
+    - json_codec: The JSON codec for packets on the wire: a `JSONCodec`,
+      or the name of one ("orjson", "msgspec", "ujson" or "json").
+      Defaults to the fastest one installed.
+    - timeout: Default timeout in seconds. RPC calls fail with
+      `RPCTimeoutError` if they get no response within it, and
+      channels (model loads, predictions) are cancelled with
+      `ChannelTimeoutError` if the server sends nothing on them
+      for that long. Defaults to waiting forever.
+    - reconnect: How to reconnect if the connection drops, see
+      `ReconnectOpts`. Pending idempotent RPCs (e.g. `tokenize`) are
+      sent again once reconnected; other pending RPCs and open channels
+      fail with `ConnectionLostError`. Defaults to 5 attempts with
+      exponential backoff from 0.1 s.
+    - lazy_connect: Connect each namespace's port on first use
+      rather than all of them up front. Synchronous client only.
+    - discovery: How to find a local server when no base URL is given,
+      see `DiscoveryOpts`. The URL found is cached on disk for later
+      clients.
+    - pool_size: Connections per endpoint for the llm and embedding
+      namespaces. With more than one, channels and RPCs go to the
+      connection with the fewest outstanding requests, so many
+      concurrent predictions are not all decoded by one receive loop.
+
+    The base URL can also be set with the `LMSTUDIO_BASE_URL`
+    environment variable.
 
     If these are not provided, the client will attempt to guess the base URL,
     and generate random values for the client identifier and passkey.
@@ -26,14 +60,38 @@ def LMStudioClient(
       connected to the server. `awaiting` this function will return the former.
 
     Raises:
-    - ValueError: If a connection cannot be established.
+    - ValueError: If a connection cannot be established,
+      or `lazy_connect` is used with the asynchronous client.
     """
     is_async = (
         inspect.currentframe().f_back.f_code.co_flags & inspect.CO_COROUTINE
     )
+    if is_async and lazy_connect:
+        raise ValueError(
+            "lazy_connect is only supported by the synchronous client."
+        )
     client = (
-        AsyncLMStudioClient(base_url, client_identifier, client_passkey)
+        AsyncLMStudioClient(
+            base_url,
+            client_identifier,
+            client_passkey,
+            json_codec,
+            timeout,
+            reconnect,
+            discovery=discovery,
+            pool_size=pool_size,
+        )
         if is_async
-        else SyncLMStudioClient(base_url, client_identifier, client_passkey)
+        else SyncLMStudioClient(
+            base_url,
+            client_identifier,
+            client_passkey,
+            json_codec,
+            timeout,
+            reconnect,
+            lazy_connect,
+            discovery,
+            pool_size,
+        )
     )
     return client.connect()
@@ -0,0 +1,185 @@
+import asyncio
+import threading
+from typing import List, Optional, Sequence
+
+import lmstudio_sdk.utils as utils
+import lmstudio_sdk.backend.communications as comms
+import lmstudio_sdk.backend.namespaces as ns
+
+from .AsyncLMStudioClient import AsyncLMStudioClient
+from .SyncLMStudioClient import SyncLMStudioClient
+
+
+logger = utils.get_logger(__name__)
+
+
+class LMStudioRouter:
+    """Client spreading requests over several LM Studio servers.
+
+    The router owns one client per server and exposes the same `llm`
+    and `embedding` namespaces as a single client. Each prediction,
+    embedding or other model call goes to the server with the fewest
+    in-flight requests among those that have the model loaded (see
+    `ClientPortRouter`).
+
+    Once connected, the router checks every `health_check_interval`
+    seconds which models each server has loaded. A server that fails
+    `max_failures` checks in a row is ejected until it passes one
+    again, so a dead server stops receiving requests without waiting
+    for them to fail.
+
+    Every call is routed on its own, so calls on one handle are not
+    pinned to a server. That is harmless for a handle naming a model by
+    identifier or path that is loaded alike on every server, since each
+    call goes to a server with that model. But calls whose model no
+    server is known to have, e.g. from a handle with an empty query or
+    an instance reference, go to any healthy server. `get_model_info`
+    may then describe the model on one server while the next
+    prediction runs on another, and a `PredictionCache` may key it on
+    the wrong model. Name models by identifier and load them the same
+    way everywhere, or use a single client where calls must stay on
+    one server.
+
+    ```python
+    router = LMStudioRouter(
+        [
+            LMStudioClient("ws://gpu-1:1234"),
+            LMStudioClient("ws://gpu-2:1234"),
+        ]
+    ).connect()
+    model = router.llm.create_dynamic_handle("llama-3.2-1b-instruct")
+    print(model.respond([{"content": "Hello!"}]).result().content)
+    router.close()
+    ```
+
+    With async clients, `await` the clients and `connect()`/`close()`.
+
+    Attributes:
+        clients: The client for each server, all sync or all async.
+        llm: Method namespace for LLM models, over all servers.
+        embedding: Method namespace for embedding models, over all servers.
+        health_check_interval: Seconds between health checks.
+        health_check_timeout: Seconds a health check may take.
+    """
+
+    def __init__(
+        self,
+        clients: Sequence[SyncLMStudioClient | AsyncLMStudioClient],
+        health_check_interval: float = 5.0,
+        health_check_timeout: Optional[float] = 2.0,
+        max_failures: int = 2,
+    ):
+        """Create a router over connected clients.
+
+        Args:
+            clients: Connected clients, one per server. The router
+                closes them when it is closed.
+            health_check_interval: Seconds between health checks.
+            health_check_timeout: Seconds a server has to answer a
+                health check before it counts as failed.
+            max_failures: Failed health checks in a row that eject
+                a server.
+        """
+        self.clients: List[SyncLMStudioClient | AsyncLMStudioClient] = list(
+            clients
+        )
+        utils._assert(
+            len(self.clients) > 0,
+            "LMStudioRouter: needs at least one client, got %d",
+            len(self.clients),
+            logger,
+        )
+        utils._assert(
+            len({isinstance(c, AsyncLMStudioClient) for c in self.clients})
+            == 1,
+            "LMStudioRouter: clients must be all sync or all async, got %s",
+            self.clients,
+            logger,
+        )
+        self.health_check_interval = health_check_interval
+        self.health_check_timeout = health_check_timeout
+        self._routers = [
+            comms.ClientPortRouter(
+                [client.llm._port for client in self.clients], max_failures
+            ),
+            comms.ClientPortRouter(
+                [client.embedding._port for client in self.clients],
+                max_failures,
+            ),
+        ]
+        self.llm = ns.LLMNamespace(self._routers[0])
+        self.embedding = ns.EmbeddingNamespace(self._routers[1])
+        self._stopped: Optional[threading.Event] = None
+        self._health_task: Optional[asyncio.Task] = None
+
+    def is_async(self) -> bool:
+        return isinstance(self.clients[0], AsyncLMStudioClient)
+
+    def refresh(self):
+        """Check the servers' health and loaded models now.
+
+        Returns:
+            In the async case, an awaitable for the check.
+        """
+        if self.is_async():
+            return asyncio.gather(
+                *[
+                    router.refresh(self.health_check_timeout)
+                    for router in self._routers
+                ]
+            )
+        for router in self._routers:
+            router.refresh(self.health_check_timeout)
+
+    def connect(self):
+        """Check the servers once, then keep checking in the background.
+
+        Returns:
+            The router, or in the async case an awaitable for it.
+        """
+        if self.is_async():
+            return self.__connect_async()
+        self.refresh()
+        self._stopped = threading.Event()
+        threading.Thread(
+            target=self.__check_health_sync,
+            args=(self._stopped,),
+            daemon=True,
+        ).start()
+        return self
+
+    async def __connect_async(self):
+        await self.refresh()
+        self._health_task = asyncio.ensure_future(self.__check_health_async())
+        return self
+
+    def __check_health_sync(self, stopped: threading.Event):
+        while not stopped.wait(self.health_check_interval):
+            self.refresh()
+
+    async def __check_health_async(self):
+        while True:
+            await asyncio.sleep(self.health_check_interval)
+            await self.refresh()
+
+    def close(self):
+        """Stop the health checks and close every client.
+
+        Returns:
+            In the async case, an awaitable for closing.
+        """
+        if self.is_async():
+            return self.__close_async()
+        if self._stopped is not None:
+            self._stopped.set()
+        for client in self.clients:
+            client.close()
+
+    async def __close_async(self):
+        if self._health_task is not None:
+            self._health_task.cancel()
+            try:
+                await self._health_task
+            except asyncio.CancelledError:
+                pass
+        await asyncio.gather(*[client.close() for client in self.clients])
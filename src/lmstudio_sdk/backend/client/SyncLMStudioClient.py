@@ -1,9 +1,13 @@
-import json
-import urllib.error
 import urllib.request
-from typing import Optional
+from concurrent.futures import (
+    as_completed,
+    ThreadPoolExecutor,
+    TimeoutError as FuturesTimeoutError,
+)
+from typing import Optional, Union
 from typing_extensions import override
 
+import lmstudio_sdk.dataclasses as dc
 import lmstudio_sdk.utils as utils
 
 from .LMStudioClient import LMStudioClient
@@ -42,6 +46,10 @@ class SyncLMStudioClient(LMStudioClient):
         print(completion)
     ```
 
+    Ports connect concurrently. With `lazy_connect=True`, each port
+    instead connects the first time its namespace is used, so e.g.
+    the diagnostics port is never opened unless needed.
+
     Attributes:
         client_identifier: Unique identifier for the client.
         base_url: Base URL for the LM Studio server.
@@ -53,38 +61,52 @@ class SyncLMStudioClient(LMStudioClient):
 
     @override
     def _is_localhost_with_given_port_lmstudio_server(self, port: int) -> int:
-        url = f"http://127.0.0.1:{port}/lmstudio-greeting"
+        url = f"http://127.0.0.1:{port}{utils.GREETING_PATH}"
         try:
-            with urllib.request.urlopen(url, timeout=5) as response:
+            with urllib.request.urlopen(
+                url, timeout=self._discovery_timeout()
+            ) as response:
                 if response.status != 200:
                     raise ValueError("Status is not 200.")
 
-                body = response.read().decode("utf-8")
-                json_response = json.loads(body)
-                if not json_response.get("lmstudio", False):
+                if not utils.is_lmstudio_greeting(response.read()):
                     raise ValueError("Not an LM Studio server.")
 
                 return port
-        except (urllib.error.URLError, ValueError) as e:
+        except (OSError, ValueError) as e:
             raise ValueError("Failed to connect to the server: %s", str(e))
 
     @override
     def _guess_base_url(self) -> str:
-        for port in utils.lms_default_ports:
-            try:
-                successful_port = (
-                    self._is_localhost_with_given_port_lmstudio_server(port)
-                )
+        ports = self._discovery_ports()
+        pool = ThreadPoolExecutor(max(len(ports), 1))
+        probes = {
+            pool.submit(
+                self._is_localhost_with_given_port_lmstudio_server, port
+            ): port
+            for port in ports
+        }
+        try:
+            for probe in as_completed(
+                probes, timeout=self._discovery_timeout()
+            ):
+                try:
+                    successful_port = probe.result()
+                except ValueError:
+                    logger.debug(
+                        "Failed to connect to LM Studio on port %d.",
+                        probes[probe],
+                    )
+                    continue
                 logger.info(
                     "Found LM Studio server on localhost port %d.",
                     successful_port,
                 )
                 return f"ws://127.0.0.1:{successful_port}"
-            except ValueError:
-                logger.debug(
-                    "Failed to connect to LM Studio on port %d.", port
-                )
-                continue
+        except FuturesTimeoutError:
+            logger.debug("Timed out probing for LM Studio.")
+        finally:
+            pool.shutdown(wait=False, cancel_futures=True)
 
         logger.error(
             "Failed to connect to LM Studio on any of the default ports."
@@ -101,11 +123,31 @@ class SyncLMStudioClient(LMStudioClient):
         base_url: Optional[str],
         client_identifier: Optional[str],
         client_passkey: Optional[str],
+        json_codec: Optional[Union[str, utils.JSONCodec]] = None,
+        timeout: Optional[float] = None,
+        reconnect: Optional[dc.ReconnectOpts] = None,
+        lazy_connect: bool = False,
+        discovery: Optional[dc.DiscoveryOpts] = None,
+        pool_size: int = 1,
     ):
-        super().__init__(base_url, client_identifier, client_passkey)
+        super().__init__(
+            base_url,
+            client_identifier,
+            client_passkey,
+            json_codec,
+            timeout,
+            reconnect,
+            discovery,
+            pool_size,
+        )
+        self._lazy_connect = lazy_connect
 
     @override
     def connect(self):
+        cached = discovered = False
+        if self.base_url is None:
+            self.base_url = self._get_cached_base_url()
+            cached = self.base_url is not None
         if self.base_url is None:
             logger.warning("base_url is None. Attempting to guess base_url.")
             try:
@@ -117,24 +159,28 @@ class SyncLMStudioClient(LMStudioClient):
                 raise ValueError(
                     "Failed to guess base_url. Is the LM Studio server running?"
                 )
+            discovered = True
         self._validate_base_url_or_throw(self.base_url)
 
         self._create_ports(False)
         logger.info("Connecting to LM Studio server at %s...", self.base_url)
+        namespaces = [self.llm, self.embedding, self.system, self.diagnostics]
         try:
-            self.llm.connect()
-            logger.debug("LLM port connected, connecting to embedding port...")
-            self.embedding.connect()
-            logger.debug(
-                "Embedding port connected, connecting to system port..."
-            )
-            self.system.connect()
-            logger.debug(
-                "System port connected, connecting to diagnostics port..."
-            )
-            self.diagnostics.connect()
+            # each port waits on its own handshake, so wait on all at once
+            with ThreadPoolExecutor(len(namespaces)) as pool:
+                for _ in pool.map(lambda n: n.connect(), namespaces):
+                    pass
             logger.info("Connected to LM Studio server.")
         except ConnectionRefusedError:
+            self.close()
+            if cached:
+                logger.warning(
+                    "Cached base_url %s is stale, discovering again.",
+                    self.base_url,
+                )
+                utils.clear_cached_base_url()
+                self.base_url = None
+                return self.connect()
             logger.error(
                 "Failed to connect to LM Studio server at %s.", self.base_url
             )
@@ -142,6 +188,8 @@ class SyncLMStudioClient(LMStudioClient):
                 "Failed to connect to LM Studio server at %s.", self.base_url
             )
 
+        if discovered:
+            self._cache_base_url()
         return self
 
     @override
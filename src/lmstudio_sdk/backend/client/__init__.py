@@ -3,6 +3,7 @@
 Classes:
     AsyncLMStudioClient: asynchronous client using asyncio.
     SyncLMStudioClient: synchronous client using blocking calls.
+    LMStudioRouter: client spreading requests over several servers.
 
 Methods:
     LMStudioClient: creates either client based on the context.
@@ -12,10 +13,12 @@ Each client is meant to mirror the TypeScript SDK as closely as possible.
 
 from .AsyncLMStudioClient import AsyncLMStudioClient
 from .LMStudioClientFactory import LMStudioClient
+from .LMStudioRouter import LMStudioRouter
 from .SyncLMStudioClient import SyncLMStudioClient
 
 __all__ = [
     "AsyncLMStudioClient",
     "LMStudioClient",
+    "LMStudioRouter",
     "SyncLMStudioClient",
 ]
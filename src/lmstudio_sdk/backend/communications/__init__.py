@@ -8,7 +8,13 @@ part of the public API. See the `ongoing_prediction`
 submodule for more information.
 """
 
-from ._client_port import AsyncClientPort, BaseClientPort, SyncClientPort
+from ._client_port import (
+    AsyncClientPort,
+    BaseClientPort,
+    ClientPortPool,
+    ClientPortRouter,
+    SyncClientPort,
+)
 from .ongoing_prediction import (
     AsyncOngoingPrediction,
     BaseOngoingPrediction,
@@ -1,9 +1,9 @@
 import asyncio
-import json
 import websockets
 from typing import Any, Callable, Optional
 from typing_extensions import override
 
+import lmstudio_sdk.dataclasses as dc
 import lmstudio_sdk.utils as utils
 
 from .BaseClientPort import BaseClientPort
@@ -18,13 +18,36 @@ class AsyncClientPort(BaseClientPort):
     See `BaseClientPort` for more information.
     """
 
-    def __init__(self, uri: str, endpoint: str, identifier: str, passkey: str):
-        super().__init__(uri, endpoint, identifier, passkey)
+    def __init__(
+        self,
+        uri: str,
+        endpoint: str,
+        identifier: str,
+        passkey: str,
+        codec: Optional[utils.JSONCodec] = None,
+        timeout: Optional[float] = None,
+        reconnect: Optional[dc.ReconnectOpts] = None,
+    ):
+        super().__init__(
+            uri, endpoint, identifier, passkey, codec, timeout, reconnect
+        )
         self.running = False
         self.receive_task = None
+        self._reconnected: Optional[asyncio.Future] = None
 
     @override
     async def connect(self):
+        self._closing = False
+        await self.__open()
+        self.running = True
+        logger.websocket(
+            "Async port authenticated: %s. Establishing receive task.",
+            self.endpoint,
+        )
+        self.receive_task = asyncio.create_task(self.__receive_messages())
+
+    async def __open(self):
+        """Open the WebSocket and send the authentication packet."""
         logger.websocket("Connecting to WebSocket at %s...", self.uri)
         self._websocket = await websockets.connect(self.uri)
         logger.websocket(
@@ -34,7 +57,7 @@ class AsyncClientPort(BaseClientPort):
             self.identifier,
         )
         await self._websocket.send(
-            json.dumps(
+            self._codec.dumps(
                 {
                     "authVersion": self._auth_version,
                     "clientIdentifier": self.identifier,
@@ -42,16 +65,14 @@ class AsyncClientPort(BaseClientPort):
                 }
             )
         )
-        self.running = True
-        logger.websocket(
-            "Async port authenticated: %s. Establishing receive task.",
-            self.endpoint,
-        )
-        self.receive_task = asyncio.create_task(self.__receive_messages())
 
     @override
     async def close(self):
         self.running = False
+        self._closing = True
+        if self._reconnecting and self.receive_task:
+            # don't wait out the backoff
+            self.receive_task.cancel()
         if self._websocket:
             logger.websocket(
                 "Closing WebSocket connection on async port %s...",
@@ -71,6 +92,10 @@ class AsyncClientPort(BaseClientPort):
                 logger.websocket(
                     "Receive task timed out on async port %s.", self.endpoint
                 )
+            except asyncio.CancelledError:
+                logger.websocket(
+                    "Reconnect cancelled on async port %s.", self.endpoint
+                )
             except asyncio.TimeoutError:
                 logger.error(
                     "Receive task did not complete in time on async port %s!",
@@ -84,7 +109,19 @@ class AsyncClientPort(BaseClientPort):
         from the WebSocket connection. When a message is received, it is logged
         and passed to the `_handle_data` method for processing, after which
         the method waits for the next message.
+
+        If the connection drops without `close` having been called, it
+        also supervises reconnecting, then resumes receiving.
         """
+        while True:
+            reason = await self.__receive_until_closed()
+            if self._closing or not await self.__reconnect(reason):
+                break
+        self.running = False
+
+    async def __receive_until_closed(self) -> str:
+        """Receive until the connection closes, returning why."""
+        reason = "connection closed"
         try:
             while self.running:
                 assert self._websocket is not None
@@ -93,13 +130,17 @@ class AsyncClientPort(BaseClientPort):
                 )
                 message = await self._websocket.recv()
 
-                data = json.loads(message)
+                data = self._codec.loads(message)
                 logger.recv(
                     "Message received on async port %s:\n%s",
                     self.endpoint,
-                    utils.pretty_print(data),
+                    utils.lazy_pretty_print(data),
                 )
-                self._handle_data(data)
+                paused = self._handle_data(data)
+                if isinstance(paused, asyncio.Future):
+                    # a slow consumer's queue is full: stop reading,
+                    # so the server is held back instead
+                    await paused
         except AssertionError:
             logger.error(
                 "WebSocket connection not established in \
@@ -112,8 +153,49 @@ class AsyncClientPort(BaseClientPort):
             )
         except websockets.ConnectionClosedError as e:
             logger.error("WebSocket connection closed with error: %s", str(e))
+            reason = str(e)
+        return reason
+
+    async def __reconnect(self, reason: str) -> bool:
+        """Reconnect with backoff after the connection dropped.
+
+        Sends made meanwhile wait for the outcome in `_send_payload`.
+
+        Returns:
+            Whether the connection was restored.
+        """
+        self._reconnecting = True
+        self._reconnected = asyncio.get_running_loop().create_future()
+        self._on_connection_lost(reason)
+        try:
+            for attempt, delay in enumerate(self._reconnect_delays(), 1):
+                await asyncio.sleep(delay)
+                if self._closing:
+                    break
+                try:
+                    await self.__open()
+                except (OSError, websockets.WebSocketException) as e:
+                    logger.warning(
+                        "Reconnect attempt %d to %s failed: %s",
+                        attempt,
+                        self.uri,
+                        e,
+                    )
+                    reason = str(e)
+                    continue
+                logger.info(
+                    "Reconnected to %s after %d attempt(s).", self.uri, attempt
+                )
+                for payload in self._resend_rpcs():
+                    await self._websocket.send(self._codec.dumps(payload))
+                self._reconnected.set_result(True)
+                return True
+            self._on_reconnect_failed(reason)
+            return False
         finally:
-            self.running = False
+            self._reconnecting = False
+            if not self._reconnected.done():
+                self._reconnected.set_result(False)
 
     @override
     async def _send_payload(
@@ -122,6 +204,10 @@ class AsyncClientPort(BaseClientPort):
         extra: Optional[dict] = None,
         postprocess: Optional[Callable[[dict], Any]] = None,
     ):
+        if self._reconnecting and not await asyncio.shield(self._reconnected):
+            raise utils.ConnectionLostError(
+                "Connection to %s lost and could not be restored." % self.uri
+            )
         if not self._websocket:
             logger.error(
                 "Attempted to send payload, \
@@ -132,9 +218,9 @@ class AsyncClientPort(BaseClientPort):
         logger.send(
             "Sending payload on async port %s:\n%s",
             self.endpoint,
-            utils.pretty_print(payload),
+            utils.lazy_pretty_print(payload),
         )
-        await self._websocket.send(json.dumps(payload))
+        await self._websocket.send(self._codec.dumps(payload))
         if postprocess:
             return postprocess(extra)
         return extra
@@ -148,42 +234,75 @@ class AsyncClientPort(BaseClientPort):
         return asyncio.Future()
 
     @override
-    async def _call_rpc(
+    def _arm_timer(self, delay: float, callback: Callable[[], None]):
+        return asyncio.get_running_loop().call_later(delay, callback)
+
+    @override
+    def _call_rpc(
         self,
         payload: dict,
-        complete: asyncio.Event,
-        result: dict,
+        pending: asyncio.Future,
         postprocess: Callable[[dict], Any],
         extra: Optional[dict] = None,
-    ):
-        await self._send_payload(payload)
-        logger.debug(
-            "Waiting for RPC call to complete to %s...",
-            payload.get("endpoint", "unknown"),
-        )
-        # TODO that's not very asynchronous of you:
-        # this blocks anyway! should return a Future or similar
-        await complete.wait()
+        timeout: Optional[float] = None,
+    ) -> asyncio.Future:
+        call_id = payload["callId"]
+        result = asyncio.get_running_loop().create_future()
 
-        if "error" in result:
-            logger.error(
-                "Error in RPC call: %s",
-                utils.pretty_print_error(result.get("error")),
-            )
-            raise utils.RPCError(
-                "Error in RPC call: %s",
-                result.get("error").get("title", "Unknown error"),
-            )
+        def on_response(response: asyncio.Future):
+            if result.done() or response.cancelled():
+                return
+            try:
+                result.set_result(
+                    self._process_rpc_result(
+                        response.result(), postprocess, extra
+                    )
+                )
+            except Exception as e:
+                result.set_exception(e)
 
-        result = result.get("result", result)
-        if isinstance(result, dict):
-            result.update({"extra": extra})
-        else:
-            result = {"result": result, "extra": extra}
+        def on_sent(send: asyncio.Task):
+            if send.cancelled() or send.exception() is not None:
+                self._forget_rpc(call_id)
+                if not result.done():
+                    if send.cancelled():
+                        result.cancel()
+                    else:
+                        result.set_exception(send.exception())
 
-        def process_result(x):
-            if isinstance(x, dict):
-                return x.get("result", x)
-            return x
+        def on_timeout():
+            self._forget_rpc(call_id)
+            if not result.done():
+                logger.error(
+                    "RPC call to %s timed out after %.3f s.",
+                    payload.get("endpoint", "unknown"),
+                    timeout,
+                )
+                result.set_exception(
+                    utils.RPCTimeoutError(
+                        "RPC call to %s timed out after %.3f s."
+                        % (payload.get("endpoint", "unknown"), timeout)
+                    )
+                )
 
-        return process_result(postprocess(result))
+        timer = None
+        if timeout is not None:
+            timer = self._arm_timer(timeout, on_timeout)
+
+        def on_done(result: asyncio.Future):
+            if timer is not None:
+                timer.cancel()
+            # the caller gave up on the call, e.g. `asyncio.wait_for`
+            if result.cancelled():
+                self._forget_rpc(call_id)
+
+        pending.add_done_callback(on_response)
+        result.add_done_callback(on_done)
+        # tasks start in creation order, so calls go out in order
+        send = asyncio.ensure_future(self._send_payload(payload))
+        send.add_done_callback(on_sent)
+        logger.debug(
+            "RPC call to %s sent in the background.",
+            payload.get("endpoint", "unknown"),
+        )
+        return result
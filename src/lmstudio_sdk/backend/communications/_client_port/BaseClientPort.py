@@ -1,14 +1,42 @@
 import asyncio
 import threading
+import time
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, Iterator, List, Optional
 
+import lmstudio_sdk.dataclasses as dc
 import lmstudio_sdk.utils as utils
 
 
 logger = utils.get_logger(__name__)
 
 
+IDEMPOTENT_RPC_ENDPOINTS = frozenset(
+    [
+        "applyPromptTemplate",
+        "countTokens",
+        "embedString",
+        "getLoadConfig",
+        "getModelInfo",
+        "listDownloadedModels",
+        "listLoaded",
+        "tokenize",
+    ]
+)
+"""RPCs that are safe to send again after a reconnect."""
+
+
+class _ChannelDeadline:
+    """Tracks when a channel times out if the server goes quiet."""
+
+    __slots__ = ("expires_at", "timeout", "timer")
+
+    def __init__(self, timeout: float, timer: Any):
+        self.expires_at = time.monotonic() + timeout
+        self.timeout = timeout
+        self.timer = timer
+
+
 class BaseClientPort(ABC):
     """Abstract class describing a client port for LM Studio communication.
 
@@ -32,14 +60,36 @@ class BaseClientPort(ABC):
     where we need to tie abort callbacks to the channel ID (which is not
     determined until after the call is made), it's a bit of a mess.
 
+    RPC calls and channels can be given a timeout, falling back to
+    `default_timeout`. An RPC times out if no response arrives within
+    the timeout. A channel times out if the server sends nothing on it
+    for that long: its handler is removed and called with a
+    `channelError` packet carrying a `ChannelTimeoutError`, and a
+    cancel message is sent so the server stops working on it too.
+
+    If the connection drops without `close` having been called, the
+    backend reconnects with exponential backoff as configured by
+    `reconnect` (see `_reconnect_delays`). Open channels are failed
+    straight away with `ConnectionLostError`, since the server forgets
+    them. Pending RPCs in `IDEMPOTENT_RPC_ENDPOINTS` are kept and sent
+    again once reconnected; other pending RPCs fail with
+    `ConnectionLostError`, as they may or may not have taken effect.
+
     Attributes:
         uri: Full URI for the client connection.
         endpoint: Endpoint for the client, e.g. "llm".
         identifier: Unique identifier for the client.
         _passkey: Passkey for the client.
         _websocket: WebSocket instance (will differ by backend).
+        _codec: JSON codec used to encode and decode packets.
+        default_timeout: Timeout in seconds for calls and channels
+            that do not specify one. None means wait forever.
+        reconnect: Options for reconnecting after the connection drops.
         channel_handlers: Handler callbacks for channel messages.
-        rpc_handlers: Handler callbacks for RPC calls.
+        rpc_handlers: Future-likes for pending RPC calls, resolved
+            with the raw `rpcResult`/`rpcError` packet.
+        _rpc_payloads: Packets of pending RPCs, kept to resend them.
+        _rpc_retries: Call IDs to resend once reconnected.
     """
 
     _auth_version = 1
@@ -48,14 +98,31 @@ class BaseClientPort(ABC):
     __channel_id_lock = threading.Lock()
     __rpc_call_id_lock = threading.Lock()
 
-    def __init__(self, uri: str, endpoint: str, identifier: str, passkey: str):
+    def __init__(
+        self,
+        uri: str,
+        endpoint: str,
+        identifier: str,
+        passkey: str,
+        codec: Optional[utils.JSONCodec] = None,
+        timeout: Optional[float] = None,
+        reconnect: Optional[dc.ReconnectOpts] = None,
+    ):
         self.uri = uri + "/" + endpoint
         self.endpoint = endpoint
         self.identifier = identifier
         self._passkey = passkey
         self._websocket = None
+        self._codec = codec or utils.get_json_codec()
+        self.default_timeout = timeout
+        self.reconnect = reconnect or {}
         self.channel_handlers: Dict[int, Callable] = {}
-        self.rpc_handlers: Dict[int, Callable] = {}
+        self.rpc_handlers: Dict[int, asyncio.Future | utils.PseudoFuture] = {}
+        self._channel_deadlines: Dict[int, _ChannelDeadline] = {}
+        self._rpc_payloads: Dict[int, dict] = {}
+        self._rpc_retries: List[int] = []
+        self._closing = False
+        self._reconnecting = False
 
     @abstractmethod
     def connect(self):
@@ -67,6 +134,14 @@ class BaseClientPort(ABC):
         """Close the connection to the server on all ports."""
         pass
 
+    def _ensure_connected(self):
+        """Connect now if connecting was deferred to first use.
+
+        Called before anything is sent. Ports always connect eagerly
+        unless the backend overrides this.
+        """
+        pass
+
     @abstractmethod
     def _send_payload(
         self,
@@ -98,10 +173,10 @@ class BaseClientPort(ABC):
     def _call_rpc(
         self,
         payload: dict,
-        complete: threading.Event | asyncio.Event,
-        result: dict,
+        pending: asyncio.Future | utils.PseudoFuture,
         postprocess: Callable[[dict], Any],
         extra: Optional[dict],
+        timeout: Optional[float],
     ):
         """Backend: send an RPC to the server.
 
@@ -110,14 +185,18 @@ class BaseClientPort(ABC):
 
         Args:
             payload: JSON payload to send.
-            complete: Event to set when the RPC completes.
-            result: Dictionary to store the result of the RPC.
+            pending: Future-like registered in `rpc_handlers`, which
+                is resolved with the raw response packet.
             postprocess: Callback to process the response. Not to be confused
                 with the `postprocess` argument to `_send_payload`.
             extra: Extra data to `postprocess`.
+            timeout: Seconds to wait for the response, or None.
+                On timeout, the call is removed from `rpc_handlers`
+                and `RPCTimeoutError` is raised.
 
         Returns:
-            The result of the RPC, after postprocessing.
+            The result of the RPC, after postprocessing, or in the
+            async case a Future resolving to it.
         """
         pass
 
@@ -131,6 +210,19 @@ class BaseClientPort(ABC):
         """Dependency inject a Future-like."""
         pass
 
+    @abstractmethod
+    def _arm_timer(self, delay: float, callback: Callable[[], None]) -> Any:
+        """Dependency inject a timer.
+
+        Args:
+            delay: Seconds after which to call `callback`.
+            callback: Called once the delay has passed.
+
+        Returns:
+            A handle with a `cancel()` method.
+        """
+        pass
+
     @classmethod
     def __get_next_channel_id(cls):
         with cls.__channel_id_lock:
@@ -145,6 +237,139 @@ class BaseClientPort(ABC):
             cls.__next_rpc_call_id += 1
         return call_id
 
+    def _process_rpc_result(
+        self,
+        data: dict,
+        postprocess: Callable[[dict], Any],
+        extra: Optional[dict],
+    ):
+        """Turn a raw RPC response packet into the caller's result.
+
+        Args:
+            data: The `rpcResult`/`rpcError` packet from the server.
+            postprocess: Callback to process the response.
+            extra: Extra data to `postprocess`.
+
+        Returns:
+            The result of the RPC, after postprocessing.
+
+        Raises:
+            RPCError: If the server responded with an error.
+        """
+        if "error" in data:
+            logger.error(
+                "Error in RPC call: %s",
+                utils.pretty_print_error(data.get("error")),
+            )
+            raise utils.RPCError(
+                "Error in RPC call: %s",
+                data.get("error").get("title", "Unknown error"),
+            )
+
+        result = data.get("result", data)
+        if isinstance(result, dict):
+            result.update({"extra": extra})
+        else:
+            result = {"result": result, "extra": extra}
+
+        processed = postprocess(result)
+        if isinstance(processed, dict):
+            return processed.get("result", processed)
+        return processed
+
+    def _forget_rpc(self, call_id: int):
+        """Stop tracking an RPC call, e.g. once it timed out."""
+        self.rpc_handlers.pop(call_id, None)
+        self._rpc_payloads.pop(call_id, None)
+
+    def _reconnect_delays(self) -> Iterator[float]:
+        """Yield the wait before each reconnect attempt."""
+        delay = self.reconnect.get("initial_delay", 0.1)
+        max_delay = self.reconnect.get("max_delay", 5.0)
+        multiplier = self.reconnect.get("multiplier", 2.0)
+        for _ in range(self.reconnect.get("max_attempts", 5)):
+            yield min(delay, max_delay)
+            delay *= multiplier
+
+    def _on_connection_lost(self, reason: str):
+        """Fail what cannot survive a reconnect, keep what can.
+
+        Called by the backend when the connection drops unexpectedly,
+        before it starts reconnecting. Open channels and non-idempotent
+        RPCs fail with `ConnectionLostError`; idempotent RPCs are queued
+        in `_rpc_retries` for `_resend_rpcs`.
+
+        Args:
+            reason: Why the connection dropped, for error messages.
+        """
+        error = utils.ConnectionLostError(
+            "Connection to %s lost: %s" % (self.uri, reason)
+        )
+        for channel_id in list(self.channel_handlers):
+            self.__unwatch_channel(channel_id)
+            handler = self.channel_handlers.pop(channel_id, None)
+            if handler is None:
+                continue
+            handler(
+                {
+                    "type": "channelError",
+                    "channelId": channel_id,
+                    "error": {"title": str(error)},
+                    "exception": error,
+                }
+            )
+
+        self._rpc_retries = []
+        for call_id in list(self.rpc_handlers):
+            payload = self._rpc_payloads.get(call_id)
+            if (
+                payload is not None
+                and payload["endpoint"] in IDEMPOTENT_RPC_ENDPOINTS
+            ):
+                self._rpc_retries.append(call_id)
+                continue
+            pending = self.rpc_handlers.pop(call_id, None)
+            self._rpc_payloads.pop(call_id, None)
+            if pending is not None and not pending.done():
+                pending.set_exception(error)
+
+        logger.warning(
+            "Connection to %s lost (%s): failed open channels, "
+            "retrying %d idempotent RPC calls after reconnecting.",
+            self.uri,
+            reason,
+            len(self._rpc_retries),
+        )
+
+    def _resend_rpcs(self) -> List[dict]:
+        """Take the packets of RPCs to send again after reconnecting.
+
+        Returns:
+            The `rpcCall` packets still waiting for a result,
+            in the order they were first sent.
+        """
+        payloads = [
+            self._rpc_payloads[call_id]
+            for call_id in self._rpc_retries
+            if call_id in self.rpc_handlers and call_id in self._rpc_payloads
+        ]
+        self._rpc_retries = []
+        return payloads
+
+    def _on_reconnect_failed(self, reason: str):
+        """Fail everything still waiting once reconnecting gives up."""
+        error = utils.ConnectionLostError(
+            "Connection to %s lost and could not be restored: %s"
+            % (self.uri, reason)
+        )
+        logger.error("Giving up reconnecting to %s: %s", self.uri, reason)
+        self._rpc_retries = []
+        for call_id in list(self.rpc_handlers):
+            pending = self.rpc_handlers.pop(call_id, None)
+            self._rpc_payloads.pop(call_id, None)
+            if pending is not None and not pending.done():
+                pending.set_exception(error)
+
     def _handle_data(self, data: dict):
         """Handle an incoming packet from the server.
 
@@ -152,6 +377,10 @@ class BaseClientPort(ABC):
 
         Args:
             data: JSON data from the server.
+
+        Returns:
+            An awaitable to wait on before handling more data, if a
+            channel handler asked to pause receiving; otherwise None.
         """
         data_type = data.get("type", None)
         if data_type is None:
@@ -161,16 +390,21 @@ class BaseClientPort(ABC):
         if data_type == "channelSend":
             channel_id = data.get("channelId")
             if channel_id in self.channel_handlers:
+                deadline = self._channel_deadlines.get(channel_id)
+                if deadline is not None:
+                    deadline.expires_at = time.monotonic() + deadline.timeout
                 message_content = data.get("message", data)
                 if message_content.get("type", None) == "log":
                     message_content = message_content.get("log")
-                self.channel_handlers[channel_id](message_content)
+                return self.channel_handlers[channel_id](message_content)
         elif data_type == "channelClose":
             channel_id = data.get("channelId")
+            self.__unwatch_channel(channel_id)
             if channel_id in self.channel_handlers:
                 del self.channel_handlers[channel_id]
         elif data_type == "channelError":
             channel_id = data.get("channelId")
+            self.__unwatch_channel(channel_id)
             if channel_id in self.channel_handlers:
                 self.channel_handlers[channel_id](data)
                 del self.channel_handlers[channel_id]
@@ -178,13 +412,86 @@ class BaseClientPort(ABC):
         # RPC endpoints
         elif data_type == "rpcResult" or data_type == "rpcError":
             call_id = data.get("callId", -1)
-            if call_id in self.rpc_handlers:
-                self.rpc_handlers[call_id](data)
-                del self.rpc_handlers[call_id]
+            pending = self.rpc_handlers.pop(call_id, None)
+            self._rpc_payloads.pop(call_id, None)
+            if pending is not None and not pending.done():
+                pending.set_result(data)
 
     def is_async(self):
         return asyncio.iscoroutinefunction(self._send_payload)
 
+    def outstanding(self) -> int:
+        """Pending RPCs and open channels, i.e. how busy the port is."""
+        return len(self.rpc_handlers) + len(self.channel_handlers)
+
+    @property
+    def reconnecting(self) -> bool:
+        """Whether the connection dropped and is being restored."""
+        return self._reconnecting
+
+    def owns_channel(self, channel_id: int) -> bool:
+        """Whether the channel is open on this port."""
+        return channel_id in self.channel_handlers
+
+    def __watch_channel(self, channel_id: int, timeout: float):
+        self._channel_deadlines[channel_id] = _ChannelDeadline(
+            timeout,
+            self._arm_timer(
+                timeout, lambda: self.__check_channel_deadline(channel_id)
+            ),
+        )
+
+    def __unwatch_channel(self, channel_id: int):
+        deadline = self._channel_deadlines.pop(channel_id, None)
+        if deadline is not None:
+            deadline.timer.cancel()
+
+    def __check_channel_deadline(self, channel_id: int):
+        """Timer callback: expire the channel, or re-arm the timer.
+
+        The timer is only re-armed when it fires, rather than on every
+        message, so keeping a busy channel alive costs a clock read.
+        """
+        deadline = self._channel_deadlines.get(channel_id)
+        if deadline is None:
+            return
+        remaining = deadline.expires_at - time.monotonic()
+        if remaining > 0 and channel_id in self.channel_handlers:
+            deadline.timer = self._arm_timer(
+                remaining, lambda: self.__check_channel_deadline(channel_id)
+            )
+            return
+        del self._channel_deadlines[channel_id]
+        handler = self.channel_handlers.pop(channel_id, None)
+        if handler is None:
+            return
+
+        logger.error(
+            "Channel %d timed out after %.3f s without a message.",
+            channel_id,
+            deadline.timeout,
+        )
+        error = utils.ChannelTimeoutError(
+            "Channel %d timed out after %.3f s without a message."
+            % (channel_id, deadline.timeout)
+        )
+        try:
+            sent = self.send_channel_message(channel_id, {"type": "cancel"})
+            if asyncio.iscoroutine(sent):
+                asyncio.ensure_future(sent)
+        except Exception as e:
+            logger.error(
+                "Failed to cancel timed out channel %d: %s", channel_id, e
+            )
+        handler(
+            {
+                "type": "channelError",
+                "channelId": channel_id,
+                "error": {"title": str(error)},
+                "exception": error,
+            }
+        )
+
     def create_channel(
         self,
         endpoint: str,
@@ -192,6 +499,7 @@ class BaseClientPort(ABC):
         handler: Callable,
         postprocess: Callable[[dict], Any],
         extra: Optional[dict] = None,
+        timeout: Optional[float] = None,
     ):
         """Create a channel to the server.
 
@@ -206,11 +514,14 @@ class BaseClientPort(ABC):
             handler: Callback to handle incoming messages on the channel.
             postprocess: Callback to process the response.
             extra: Extra data to pass to `postprocess`.
+            timeout: Seconds the server may stay silent on the channel
+                before it is cancelled. Defaults to `default_timeout`.
 
         Returns:
             The result of the `postprocess` callback on the channel ID
             and `extra`, after sending the channel creation packet.
         """
+        self._ensure_connected()
         assert self._websocket is not None
         channel_id = self.__get_next_channel_id()
         payload = {
@@ -221,6 +532,10 @@ class BaseClientPort(ABC):
         if creation_parameter is not None:
             payload["creationParameter"] = creation_parameter
         self.channel_handlers[channel_id] = handler
+        if timeout is None:
+            timeout = self.default_timeout
+        if timeout is not None:
+            self.__watch_channel(channel_id, timeout)
 
         logger.debug(
             "Creating channel to '%s' with ID %d. \
@@ -245,6 +560,7 @@ class BaseClientPort(ABC):
             channel_id: ID of the channel to send the message on.
             message: Message to send on the channel.
         """
+        self._ensure_connected()
         assert self._websocket is not None
         payload = {
             "type": "channelSend",
@@ -259,40 +575,60 @@ class BaseClientPort(ABC):
 
         return self._send_payload(payload)
 
+    def drop_channel(self, channel_id: int):
+        """Stop handling a channel without waiting for it to close.
+
+        Later messages on the channel are ignored. For channels the
+        client has given up on, where the server may never send a
+        `channelClose`.
+
+        Args:
+            channel_id: ID of the channel to drop.
+        """
+        self.__unwatch_channel(channel_id)
+        self.channel_handlers.pop(channel_id, None)
+
     def call_rpc(
         self,
         endpoint: str,
         parameter: Any,
         postprocess: Callable[[dict], Any],
         extra: Optional[dict] = None,
+        timeout: Optional[float] = None,
     ):
         """Send an RPC to the server.
 
-        Will block until the RPC completes, then return the desired
-        result as specified by calling `postprocess` on the response.
+        In the sync case, this will block until the RPC completes,
+        then return the desired result as specified by calling
+        `postprocess` on the response.
 
-        This should actually not block in the async case, but it does:
-        needs to be fixed.
+        In the async case, the call is sent in the background and
+        an `asyncio.Future` resolving to that result is returned
+        immediately, so many calls can be in flight on the same
+        socket at once:
+
+        ```python
+        futures = [port.call_rpc("tokenize", ...) for _ in range(100)]
+        results = await asyncio.gather(*futures)
+        ```
 
         Args:
             endpoint: Endpoint to send the RPC to.
             parameter: Parameters to pass to the RPC.
             postprocess: Callback to process the response.
             extra: Extra data to pass to `postprocess`.
+            timeout: Seconds to wait for the response before raising
+                `RPCTimeoutError`. Defaults to `default_timeout`.
 
         Returns:
-            The result of the `postprocess` callback on the RPC result.
+            The result of the `postprocess` callback on the RPC result,
+            or in the async case a Future resolving to it.
         """
+        self._ensure_connected()
         assert self._websocket is not None
-        result = {}
-
-        # dependency injecting a complete event
-        complete = self._rpc_complete_event()
 
-        def rpc_handler(data):
-            nonlocal result
-            result.update(data)
-            complete.set()
+        # dependency injecting a Future-like
+        pending = self._promise_event()
 
         call_id = self.__get_next_rpc_call_id()
         payload = {
@@ -302,7 +638,8 @@ class BaseClientPort(ABC):
         }
         if parameter is not None:
             payload["parameter"] = parameter
-        self.rpc_handlers[call_id] = rpc_handler
+        self.rpc_handlers[call_id] = pending
+        self._rpc_payloads[call_id] = payload
 
         logger.debug(
             "Sending RPC call to '%s' with call ID %d. \
@@ -311,4 +648,6 @@ class BaseClientPort(ABC):
             call_id,
         )
 
-        return self._call_rpc(payload, complete, result, postprocess, extra)
+        if timeout is None:
+            timeout = self.default_timeout
+        return self._call_rpc(payload, pending, postprocess, extra, timeout)
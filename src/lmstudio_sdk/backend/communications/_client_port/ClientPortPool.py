@@ -0,0 +1,147 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+import lmstudio_sdk.utils as utils
+
+from .BaseClientPort import BaseClientPort
+
+
+logger = utils.get_logger(__name__)
+
+
+class ClientPortPool:
+    """Several client ports to one endpoint, used as a single port.
+
+    A single port decodes every message for its endpoint in one receive
+    loop, which caps throughput when many predictions stream at once.
+    The pool spreads channels and RPCs over its ports instead: each new
+    one goes to the port with the fewest outstanding requests (see
+    `BaseClientPort.outstanding`), and channel messages follow their
+    channel to the port that owns it.
+
+    The pool has the same interface as the ports the namespaces use,
+    so it can be passed wherever a port is expected. Its ports must be
+    all sync or all async.
+
+    Attributes:
+        ports: The pooled ports.
+        endpoint: Endpoint shared by the ports, e.g. "llm".
+    """
+
+    def __init__(self, ports: List[BaseClientPort]):
+        utils._assert(
+            len(ports) > 0,
+            "ClientPortPool: needs at least one port, got %d",
+            len(ports),
+            logger,
+        )
+        self.ports = ports
+        self.endpoint = ports[0].endpoint
+
+    def is_async(self):
+        return self.ports[0].is_async()
+
+    def connect(self):
+        """Connect all ports at once.
+
+        Returns:
+            In the async case, an awaitable for all the connections.
+        """
+        if self.is_async():
+            return asyncio.gather(*[port.connect() for port in self.ports])
+        with ThreadPoolExecutor(len(self.ports)) as pool:
+            for _ in pool.map(lambda port: port.connect(), self.ports):
+                pass
+
+    def close(self):
+        """Close all ports.
+
+        Returns:
+            In the async case, an awaitable for closing them.
+        """
+        if self.is_async():
+            return asyncio.gather(*[port.close() for port in self.ports])
+        for port in self.ports:
+            port.close()
+
+    def outstanding(self) -> int:
+        """Pending RPCs and open channels over all ports."""
+        return sum(port.outstanding() for port in self.ports)
+
+    def _least_outstanding(self) -> BaseClientPort:
+        return min(self.ports, key=lambda port: port.outstanding())
+
+    def _rpc_complete_event(self):
+        return self.ports[0]._rpc_complete_event()
+
+    def _promise_event(self):
+        return self.ports[0]._promise_event()
+
+    def _arm_timer(self, delay: float, callback: Callable[[], None]):
+        return self.ports[0]._arm_timer(delay, callback)
+
+    @property
+    def reconnecting(self) -> bool:
+        """Whether any of the ports is reconnecting."""
+        return any(port.reconnecting for port in self.ports)
+
+    def owns_channel(self, channel_id: int) -> bool:
+        """Whether one of the ports has the channel open."""
+        return any(port.owns_channel(channel_id) for port in self.ports)
+
+    def create_channel(
+        self,
+        endpoint: str,
+        creation_parameter: Optional[dict],
+        handler: Callable,
+        postprocess: Callable[[dict], Any],
+        extra: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Create a channel on the least busy port.
+
+        See `BaseClientPort.create_channel`.
+        """
+        return self._least_outstanding().create_channel(
+            endpoint, creation_parameter, handler, postprocess, extra, timeout
+        )
+
+    def send_channel_message(self, channel_id: int, message: dict):
+        """Send a message on the port that owns the channel.
+
+        Channel IDs are unique across ports. Messages for channels no
+        port knows of, e.g. ones already closed, go to the first port.
+
+        See `BaseClientPort.send_channel_message`.
+        """
+        port = next(
+            (p for p in self.ports if p.owns_channel(channel_id)),
+            self.ports[0],
+        )
+        return port.send_channel_message(channel_id, message)
+
+    def drop_channel(self, channel_id: int):
+        """Drop the channel on the port that owns it.
+
+        See `BaseClientPort.drop_channel`.
+        """
+        for port in self.ports:
+            if port.owns_channel(channel_id):
+                port.drop_channel(channel_id)
+
+    def call_rpc(
+        self,
+        endpoint: str,
+        parameter: Any,
+        postprocess: Callable[[dict], Any],
+        extra: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Send an RPC on the least busy port.
+
+        See `BaseClientPort.call_rpc`.
+        """
+        return self._least_outstanding().call_rpc(
+            endpoint, parameter, postprocess, extra, timeout
+        )
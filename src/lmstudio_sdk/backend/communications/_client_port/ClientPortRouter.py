@@ -0,0 +1,238 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List, Optional
+
+import lmstudio_sdk.utils as utils
+
+from .BaseClientPort import BaseClientPort
+from .ClientPortPool import ClientPortPool
+
+
+logger = utils.get_logger(__name__)
+
+
+def _wanted_model(parameter: Any) -> Optional[dict]:
+    """Get what a loaded model must match to serve a request, if anything.
+
+    Predictions and model RPCs name their model with a `modelSpecifier`
+    or `specifier`, and unloading with an `identifier`. Anything else,
+    e.g. loading a model, can go to any server.
+    """
+    if not isinstance(parameter, dict):
+        return None
+    specifier = parameter.get("modelSpecifier") or parameter.get("specifier")
+    if specifier is None:
+        if "identifier" in parameter:
+            return {"identifier": parameter["identifier"]}
+        return None
+    if specifier.get("type") == "instanceReference":
+        return {"instanceReference": specifier.get("instanceReference")}
+    query = specifier.get("query") or {}
+    wanted = {
+        key: query[key] for key in ("identifier", "path") if key in query
+    }
+    return wanted or None
+
+
+class ClientPortRouter:
+    """Ports to the same endpoint on several servers, used as one port.
+
+    Each new channel or RPC goes to the server with the fewest
+    outstanding requests among those that have the requested model
+    loaded, falling back to any server if none has. Channel messages
+    follow their channel to the server that owns it.
+
+    Which models each server has loaded is learned from `refresh`,
+    which also checks the servers' health: a server is ejected after
+    `max_failures` failed refreshes in a row, and admitted again after
+    the next successful one. Servers that are reconnecting are skipped
+    too. If every server is ejected, requests go to all of them anyway
+    and fail there.
+
+    Like `ClientPortPool`, the router has the same interface as the
+    ports the namespaces use. Its ports must be all sync or all async.
+
+    Attributes:
+        ports: The routed ports, one per server.
+        endpoint: Endpoint shared by the ports, e.g. "llm".
+        loaded: Descriptors of the models loaded on each server as of
+            the last refresh, or None if it is not known.
+        failures: Failed refreshes in a row for each server.
+        max_failures: Failed refreshes in a row that eject a server.
+    """
+
+    def __init__(
+        self,
+        ports: List[BaseClientPort | ClientPortPool],
+        max_failures: int = 2,
+    ):
+        utils._assert(
+            len(ports) > 0,
+            "ClientPortRouter: needs at least one port, got %d",
+            len(ports),
+            logger,
+        )
+        utils._assert(
+            max_failures >= 1,
+            "ClientPortRouter: max_failures must be at least 1, got %s",
+            max_failures,
+            logger,
+        )
+        self.ports = ports
+        self.endpoint = ports[0].endpoint
+        self.loaded: List[Optional[List[dict]]] = [None] * len(ports)
+        self.failures: List[int] = [0] * len(ports)
+        self.max_failures = max_failures
+
+    def is_async(self):
+        return self.ports[0].is_async()
+
+    def outstanding(self) -> int:
+        """Pending RPCs and open channels over all servers."""
+        return sum(port.outstanding() for port in self.ports)
+
+    def healthy(self, index: int) -> bool:
+        """Whether the server at `index` takes new requests."""
+        return (
+            self.failures[index] < self.max_failures
+            and not self.ports[index].reconnecting
+        )
+
+    def _record(self, index: int, loaded: Optional[List[dict]]):
+        """Record the result of refreshing a server; None if it failed."""
+        if loaded is None:
+            self.failures[index] += 1
+            if self.failures[index] == self.max_failures:
+                logger.warning(
+                    "Ejecting %s server %d after %d failed health checks.",
+                    self.endpoint,
+                    index,
+                    self.failures[index],
+                )
+            return
+        if self.failures[index] >= self.max_failures:
+            logger.info("Readmitting %s server %d.", self.endpoint, index)
+        self.failures[index] = 0
+        self.loaded[index] = loaded
+
+    def refresh(self, timeout: Optional[float] = None):
+        """Check each server's health and which models it has loaded.
+
+        Args:
+            timeout: Seconds to wait for each server before counting
+                the check as failed. Defaults to the ports' timeout.
+
+        Returns:
+            In the async case, an awaitable for the refresh.
+        """
+        if self.is_async():
+            return self.__refresh_async(timeout)
+
+        def check(index: int):
+            try:
+                loaded = self.ports[index].call_rpc(
+                    "listLoaded", None, lambda x: x, timeout=timeout
+                )
+            except Exception as e:
+                logger.debug("Health check %d failed: %s", index, e)
+                loaded = None
+            self._record(index, loaded)
+
+        with ThreadPoolExecutor(len(self.ports)) as pool:
+            for _ in pool.map(check, range(len(self.ports))):
+                pass
+
+    async def __refresh_async(self, timeout: Optional[float]):
+        async def check(index: int):
+            try:
+                loaded = await self.ports[index].call_rpc(
+                    "listLoaded", None, lambda x: x, timeout=timeout
+                )
+            except Exception as e:
+                logger.debug("Health check %d failed: %s", index, e)
+                loaded = None
+            self._record(index, loaded)
+
+        await asyncio.gather(*[check(i) for i in range(len(self.ports))])
+
+    def _has_model(self, index: int, wanted: dict) -> bool:
+        return any(
+            all(descriptor.get(key) == value for key, value in wanted.items())
+            for descriptor in self.loaded[index] or []
+        )
+
+    def _route(self, parameter: Any) -> BaseClientPort | ClientPortPool:
+        """Pick the port for a request with the given parameter."""
+        candidates = [i for i in range(len(self.ports)) if self.healthy(i)]
+        if not candidates:
+            logger.warning("No healthy servers, routing to all of them.")
+            candidates = list(range(len(self.ports)))
+        wanted = _wanted_model(parameter)
+        if wanted is not None:
+            serving = [i for i in candidates if self._has_model(i, wanted)]
+            candidates = serving or candidates
+        index = min(candidates, key=lambda i: self.ports[i].outstanding())
+        logger.debug("Routing %s to server %d.", wanted, index)
+        return self.ports[index]
+
+    def _rpc_complete_event(self):
+        return self.ports[0]._rpc_complete_event()
+
+    def _promise_event(self):
+        return self.ports[0]._promise_event()
+
+    def _arm_timer(self, delay: float, callback: Callable[[], None]):
+        return self.ports[0]._arm_timer(delay, callback)
+
+    def create_channel(
+        self,
+        endpoint: str,
+        creation_parameter: Optional[dict],
+        handler: Callable,
+        postprocess: Callable[[dict], Any],
+        extra: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Create a channel on the least busy server with the model.
+
+        See `BaseClientPort.create_channel`.
+        """
+        return self._route(creation_parameter).create_channel(
+            endpoint, creation_parameter, handler, postprocess, extra, timeout
+        )
+
+    def send_channel_message(self, channel_id: int, message: dict):
+        """Send a message on the server that owns the channel.
+
+        See `ClientPortPool.send_channel_message`.
+        """
+        port = next(
+            (p for p in self.ports if p.owns_channel(channel_id)),
+            self.ports[0],
+        )
+        return port.send_channel_message(channel_id, message)
+
+    def drop_channel(self, channel_id: int):
+        """Drop the channel on the server that owns it.
+
+        See `BaseClientPort.drop_channel`.
+        """
+        for port in self.ports:
+            if port.owns_channel(channel_id):
+                port.drop_channel(channel_id)
+
+    def call_rpc(
+        self,
+        endpoint: str,
+        parameter: Any,
+        postprocess: Callable[[dict], Any],
+        extra: Optional[dict] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Send an RPC to the least busy server with the model.
+
+        See `BaseClientPort.call_rpc`.
+        """
+        return self._route(parameter).call_rpc(
+            endpoint, parameter, postprocess, extra, timeout
+        )
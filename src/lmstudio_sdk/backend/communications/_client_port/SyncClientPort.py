@@ -1,9 +1,10 @@
-import json
 import threading
+import time
 import websocket
 from typing import Any, Callable, Optional
 from typing_extensions import override
 
+import lmstudio_sdk.dataclasses as dc
 import lmstudio_sdk.utils as utils
 
 from .BaseClientPort import BaseClientPort
@@ -15,30 +16,74 @@ logger = utils.get_logger(__name__)
 class SyncClientPort(BaseClientPort):
     """Synchronous client port for LM Studio communication.
 
+    With `lazy=True`, `connect` only marks the port as ready, and the
+    WebSocket is opened by whichever call first sends something.
+
     See `BaseClientPort` for more information.
     """
 
-    def __init__(self, uri: str, endpoint: str, identifier: str, passkey: str):
-        super().__init__(uri, endpoint, identifier, passkey)
+    def __init__(
+        self,
+        uri: str,
+        endpoint: str,
+        identifier: str,
+        passkey: str,
+        codec: Optional[utils.JSONCodec] = None,
+        timeout: Optional[float] = None,
+        reconnect: Optional[dc.ReconnectOpts] = None,
+        lazy: bool = False,
+    ):
+        super().__init__(
+            uri, endpoint, identifier, passkey, codec, timeout, reconnect
+        )
+        self.lazy = lazy
+        self._connect_pending = False
+        self._connect_lock = threading.Lock()
         self._lock = threading.Lock()
         self._connection_event = threading.Event()
+        self._closed_event = threading.Event()
+        self._reconnect_finished = threading.Event()
+        self._reconnect_thread = None
+        self._last_error = None
+        # the open connection's socket, see __close_socket
+        self._sock: Optional[websocket.WebSocket] = None
 
     def on_message(self, ws, message):
-        data = json.loads(message)
+        data = self._codec.loads(message)
         logger.recv(
             "Message received on sync port %s:\n%s",
             self.endpoint,
-            utils.pretty_print(data),
+            utils.lazy_pretty_print(data),
         )
         self._handle_data(data)
 
     def on_error(self, ws, error):
+        if self._closing or ws is not self._websocket:
+            # e.g. websocket-client failing on a socket that close()
+            # cleared while it was still connecting
+            logger.debug(
+                "Ignoring error on closed connection to %s: %s",
+                self.uri,
+                str(error),
+            )
+            return
+        self._last_error = error
         logger.error(
             "Error in WebSocket connection to %s: %s", self.uri, str(error)
         )
 
     def on_close(self, ws, close_status_code, close_msg):
+        was_connected = self._connection_event.is_set()
         self._connection_event.clear()
+        if ws is not self._websocket or not was_connected or self._closing:
+            return
+        reason = str(self._last_error or close_msg or "connection closed")
+        self._reconnecting = True
+        self._reconnect_finished.clear()
+        self._reconnect_thread = threading.Thread(
+            target=self.__reconnect, args=(reason,), daemon=True
+        )
+        self._reconnect_thread.start()
 
     def on_open(self, ws):
         logger.websocket(
@@ -48,7 +93,7 @@ class SyncClientPort(BaseClientPort):
         )
         # auth handshake
         self._websocket.send(
-            json.dumps(
+            self._codec.dumps(
                 {
                     "authVersion": self._auth_version,
                     "clientIdentifier": self.identifier,
@@ -57,10 +102,55 @@ class SyncClientPort(BaseClientPort):
             )
         )
         logger.websocket("Sync port authenticated: %s.", self.endpoint)
+        self._sock = ws.sock
         self._connection_event.set()
 
     @override
     def connect(self):
+        self._closing = False
+        self._closed_event.clear()
+        if self.lazy:
+            logger.websocket(
+                "Deferring connection to %s until first use.", self.uri
+            )
+            self._connect_pending = True
+            return
+        self.__connect_now()
+
+    @override
+    def _ensure_connected(self):
+        if not self._connect_pending:
+            return
+        with self._connect_lock:
+            if self._connect_pending:
+                self.__connect_now()
+                self._connect_pending = False
+
+    def __connect_now(self):
+        if self.__open():
+            logger.websocket("Connected to WebSocket at %s.", self.uri)
+        elif self._closing:
+            logger.websocket(
+                "Port closed while connecting to %s, not connecting.",
+                self.uri,
+            )
+        else:
+            logger.error(
+                "Failed to connect to WebSocket server at %s.", self.uri
+            )
+            raise ConnectionRefusedError(
+                "Failed to connect to WebSocket server at %s." % self.uri
+            )
+
+    def __open(self, timeout: float = 5) -> bool:
+        """Open the WebSocket in a background thread.
+
+        Authentication happens in `on_open`.
+
+        Returns:
+            Whether the connection was established within `timeout`.
+        """
+        self._last_error = None
         with self._lock:
             self._websocket = websocket.WebSocketApp(
                 self.uri,
@@ -73,15 +163,63 @@ class SyncClientPort(BaseClientPort):
         wst.daemon = True
         wst.start()
 
-        if self._connection_event.wait(timeout=5):
-            logger.websocket("Connected to WebSocket at %s.", self.uri)
-        else:
-            logger.error(
-                "Failed to connect to WebSocket server at %s.", self.uri
-            )
+        # stop waiting early if the attempt failed and the thread exited
+        deadline = time.monotonic() + timeout
+        while not self._connection_event.wait(timeout=0.01):
+            if not wst.is_alive() or time.monotonic() > deadline:
+                return False
+        return True
+
+    def __reconnect(self, reason: str):
+        """Reconnect with backoff after the connection dropped.
+
+        Runs in its own thread. Sends made meanwhile wait for the
+        outcome in `_send_payload`.
+        """
+        self._on_connection_lost(reason)
+        self.__close_socket()
+        try:
+            for attempt, delay in enumerate(self._reconnect_delays(), 1):
+                if self._closed_event.wait(delay):
+                    return
+                if self.__open():
+                    logger.info(
+                        "Reconnected to %s after %d attempt(s).",
+                        self.uri,
+                        attempt,
+                    )
+                    with self._lock:
+                        for payload in self._resend_rpcs():
+                            self._websocket.send(self._codec.dumps(payload))
+                    return
+                reason = str(self._last_error or "connection failed")
+                logger.warning(
+                    "Reconnect attempt %d to %s failed: %s",
+                    attempt,
+                    self.uri,
+                    reason,
+                )
+            self._on_reconnect_failed(reason)
+        finally:
+            self._reconnecting = False
+            self._reconnect_finished.set()
+
+    def __close_socket(self):
+        """Close the socket of the last connection, if still open.
+
+        When the server closes the connection, websocket-client answers
+        its close frame but never closes the socket, leaving it (and
+        the server's side) half-closed until garbage collected.
+        """
+        sock, self._sock = self._sock, None
+        if sock is not None:
+            sock.shutdown()
 
     @override
     def close(self):
+        self._connect_pending = False
+        self._closing = True
+        self._closed_event.set()
         with self._lock:
             if self._websocket:
                 logger.websocket(
@@ -92,6 +230,7 @@ class SyncClientPort(BaseClientPort):
                 logger.websocket(
                     "WebSocket connection closed to %s.", self.endpoint
                 )
+        self.__close_socket()
 
     @override
     def _send_payload(
@@ -100,14 +239,25 @@ class SyncClientPort(BaseClientPort):
         extra: Optional[dict] = None,
         postprocess: Optional[Callable[[dict], Any]] = None,
     ):
+        # handlers failed by the reconnect thread must not wait on it
+        if (
+            self._reconnecting
+            and threading.current_thread() is not self._reconnect_thread
+        ):
+            self._reconnect_finished.wait()
+            if not self._connection_event.is_set():
+                raise utils.ConnectionLostError(
+                    "Connection to %s lost and could not be restored."
+                    % self.uri
+                )
         with self._lock:
             if self._websocket and self._connection_event.is_set():
                 logger.send(
                     "Sending payload on sync port %s:\n%s",
                     self.endpoint,
-                    utils.pretty_print(payload),
+                    utils.lazy_pretty_print(payload),
                 )
-                self._websocket.send(json.dumps(payload))
+                self._websocket.send(self._codec.dumps(payload))
             else:
                 logger.error(
                     "Attempted to send payload, \
@@ -126,42 +276,43 @@ class SyncClientPort(BaseClientPort):
     def _promise_event(self):
         return utils.PseudoFuture()
 
+    @override
+    def _arm_timer(self, delay: float, callback: Callable[[], None]):
+        timer = threading.Timer(delay, callback)
+        timer.daemon = True
+        timer.start()
+        return timer
+
     @override
     def _call_rpc(
         self,
         payload: dict,
-        complete: threading.Event,
-        result: dict,
+        pending: utils.PseudoFuture,
         postprocess: Callable[[dict], Any],
         extra: Optional[dict] = None,
+        timeout: Optional[float] = None,
     ):
         assert self._websocket is not None
-        self._send_payload(payload)
+        try:
+            self._send_payload(payload)
+        except Exception:
+            self._forget_rpc(payload["callId"])
+            raise
         logger.debug(
             "Waiting for RPC call to complete to %s...",
             payload.get("endpoint", "unknown"),
         )
-        complete.wait()
-
-        if "error" in result:
+        try:
+            response = pending.result(timeout)
+        except TimeoutError:
+            self._forget_rpc(payload["callId"])
             logger.error(
-                "Error in RPC call: %s",
-                utils.pretty_print_error(result.get("error")),
+                "RPC call to %s timed out after %.3f s.",
+                payload.get("endpoint", "unknown"),
+                timeout,
             )
-            raise utils.RPCError(
-                "Error in RPC call: %s",
-                result.get("error").get("title", "Unknown error"),
+            raise utils.RPCTimeoutError(
+                "RPC call to %s timed out after %.3f s."
+                % (payload.get("endpoint", "unknown"), timeout)
             )
-
-        result = result.get("result", result)
-        if isinstance(result, dict):
-            result.update({"extra": extra})
-        else:
-            result = {"result": result, "extra": extra}
-
-        def process_result(x):
-            if isinstance(x, dict):
-                return x.get("result", x)
-            return x
-
-        return process_result(postprocess(result))
+        return self._process_rpc_result(response, postprocess, extra)
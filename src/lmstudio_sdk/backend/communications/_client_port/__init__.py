@@ -4,4 +4,6 @@
 
 from .AsyncClientPort import AsyncClientPort
 from .BaseClientPort import BaseClientPort
+from .ClientPortPool import ClientPortPool
+from .ClientPortRouter import ClientPortRouter
 from .SyncClientPort import SyncClientPort
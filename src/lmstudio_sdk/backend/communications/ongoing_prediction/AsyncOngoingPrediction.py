@@ -1,10 +1,20 @@
 from __future__ import annotations
 import asyncio
 from abc import ABC
-from typing import Any, AsyncIterator, Callable, List, Optional
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
 from typing_extensions import override
 
 import lmstudio_sdk.dataclasses as dc
+import lmstudio_sdk.utils as utils
 
 from .BaseOngoingPrediction import (
     BaseOngoingPrediction,
@@ -17,22 +27,85 @@ from .BaseOngoingPrediction import (
 class StreamablePromise(BaseStreamableIterator[TFragment, TFinal], ABC):
     """An abstract streamable async iterator that can be awaited on."""
 
-    def __init__(self, on_cancel: Callable[[], None]):
-        super().__init__(on_cancel)
+    def __init__(
+        self,
+        on_cancel: Callable[[], None],
+        coalesce: Optional[dc.CoalesceOpts] = None,
+        retain: bool = True,
+        backpressure: Optional[dc.BackpressureOpts] = None,
+    ):
+        super().__init__(on_cancel, coalesce, retain, backpressure)
         self.queue: asyncio.Queue[Optional[TFragment]] = asyncio.Queue()
         self.promise_final: asyncio.Future[TFinal] = asyncio.Future()
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        # awaited by the client port's receive loop while paused
+        self._drained: Optional[asyncio.Future[None]] = None
+
+    def _enqueue(self, item: TFragment) -> Optional[Awaitable[None]]:
+        if not self._overflowing(self.queue.qsize()):
+            self.queue.put_nowait(item)
+            return None
+        if self._overflow_policy != "pause":
+            self._overflow()
+            return None
+        self.queue.put_nowait(item)
+        if self._drained is None:
+            self._drained = asyncio.get_running_loop().create_future()
+        return self._drained
+
+    def _unpause(self, lift: bool = False) -> None:
+        if lift:
+            self._bounded = False
+        if self._drained is not None and (
+            lift or not self._overflowing(self.queue.qsize())
+        ):
+            if not self._drained.done():
+                self._drained.set_result(None)
+            self._drained = None
+            self.__arm_flush()
 
     @override
-    def push(self, fragment: TFragment) -> None:
+    def _cancel_on_overflow(self) -> None:
+        asyncio.ensure_future(self._on_cancel())
+
+    def _flush_chunk(self) -> Optional[Awaitable[None]]:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        chunk = self._take_chunk()
+        if chunk is not None:
+            return self._enqueue(chunk)
+        return None
+
+    @override
+    def push(self, fragment: TFragment) -> Optional[Awaitable[None]]:
         if self.status != "pending":
-            return
-        self.buffer.append(fragment)
-        self.queue.put_nowait(fragment)
+            return None
+        if self.retain:
+            self.buffer.append(fragment)
+        if not self._coalesce:
+            return self._enqueue(fragment)
+        if self._add_to_chunk(fragment):
+            return self._flush_chunk()
+        if self._drained is None:
+            self.__arm_flush()
+        # the timer has nobody to hand the pause to when its flush
+        # overflows, so the next fragment pauses the receive loop, and
+        # the chunk waits to be flushed until it resumes
+        return self._drained
+
+    def __arm_flush(self) -> None:
+        if self._chunk and self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self._max_chunk_latency, self._flush_chunk
+            )
 
     @override
     def finished(self, error: Optional[Any] = None) -> None:
         if self.status != "pending":
             return
+        self._unpause(lift=True)
+        self._flush_chunk()
 
         if error:
             self.status = "rejected"
@@ -52,6 +125,7 @@ class StreamablePromise(BaseStreamableIterator[TFragment, TFinal], ABC):
             self.promise_final.set_exception(e)
 
     def __await__(self):
+        self._unpause(lift=True)
         return self.promise_final.__await__()
 
     async def __aenter__(self):
@@ -61,10 +135,25 @@ class StreamablePromise(BaseStreamableIterator[TFragment, TFinal], ABC):
         pass
 
     def __aiter__(self) -> AsyncIterator[TFragment]:
-        return self
+        return self.__iter_queue()
+
+    async def __iter_queue(self) -> AsyncIterator[TFragment]:
+        try:
+            while True:
+                try:
+                    item = await self.__anext__()
+                except StopAsyncIteration:
+                    return
+                yield item
+        finally:
+            # a consumer that stops early must not keep the port paused;
+            # runs when the generator is closed or garbage collected
+            self._unpause(lift=True)
 
     async def __anext__(self) -> TFragment:
         item = await self.queue.get()
+        if self._drained is not None:
+            self._unpause()
         if item is None:
             if self.status == "rejected":
                 raise Exception()
@@ -117,14 +206,8 @@ class AsyncOngoingPrediction(
     async def collect(self, fragments: List[str]) -> dc.PredictionResult:
         if self._stats is None:
             raise ValueError("Stats should not be None")
-        if self._model_info is None:
-            raise ValueError("Model info should not be None")
-        if self._load_model_config is None:
-            raise ValueError("Load model config should not be None")
-        if self._prediction_config is None:
-            raise ValueError("Prediction config should not be None")
         return dc.PredictionResult(
-            content="".join(fragments),
+            content="".join(fragments) if self.retain else None,
             stats=self._stats,
             model_info=self._model_info,
             load_config=self._load_model_config,
@@ -155,8 +238,84 @@ class AsyncOngoingPrediction(
             The final prediction results.
         ```
         """
+        self._unpause(lift=True)
         return self.promise_final
 
+    async def json_items(
+        self,
+        path: Sequence[Union[str, int]] = (),
+        schema: Optional[dict] = None,
+    ) -> AsyncIterator[Any]:
+        """Stream a structured prediction as parsed JSON values.
+
+        Fragments are parsed as they arrive, and each element of the
+        array at `path` is yielded as soon as it closes. If the value
+        at `path` is not an array, it is yielded once it is complete.
+        Use this with a `structured` JSON prediction:
+
+        ```python
+        schema = {"type": "array", "items": {"type": "string"}}
+        prediction = await model.complete("List ten fruits.", {
+            "structured": {"type": "json", "jsonSchema": schema},
+        })
+        async for fruit in prediction.json_items(schema=schema):
+            print(fruit)
+        ```
+
+        Args:
+            path: Keys and indices from the root to the array to stream.
+            schema: A JSON schema to validate against while parsing.
+                See `JSONStreamParser` for what is checked.
+
+        Raises:
+            JSONStreamError: if the JSON is malformed or incomplete.
+            JSONSchemaError: if it does not match the schema. Either
+                error cancels the prediction if it is still going.
+        """
+        parser = utils.JSONStreamParser(schema, path)
+        try:
+            async for fragment in self:
+                for item in parser.feed(fragment):
+                    yield item
+            for item in parser.close():
+                yield item
+        except utils.JSONStreamError:
+            if self.status == "pending":
+                await self.cancel()
+            raise
+
+    async def json_partials(
+        self, schema: Optional[dict] = None
+    ) -> AsyncIterator[Any]:
+        """Stream a structured prediction as partially parsed JSON.
+
+        Yields a copy of the document parsed so far whenever a fragment
+        changes it, e.g. to render a result while it is generated.
+        The last one yielded is the whole document.
+
+        Args:
+            schema: A JSON schema to validate against while parsing.
+
+        Raises:
+            JSONStreamError: if the JSON is malformed or incomplete.
+            JSONSchemaError: if it does not match the schema. Either
+                error cancels the prediction if it is still going.
+        """
+        parser = utils.JSONStreamParser(schema)
+        last = None
+        try:
+            async for fragment in self:
+                parser.feed(fragment)
+                partial = parser.partial()
+                if partial != last:
+                    last = partial
+                    yield partial
+            parser.close()
+        except utils.JSONStreamError:
+            if self.status == "pending":
+                await self.cancel()
+            raise
+
     @override
     async def cancel(self) -> None:
         """Cancels the prediction.
@@ -165,4 +324,5 @@ class AsyncOngoingPrediction(
         See LLMPredictionStopReason for other reasons
         that a prediction might stop.
         """
+        self._unpause(lift=True)
         await self._on_cancel()
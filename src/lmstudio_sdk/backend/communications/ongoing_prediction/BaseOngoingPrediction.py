@@ -1,7 +1,19 @@
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Generic, List, Optional, TypeVar
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Generic,
+    List,
+    Optional,
+    TypeVar,
+)
 
 import lmstudio_sdk.dataclasses as dc
+import lmstudio_sdk.utils as utils
+
+
+logger = utils.get_logger(__name__)
 
 TFragment = TypeVar("TFragment")
 TFinal = TypeVar("TFinal")
@@ -10,20 +22,93 @@ TFinal = TypeVar("TFinal")
 class BaseStreamableIterator(Generic[TFragment, TFinal], ABC):
     """An abstract streamable iterator."""
 
-    def __init__(self, on_cancel: Callable[[], None]):
+    def __init__(
+        self,
+        on_cancel: Callable[[], None],
+        coalesce: Optional[dc.CoalesceOpts] = None,
+        retain: bool = True,
+        backpressure: Optional[dc.BackpressureOpts] = None,
+    ):
         self.status: str = "pending"
         self.buffer: List[TFragment] = []
+        # without retaining, fragments only live in the queue until
+        # consumed, and the result has no content
+        self.retain = retain
 
         # technically these are ongoing prediction specific,
         # but the inheritance hierarchy makes it easier to put them here
         self._on_cancel = on_cancel
 
+        self._coalesce = coalesce is not None
+        self._max_chunk_bytes = (coalesce or {}).get("max_bytes", 4096)
+        self._max_chunk_latency = (coalesce or {}).get("max_latency", 0.016)
+        self._chunk: List[str] = []
+        self._chunk_bytes = 0
+
+        # lifted once the fragments no longer need a consumer
+        self._bounded = backpressure is not None
+        self._max_queued = (backpressure or {}).get("max_fragments")
+        self._overflow_policy = (backpressure or {}).get("policy", "pause")
+        if self._bounded:
+            # anything less would be overflowing with an empty queue,
+            # and a paused port would never resume
+            utils._assert(
+                isinstance(self._max_queued, int) and self._max_queued >= 1,
+                "backpressure: max_fragments must be a positive integer, "
+                "got %s",
+                self._max_queued,
+                logger,
+            )
+            utils._assert(
+                self._overflow_policy in ("pause", "drop", "cancel"),
+                "backpressure: unknown policy %s",
+                self._overflow_policy,
+                logger,
+            )
+        self._overflow_cancelled = False
+        self.dropped = 0
+        """Fragments not streamed because the queue was full."""
+
+    def _add_to_chunk(self, fragment: str) -> bool:
+        """Add a fragment to the pending chunk.
+
+        Returns:
+            Whether the chunk is full and should be delivered now.
+        """
+        self._chunk.append(fragment)
+        self._chunk_bytes += len(fragment.encode("utf-8"))
+        return self._chunk_bytes >= self._max_chunk_bytes
+
+    def _take_chunk(self) -> Optional[str]:
+        """Take the pending chunk, if any, joined into one fragment."""
+        if not self._chunk:
+            return None
+        chunk = "".join(self._chunk)
+        self._chunk.clear()
+        self._chunk_bytes = 0
+        return chunk
+
+    def _overflowing(self, queued: int) -> bool:
+        """Whether `queued` items reach the high-water mark."""
+        return self._bounded and queued >= self._max_queued
+
+    def _overflow(self) -> None:
+        """Drop an item that does not fit, cancelling if so configured."""
+        self.dropped += 1
+        if self._overflow_policy == "cancel" and not self._overflow_cancelled:
+            self._overflow_cancelled = True
+            self._cancel_on_overflow()
+
+    @abstractmethod
+    def _cancel_on_overflow(self) -> None:
+        pass
+
     @abstractmethod
     def collect(self, fragments: List[str]) -> dc.PredictionResult:
         pass
 
     @abstractmethod
-    def push(self, fragment: TFragment) -> None:
+    def push(self, fragment: TFragment) -> Optional[Awaitable[None]]:
         pass
 
     @abstractmethod
@@ -47,23 +132,36 @@ class BaseOngoingPrediction(BaseStreamableIterator[TFragment, TFinal], ABC):
     def create(
         cls,
         on_cancel: Callable[[], None],
+        coalesce: Optional[dc.CoalesceOpts] = None,
+        retain: bool = True,
+        backpressure: Optional[dc.BackpressureOpts] = None,
     ) -> tuple[
         "BaseOngoingPrediction",
         Callable[..., None],
         Callable[..., None],
-        Callable[[str], None],
+        Callable[[str], Optional[Awaitable[None]]],
     ]:
         """Create a new ongoing prediction instance.
 
         Registers the finished, failed, and push callbacks
-        with the ongoing prediction instance as well."""
-        ongoing_prediction = cls(on_cancel)
+        with the ongoing prediction instance as well. When the queue is
+        full and paused, push returns an awaitable to wait on before
+        receiving anything more (async), or blocks until then (sync).
+
+        Args:
+            on_cancel: Called to cancel the prediction.
+            coalesce: If set, fragments are streamed in chunks.
+            retain: Whether to keep the fragments for the result's
+                content.
+            backpressure: If set, bounds the fragments queued.
+        """
+        ongoing_prediction = cls(on_cancel, coalesce, retain, backpressure)
 
         def finished(
             stats: dc.LLMPredictionStats,
-            model_info: dc.ModelDescriptor,
-            load_model_config: dc.KVConfig,
-            prediction_config: dc.KVConfig,
+            model_info: Optional[dc.ModelDescriptor],
+            load_model_config: Optional[dc.KVConfig],
+            prediction_config: Optional[dc.KVConfig],
         ) -> None:
             ongoing_prediction._stats = stats
             ongoing_prediction._model_info = model_info
@@ -74,8 +172,8 @@ class BaseOngoingPrediction(BaseStreamableIterator[TFragment, TFinal], ABC):
         def failed(error: Any = None) -> None:
             ongoing_prediction.finished(error)
 
-        def push(fragment: str) -> None:
-            ongoing_prediction.push(fragment)
+        def push(fragment: str) -> Optional[Awaitable[None]]:
+            return ongoing_prediction.push(fragment)
 
         return ongoing_prediction, finished, failed, push
 
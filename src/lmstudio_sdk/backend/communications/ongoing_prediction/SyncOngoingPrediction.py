@@ -1,11 +1,21 @@
 from __future__ import annotations
 from abc import ABC
-from threading import Event
-from typing import Any, Callable, Iterator, List, Optional
+import time
+from threading import Condition, Event, Lock
+from typing import (
+    Any,
+    Callable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
 from typing_extensions import override
-from queue import Queue
+from queue import Empty, Queue
 
 import lmstudio_sdk.dataclasses as dc
+import lmstudio_sdk.utils as utils
 
 from .BaseOngoingPrediction import (
     BaseOngoingPrediction,
@@ -18,24 +28,82 @@ from .BaseOngoingPrediction import (
 class StreamableIterator(BaseStreamableIterator[TFragment, TFinal], ABC):
     """An abstract synchronous streamable iterator."""
 
-    def __init__(self, on_cancel: Callable[[], None]):
-        super().__init__(on_cancel)
+    def __init__(
+        self,
+        on_cancel: Callable[[], None],
+        coalesce: Optional[dc.CoalesceOpts] = None,
+        retain: bool = True,
+        backpressure: Optional[dc.BackpressureOpts] = None,
+    ):
+        super().__init__(on_cancel, coalesce, retain, backpressure)
         self.queue: Queue[Optional[TFragment]] = Queue()
         self.final_result: Optional[TFinal] = None
         self.error: Optional[Any] = None
         self.finished_event = Event()
+        # guards the pending chunk, which the consumer also takes from
+        # when it has waited long enough (see __iter__)
+        self._chunk_lock = Lock()
+        self._chunk_since = 0.0
+        # the receive thread waits on this while paused
+        self._drained = Condition()
+
+    def _enqueue(self, item: TFragment) -> None:
+        if not self._overflowing(self.queue.qsize()):
+            self.queue.put(item)
+            return
+        if self._overflow_policy != "pause":
+            self._overflow()
+            return
+        with self._drained:
+            self._drained.wait_for(
+                lambda: (
+                    self.status != "pending"
+                    or not self._overflowing(self.queue.qsize())
+                )
+            )
+        self.queue.put(item)
+
+    def _unpause(self, lift: bool = False) -> None:
+        with self._drained:
+            if lift:
+                self._bounded = False
+            self._drained.notify()
+
+    @override
+    def _cancel_on_overflow(self) -> None:
+        self._on_cancel()
+
+    def _flush_chunk(self) -> None:
+        with self._chunk_lock:
+            chunk = self._take_chunk()
+        if chunk is not None:
+            self._enqueue(chunk)
 
     @override
     def push(self, fragment: TFragment) -> None:
         if self.status != "pending":
             return
-        self.buffer.append(fragment)
-        self.queue.put(fragment)
+        if self.retain:
+            self.buffer.append(fragment)
+        if not self._coalesce:
+            self._enqueue(fragment)
+            return
+        with self._chunk_lock:
+            now = time.monotonic()
+            if not self._chunk:
+                self._chunk_since = now
+            full = self._add_to_chunk(fragment)
+            if not full and now - self._chunk_since < self._max_chunk_latency:
+                return
+            chunk = self._take_chunk()
+        self._enqueue(chunk)
 
     @override
     def finished(self, error: Optional[Any] = None) -> None:
         if self.status != "pending":
             return
+        self._unpause(lift=True)
+        self._flush_chunk()
 
         if error:
             self.status = "rejected"
@@ -55,9 +123,38 @@ class StreamableIterator(BaseStreamableIterator[TFragment, TFinal], ABC):
             self.status = "rejected"
             self.error = e
 
+    def __take_stale_chunk(self) -> Optional[TFragment]:
+        with self._chunk_lock:
+            # anything queued meanwhile came first
+            if not self.queue.empty() or not self._chunk:
+                return None
+            if time.monotonic() - self._chunk_since < self._max_chunk_latency:
+                return None
+            return self._take_chunk()
+
     def __iter__(self) -> Iterator[TFragment]:
+        try:
+            yield from self.__iter_queue()
+        finally:
+            # a consumer that stops early must not keep the port paused
+            self._unpause(lift=True)
+
+    def __iter_queue(self) -> Iterator[TFragment]:
         while True:
-            item = self.queue.get()
+            if self._coalesce:
+                # no timer thread delivers a chunk once it is old enough;
+                # instead, the consumer takes it after waiting that long
+                try:
+                    item = self.queue.get(timeout=self._max_chunk_latency)
+                except Empty:
+                    item = self.__take_stale_chunk()
+                    if item is not None:
+                        yield item
+                    continue
+            else:
+                item = self.queue.get()
+            if self._bounded:
+                self._unpause()
             if item is None:
                 if self.status == "rejected":
                     raise self.error
@@ -100,14 +197,8 @@ class SyncOngoingPrediction(
     def collect(self, fragments: List[str]) -> dc.PredictionResult:
         if self._stats is None:
             raise ValueError("Stats should not be None")
-        if self._model_info is None:
-            raise ValueError("Model info should not be None")
-        if self._load_model_config is None:
-            raise ValueError("Load model config should not be None")
-        if self._prediction_config is None:
-            raise ValueError("Prediction config should not be None")
         return dc.PredictionResult(
-            content="".join(fragments),
+            content="".join(fragments) if self.retain else None,
             stats=self._stats,
             model_info=self._model_info,
             load_config=self._load_model_config,
@@ -138,6 +229,7 @@ class SyncOngoingPrediction(
             The final prediction results.
         ```
         """
+        self._unpause(lift=True)
         self.finished_event.wait()
         if self.status == "rejected":
             raise self.error
@@ -145,6 +237,77 @@ class SyncOngoingPrediction(
             raise ValueError("Result is not available")
         return self.final_result
 
+    def json_items(
+        self,
+        path: Sequence[Union[str, int]] = (),
+        schema: Optional[dict] = None,
+    ) -> Iterator[Any]:
+        """Stream a structured prediction as parsed JSON values.
+
+        Fragments are parsed as they arrive, and each element of the
+        array at `path` is yielded as soon as it closes. If the value
+        at `path` is not an array, it is yielded once it is complete.
+        Use this with a `structured` JSON prediction:
+
+        ```python
+        schema = {"type": "array", "items": {"type": "string"}}
+        prediction = model.complete("List ten fruits.", {
+            "structured": {"type": "json", "jsonSchema": schema},
+        })
+        for fruit in prediction.json_items(schema=schema):
+            print(fruit)
+        ```
+
+        Args:
+            path: Keys and indices from the root to the array to stream.
+            schema: A JSON schema to validate against while parsing.
+                See `JSONStreamParser` for what is checked.
+
+        Raises:
+            JSONStreamError: if the JSON is malformed or incomplete.
+            JSONSchemaError: if it does not match the schema. Either
+                error cancels the prediction if it is still going.
+        """
+        parser = utils.JSONStreamParser(schema, path)
+        try:
+            for fragment in self:
+                yield from parser.feed(fragment)
+            yield from parser.close()
+        except utils.JSONStreamError:
+            if self.status == "pending":
+                self.cancel()
+            raise
+
+    def json_partials(self, schema: Optional[dict] = None) -> Iterator[Any]:
+        """Stream a structured prediction as partially parsed JSON.
+
+        Yields a copy of the document parsed so far whenever a fragment
+        changes it, e.g. to render a result while it is generated.
+        The last one yielded is the whole document.
+
+        Args:
+            schema: A JSON schema to validate against while parsing.
+
+        Raises:
+            JSONStreamError: if the JSON is malformed or incomplete.
+            JSONSchemaError: if it does not match the schema. Either
+                error cancels the prediction if it is still going.
+        """
+        parser = utils.JSONStreamParser(schema)
+        last = None
+        try:
+            for fragment in self:
+                parser.feed(fragment)
+                partial = parser.partial()
+                if partial != last:
+                    last = partial
+                    yield partial
+            parser.close()
+        except utils.JSONStreamError:
+            if self.status == "pending":
+                self.cancel()
+            raise
+
     @override
     def cancel(self) -> None:
         """Cancels the prediction.
@@ -153,4 +316,5 @@ class SyncOngoingPrediction(
         See LLMPredictionStopReason for other reasons
         that a prediction might stop.
         """
+        self._unpause(lift=True)
         self._on_cancel()
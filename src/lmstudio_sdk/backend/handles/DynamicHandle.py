@@ -21,6 +21,13 @@ class DynamicHandle:
         self._port = port
         self._specifier = specifier
 
+    def _model_key(self) -> str:
+        """Name the model behind the handle, e.g. for scheduling."""
+        if self._specifier.get("type") == "instanceReference":
+            return self._specifier.get("instanceReference")
+        query = self._specifier.get("query") or {}
+        return query.get("identifier") or query.get("path") or ""
+
     def get_model_info(
         self,
     ) -> utils.LiteralOrCoroutine[Optional[dc.ModelDescriptor]]:
@@ -1,4 +1,4 @@
-from typing import List
+from typing import List, Optional
 
 import lmstudio_sdk.dataclasses as dc
 import lmstudio_sdk.utils as utils
@@ -24,12 +24,14 @@ class EmbeddingDynamicHandle(DynamicHandle):
     """
 
     def embed_string(
-        self, input_string: str
+        self, input_string: str, schedule: Optional[dc.ScheduleOpts] = None
     ) -> utils.LiteralOrCoroutine[dict[str, List[float]]]:
         """Embed a string into a vector representation.
 
         Args:
             input_string: The string to embed.
+            schedule: Queue the request in a scheduler before sending it,
+                as for predictions. See `ScheduleOpts`.
 
         Returns:
             A dictionary containing the embedding as a list of floats.
@@ -40,12 +42,47 @@ class EmbeddingDynamicHandle(DynamicHandle):
             type(input_string),
             logger,
         )
-        return self._port.call_rpc(
-            "embedString",
-            {"specifier": self._specifier, "inputString": input_string},
-            lambda x: x,
+
+        def embed():
+            return self._port.call_rpc(
+                "embedString",
+                {"specifier": self._specifier, "inputString": input_string},
+                lambda x: x,
+            )
+
+        if schedule is None:
+            return embed()
+        scheduler = schedule["scheduler"]
+        args = (
+            self._model_key(),
+            schedule.get("priority", "default"),
+            schedule.get("signal"),
+            schedule.get("tenant"),
         )
 
+        if self._port.is_async():
+
+            async def embed_async():
+                ticket = await scheduler.acquire_async(*args)
+                try:
+                    result = await embed()
+                except BaseException as e:
+                    scheduler.release(ticket, e)
+                    raise
+                scheduler.release(ticket)
+                return result
+
+            return embed_async()
+
+        ticket = scheduler.acquire(*args)
+        try:
+            result = embed()
+        except BaseException as e:
+            scheduler.release(ticket, e)
+            raise
+        scheduler.release(ticket)
+        return result
+
     def unstable_get_context_length(self) -> utils.LiteralOrCoroutine[int]:
         """Get the context length of the model.
 
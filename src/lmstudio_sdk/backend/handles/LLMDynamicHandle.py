@@ -1,4 +1,21 @@
-from typing import Any, Callable, Coroutine, List, Optional, Tuple
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import as_completed as futures_as_completed
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Coroutine,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Tuple,
+)
 
 import lmstudio_sdk.dataclasses as dc
 import lmstudio_sdk.utils as utils
@@ -9,6 +26,19 @@ from .DynamicHandle import DynamicHandle
 
 logger = utils.get_logger(__name__)
 
+IndexedResult = Tuple[int, dc.PredictionResult | BaseException]
+"""The index of an input and its prediction result or error."""
+
+DEADLINE_GRACE_PERIOD = 1.0
+"""Seconds a prediction past its deadline is given to stop on the server.
+
+If the server has not confirmed the cancel by then, the prediction is
+resolved on the client with what has been received.
+"""
+
+UNCACHED_OPTS = ("stop_when", "max_wall_time", "deadline_s", "backpressure")
+"""Extra options that can cut a prediction short, so bypass the cache."""
+
 
 def predict_internal_process_result(extra):
     """Abort handler callback for predict_internal."""
@@ -36,84 +66,36 @@ class LLMDynamicHandle(DynamicHandle):
     using the same `LLMSpecificModel` will use the new model.
     """
 
-    _internal_kv_config_stack = dc.KVConfigStack(layers=[])
-
-    def __prediction_config_to_kv_config(
-        self, prediction_config: Optional[dc.LLMPredictionConfig]
-    ) -> dc.KVConfig:
-        """Converts a prediction config to a KVConfig."""
-        fields = []
-        if prediction_config is not None:
-            for default_key in [
-                "temperature",
-                "context_overflow_policy",
-                "stop_strings",
-                "structured",
-                "top_k_sampling",
-            ]:
-                if default_key in prediction_config:
-                    fields.append(
-                        {
-                            "key": default_key,
-                            "value": prediction_config[default_key],
-                        }
-                    )
-            if "max_predicted_tokens" in prediction_config:
-                fields.append(
-                    {
-                        "key": "max_predicted_tokens",
-                        "value": utils.number_to_checkbox_numeric(
-                            prediction_config["max_predicted_tokens"], -1, 1
-                        ),
-                    }
-                )
-            if "repeat_penalty" in prediction_config:
-                fields.append(
-                    {
-                        "key": "repeat_penalty",
-                        "value": utils.number_to_checkbox_numeric(
-                            prediction_config["repeat_penalty"], 1, 1
-                        ),
-                    }
-                )
-            if "min_p_sampling" in prediction_config:
-                fields.append(
-                    {
-                        "key": "min_p_sampling",
-                        "value": utils.number_to_checkbox_numeric(
-                            prediction_config["min_p_sampling"], 0, 0.05
-                        ),
-                    }
-                )
-            if "top_p_sampling" in prediction_config:
-                fields.append(
-                    {
-                        "key": "top_p_sampling",
-                        "value": utils.number_to_checkbox_numeric(
-                            prediction_config["top_p_sampling"], 1, 0.95
-                        ),
-                    }
-                )
-            if "cpu_threads" in prediction_config:
-                fields.append(
-                    {
-                        "key": "llama.cpu_threads",
-                        "value": prediction_config["cpu_threads"],
-                    }
-                )
-        return {"fields": fields}
-
-    def __split_opts(
-        self, opts: Optional[dc.LLMPredictionOpts]
-    ) -> Tuple[dc.LLMPredictionConfig, dc.LLMPredictionExtraOpts]:
-        if opts is None:
-            return {}, {}
-        extra_opts: dc.LLMPredictionExtraOpts = {}
-        for key in ["on_prompt_processing_progress", "on_first_token"]:
-            if key in opts:
-                extra_opts[key] = opts[key]
-                del opts[key]
-        return opts, extra_opts
+    _internal_kv_config_stack: dc.KVConfigStack
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._internal_kv_config_stack = dc.KVConfigStack(layers=[])
+
+    def __compile_opts(
+        self,
+        opts: Optional[dc.LLMPredictionOpts | dc.CompiledPredictionConfig],
+    ) -> dc.CompiledPredictionConfig:
+        if isinstance(opts, dc.CompiledPredictionConfig):
+            return opts
+        return dc.CompiledPredictionConfig(opts)
+
+    def __build_prediction_config_stack(
+        self,
+        compiled: dc.CompiledPredictionConfig,
+        mode: dc.PredictionMode,
+    ) -> dc.KVConfigStack:
+        """Build a fresh config stack for a single prediction.
+
+        The handle's own layers are never mutated, so the stack stays
+        the same size no matter how many predictions are made.
+        """
+        return {
+            "layers": [
+                *self._internal_kv_config_stack["layers"],
+                *compiled.layers(mode),
+            ]
+        }
 
     def __resolve_completion_context(
         self, contextInput: dc.LLMCompletionContextInput
@@ -149,7 +131,7 @@ class LLMDynamicHandle(DynamicHandle):
         prediction_config_stack: dc.KVConfigStack,
         cancel_event: utils.SyncBufferedEvent | utils.AsyncBufferedEvent,
         extra_opts: dc.LLMPredictionExtraOpts,
-        on_fragment: Callable[[str], None],
+        on_fragment: Callable[[str], Optional[Awaitable[None]]],
         on_finished: Callable[
             [
                 dc.LLMPredictionStats,
@@ -181,6 +163,7 @@ class LLMDynamicHandle(DynamicHandle):
                 and triggerable using `.cancel()`.
             extra_opts: Extra prediction options not in the config stack.
             on_fragment: Callback on receiving a response fragment.
+                May return an awaitable to pause receiving until done.
             on_finished: Callback on response completion.
             on_error: Callback on channel error.
             postprocess: The postprocess handler. See `BaseClientPort`.
@@ -194,11 +177,95 @@ class LLMDynamicHandle(DynamicHandle):
         """
         finished = self._port._rpc_complete_event()
         is_first_token = True
+        stop_when = extra_opts.get("stop_when")
+        early_stop = (
+            utils.EarlyStopMatcher(stop_when) if stop_when else None
+        )
+
+        started_at = time.monotonic()
+        first_token_at: Optional[float] = None
+        num_fragments = 0
+        wall_time = self.__wall_time(extra_opts)
+        deadline_timer = None
+        resolved_locally = False
+        channel: Optional[int] = None
+
+        def request_cancel():
+            if self._port.is_async():
+                asyncio.ensure_future(cancel_event.emit())
+            else:
+                cancel_event.emit()
+
+        def stop_early():
+            logger.info("Stopping prediction early on %s.", early_stop.reason)
+            request_cancel()
+
+        def on_deadline():
+            nonlocal deadline_timer
+            if finished.is_set():
+                return
+            logger.warning(
+                "Prediction ran past its deadline of %.3f s, cancelling.",
+                wall_time,
+            )
+            request_cancel()
+            deadline_timer = self._port._arm_timer(
+                DEADLINE_GRACE_PERIOD, resolve_locally
+            )
+
+        def resolve_locally():
+            nonlocal resolved_locally
+            if finished.is_set():
+                return
+            logger.warning(
+                "Server did not stop the prediction in time, "
+                "resolving it with the content received so far."
+            )
+            resolved_locally = True
+            finished.set()
+            if channel is not None:
+                self._port.drop_channel(channel)
+            elapsed = time.monotonic() - started_at
+            on_finished(
+                dc.LLMPredictionStats(
+                    dc.LLMPredictionStopReason.USER_STOPPED,
+                    num_fragments / elapsed if elapsed else None,
+                    None,
+                    (
+                        first_token_at - started_at
+                        if first_token_at is not None
+                        else None
+                    ),
+                    None,
+                    num_fragments,
+                    None,
+                ),
+                None,
+                None,
+                None,
+            )
+
+        def stop_deadline_timer():
+            if deadline_timer is not None:
+                deadline_timer.cancel()
 
         def handle_fragments(message: dict):
+            if resolved_locally:
+                return None
             message_type = message.get("type", "")
             if message_type == "fragment":
-                on_fragment(message.get("fragment", ""))
+                nonlocal num_fragments, first_token_at
+                num_fragments += 1
+                if first_token_at is None:
+                    first_token_at = time.monotonic()
+                fragment = message.get("fragment", "")
+                if early_stop is not None:
+                    if early_stop.reason is not None:
+                        # cancelled, and what follows would be discarded
+                        return None
+                    if early_stop.feed(fragment):
+                        stop_early()
+                paused = on_fragment(fragment)
                 nonlocal is_first_token
                 if is_first_token:
                     is_first_token = False
@@ -207,6 +274,7 @@ class LLMDynamicHandle(DynamicHandle):
                         on_first_token = extra_opts.get("on_first_token")
                         if on_first_token is not None:
                             on_first_token()
+                return paused
             elif message_type == "promptProcessingProgress":
                 logger.debug(
                     "Processing prompt, progress: %f",
@@ -223,6 +291,7 @@ class LLMDynamicHandle(DynamicHandle):
             elif message_type == "success":
                 nonlocal finished
                 finished.set()
+                stop_deadline_timer()
                 logger.debug("Prediction completed successfully.")
                 try:
                     stats = dc.LLMPredictionStats(**message.get("stats", {}))
@@ -238,11 +307,12 @@ class LLMDynamicHandle(DynamicHandle):
                     message.get("predictionConfig", {}),
                 )
             elif message_type == "channelError":
+                stop_deadline_timer()
                 logger.error(
                     "Prediction failed: %s",
                     utils.pretty_print_error(message.get("error")),
                 )
-                on_error(utils.ChannelError(message.get("error").get("title")))
+                on_error(utils.channel_error(message))
 
         def cancel_send(channel_id):
             logger.info(
@@ -260,6 +330,16 @@ class LLMDynamicHandle(DynamicHandle):
             {"cancel_event": cancel_event, "cancel_send": cancel_send}
         )
 
+        def on_created(extra: dict):
+            nonlocal channel
+            channel = extra.get("channelId")
+            return postprocess(predict_internal_process_result(extra))
+
+        if wall_time is not None:
+            deadline_timer = self._port._arm_timer(
+                max(wall_time, 0.0), on_deadline
+            )
+
         return self._port.create_channel(
             "predict",
             {
@@ -268,14 +348,279 @@ class LLMDynamicHandle(DynamicHandle):
                 "predictionConfigStack": prediction_config_stack,
             },
             handle_fragments,
-            lambda x: postprocess(predict_internal_process_result(x)),
+            on_created,
             extra,
+            timeout=extra_opts.get("timeout"),
+        )
+
+    @staticmethod
+    def __wall_time(extra_opts: dc.LLMPredictionExtraOpts) -> Optional[float]:
+        """Get the seconds a prediction may take, if limited."""
+        limits = []
+        if extra_opts.get("max_wall_time") is not None:
+            limits.append(extra_opts["max_wall_time"])
+        if extra_opts.get("deadline_s") is not None:
+            limits.append(extra_opts["deadline_s"] - time.time())
+        return min(limits) if limits else None
+
+    def __prediction_classes(self):
+        if self._port.is_async():
+            return comms.AsyncOngoingPrediction, utils.AsyncBufferedEvent
+        return comms.SyncOngoingPrediction, utils.SyncBufferedEvent
+
+    def __start_prediction(
+        self,
+        context: dc.LLMContext,
+        prediction_config_stack: dc.KVConfigStack,
+        extra_opts: dc.LLMPredictionExtraOpts,
+        on_result: Optional[Callable[[dict], None]] = None,
+        on_done: Optional[Callable[[Any], None]] = None,
+    ) -> (
+        comms.SyncOngoingPrediction
+        | Coroutine[Any, Any, comms.AsyncOngoingPrediction]
+    ):
+        """Start a prediction on the server.
+
+        Args:
+            context: The resolved context to predict from.
+            prediction_config_stack: The prediction config stack.
+            extra_opts: Extra prediction options not in the config stack.
+            on_result: Called with the prediction as a `PredictionCache`
+                entry if it succeeds, before it resolves.
+            on_done: Called with the prediction's stats once it
+                finishes, or with the exception if it fails.
+        """
+        OngoingPrediction, BufferedEvent = self.__prediction_classes()
+        cancel_event, emit_cancel_event = BufferedEvent.create()
+        ongoing_prediction, finished, failed, push = OngoingPrediction.create(
+            emit_cancel_event,
+            extra_opts.get("coalesce"),
+            extra_opts.get("retain", True),
+            extra_opts.get("backpressure"),
+        )
+        fragments: List[str] = []
+
+        def on_fragment(fragment: str):
+            if on_result is not None:
+                fragments.append(fragment)
+            return push(fragment)
+
+        def on_finished(
+            stats, model_info, load_model_config, prediction_config
+        ):
+            if on_result is not None and stats.stop_reason not in (
+                dc.LLMPredictionStopReason.USER_STOPPED,
+                dc.LLMPredictionStopReason.MODEL_UNLOADED,
+                dc.LLMPredictionStopReason.FAILED,
+            ):
+                on_result(
+                    {
+                        "fragments": fragments,
+                        "stats": stats.to_dict(),
+                        "modelInfo": model_info,
+                        "loadConfig": load_model_config,
+                        "predictionConfig": prediction_config,
+                    }
+                )
+            if on_done is not None:
+                on_done(stats)
+            finished(stats, model_info, load_model_config, prediction_config)
+
+        def on_error(error: Exception):
+            if on_done is not None:
+                on_done(error)
+            failed(error)
+
+        return self.__predict_internal(
+            self._specifier,
+            context,
+            prediction_config_stack,
+            cancel_event,
+            extra_opts,
+            on_fragment,
+            on_finished,
+            on_error,
+            lambda x: x.get("ongoing_prediction"),
+            extra={"ongoing_prediction": ongoing_prediction},
+        )
+
+    def __dispatch(
+        self,
+        context: dc.LLMContext,
+        prediction_config_stack: dc.KVConfigStack,
+        extra_opts: dc.LLMPredictionExtraOpts,
+        on_result: Optional[Callable[[dict], None]] = None,
+    ) -> (
+        comms.SyncOngoingPrediction
+        | Coroutine[Any, Any, comms.AsyncOngoingPrediction]
+    ):
+        """Start a prediction, once its `schedule` admits it if it has one."""
+        schedule = extra_opts.get("schedule")
+        if schedule is None:
+            return self.__start_prediction(
+                context, prediction_config_stack, extra_opts, on_result
+            )
+        scheduler = schedule["scheduler"]
+        model = self._model_key()
+        priority = schedule.get("priority", "default")
+        signal = schedule.get("signal")
+        tenant = schedule.get("tenant")
+
+        def start(ticket: utils.SchedulerTicket):
+            on_first_token = extra_opts.get("on_first_token")
+
+            def first_token():
+                ticket.first_token_at = time.monotonic()
+                if on_first_token is not None:
+                    on_first_token()
+
+            return self.__start_prediction(
+                context,
+                prediction_config_stack,
+                {**extra_opts, "on_first_token": first_token},
+                on_result,
+                lambda outcome: scheduler.release(ticket, outcome),
+            )
+
+        if self._port.is_async():
+
+            async def start_async() -> comms.AsyncOngoingPrediction:
+                ticket = await scheduler.acquire_async(
+                    model, priority, signal, tenant
+                )
+                try:
+                    return await start(ticket)
+                except BaseException as e:
+                    scheduler.release(ticket, e)
+                    raise
+
+            return start_async()
+
+        ticket = scheduler.acquire(model, priority, signal, tenant)
+        try:
+            return start(ticket)
+        except BaseException as e:
+            scheduler.release(ticket, e)
+            raise
+
+    def __replay_prediction(
+        self, entry: dict, extra_opts: dc.LLMPredictionExtraOpts
+    ) -> comms.SyncOngoingPrediction | comms.AsyncOngoingPrediction:
+        """Make an already finished prediction from a cache entry."""
+        OngoingPrediction, BufferedEvent = self.__prediction_classes()
+        _, emit_cancel_event = BufferedEvent.create()
+        ongoing_prediction, finished, _, push = OngoingPrediction.create(
+            emit_cancel_event,
+            extra_opts.get("coalesce"),
+            extra_opts.get("retain", True),
+        )
+        for fragment in entry["fragments"]:
+            push(fragment)
+        on_first_token = extra_opts.get("on_first_token")
+        if entry["fragments"] and on_first_token is not None:
+            on_first_token()
+        finished(
+            dc.LLMPredictionStats(**entry["stats"]),
+            entry["modelInfo"],
+            entry["loadConfig"],
+            entry["predictionConfig"],
+        )
+        return ongoing_prediction
+
+    def __predict_cached(
+        self,
+        cache: utils.PredictionCache,
+        model_info: Optional[dc.ModelDescriptor],
+        context: dc.LLMContext,
+        prediction_config_stack: dc.KVConfigStack,
+        config_key: dict,
+        extra_opts: dc.LLMPredictionExtraOpts,
+    ):
+        if not model_info:
+            # nothing loaded to key on; let the server deal with it
+            return self.__dispatch(
+                context, prediction_config_stack, extra_opts
+            )
+        key = cache.make_key(model_info.get("path"), context, config_key)
+        entry = cache.get(key)
+        if entry is not None:
+            logger.debug("Replaying cached prediction %s.", key)
+            return self.__replay_prediction(entry, extra_opts)
+        return self.__dispatch(
+            context,
+            prediction_config_stack,
+            extra_opts,
+            lambda entry: cache.put(key, entry),
+        )
+
+    async def __predict_cached_async(
+        self,
+        cache: utils.PredictionCache,
+        context: dc.LLMContext,
+        prediction_config_stack: dc.KVConfigStack,
+        config_key: dict,
+        extra_opts: dc.LLMPredictionExtraOpts,
+    ) -> comms.AsyncOngoingPrediction:
+        prediction = self.__predict_cached(
+            cache,
+            await self.get_model_info(),
+            context,
+            prediction_config_stack,
+            config_key,
+            extra_opts,
+        )
+        if isinstance(prediction, comms.AsyncOngoingPrediction):
+            return prediction
+        return await prediction
+
+    def __predict(
+        self,
+        context: dc.LLMContext,
+        compiled: dc.CompiledPredictionConfig,
+        mode: dc.PredictionMode,
+    ) -> (
+        comms.SyncOngoingPrediction
+        | Coroutine[Any, Any, comms.AsyncOngoingPrediction]
+    ):
+        extra_opts = compiled.extra_opts
+        prediction_config_stack = self.__build_prediction_config_stack(
+            compiled, mode
+        )
+        cache = extra_opts.get("cache")
+        if (
+            cache is None
+            or not compiled.deterministic
+            or any(extra_opts.get(opt) is not None for opt in UNCACHED_OPTS)
+        ):
+            return self.__dispatch(
+                context, prediction_config_stack, extra_opts
+            )
+        # the compiled layers are keyed on by their cached encoding,
+        # rather than encoding them again for every prediction
+        config_key = {
+            "layers": self._internal_kv_config_stack["layers"],
+            "compiled": compiled.encoded(mode),
+        }
+        # the cache is keyed on the model actually behind the handle
+        if self._port.is_async():
+            return self.__predict_cached_async(
+                cache, context, prediction_config_stack, config_key, extra_opts
+            )
+        return self.__predict_cached(
+            cache,
+            self.get_model_info(),
+            context,
+            prediction_config_stack,
+            config_key,
+            extra_opts,
         )
 
     def complete(
         self,
         prompt: dc.LLMCompletionContextInput,
-        opts: Optional[dc.LLMPredictionOpts] = None,
+        opts: Optional[
+            dc.LLMPredictionOpts | dc.CompiledPredictionConfig
+        ] = None,
     ) -> (
         comms.SyncOngoingPrediction
         | Coroutine[Any, Any, comms.AsyncOngoingPrediction]
@@ -329,7 +674,9 @@ class LLMDynamicHandle(DynamicHandle):
         Args:
             prompt: The prompt to use for generating a completion.
             opts: Options for the prediction, if any. Defaults to using the
-                options set in the LM Studio server.
+                options set in the LM Studio server. Pass a
+                `CompiledPredictionConfig` to reuse the same options
+                across many predictions without re-converting them.
 
         Returns:
             An OngoingPrediction object representing the prediction process.
@@ -341,69 +688,18 @@ class LLMDynamicHandle(DynamicHandle):
             logger,
         )
 
-        config, extra_opts = self.__split_opts(opts)
-
-        if self._port.is_async():
-            OngoingPrediction = comms.AsyncOngoingPrediction
-            BufferedEvent = utils.AsyncBufferedEvent
-        else:
-            OngoingPrediction = comms.SyncOngoingPrediction
-            BufferedEvent = utils.SyncBufferedEvent
-
-        cancel_event, emit_cancel_event = BufferedEvent.create()
-        ongoing_prediction, finished, failed, push = OngoingPrediction.create(
-            emit_cancel_event
-        )
-
-        config["stop_strings"] = []
-        prediction_layers = self._internal_kv_config_stack.get("layers", [])
-        prediction_layers.append(
-            dc.KVConfigStackLayer(
-                layerName=dc.KVConfigLayerName.API_OVERRIDE,
-                config=self.__prediction_config_to_kv_config(config),
-            )
-        )
-        prediction_layers.append(
-            {
-                "layerName": dc.KVConfigLayerName.COMPLETE_MODE_FORMATTING,
-                "config": dc.convert_dict_to_kv_config(
-                    {
-                        "promptTemplate": {
-                            "type": "jinja",
-                            "jinjaPromptTemplate": {
-                                "bosToken": "",
-                                "eosToken": "",
-                                "template": "{% for message in messages %}{{ message['content'] }}{% endfor %}",
-                            },
-                            "stop_strings": [],
-                        }
-                    }
-                ),
-            }
-        )
-
-        return self.__predict_internal(
-            self._specifier,
+        return self.__predict(
             self.__resolve_completion_context(prompt),
-            {"layers": prediction_layers},
-            cancel_event,
-            extra_opts,
-            lambda fragment: push(fragment),
-            lambda stats,
-            model_info,
-            load_model_config,
-            prediction_config: finished(
-                stats, model_info, load_model_config, prediction_config
-            ),
-            lambda error: failed(error),
-            lambda x: x.get("ongoing_prediction"),
-            extra={"ongoing_prediction": ongoing_prediction},
+            self.__compile_opts(opts),
+            "complete",
         )
 
     def respond(
         self,
-        history: dc.LLMConversationContextInput,
-        opts: Optional[dc.LLMPredictionOpts] = None,
+        history: dc.LLMConversationContextInput | dc.ChatSession,
+        opts: Optional[
+            dc.LLMPredictionOpts | dc.CompiledPredictionConfig
+        ] = None,
     ) -> (
         comms.SyncOngoingPrediction
         | Coroutine[Any, Any, comms.AsyncOngoingPrediction]
@@ -424,6 +720,10 @@ class LLMDynamicHandle(DynamicHandle):
         in the `history` list will update the conversation as if the user
         edited a message.
 
+        For long conversations, pass a `ChatSession` instead, which keeps
+        its messages in the format sent to the model, so each turn only
+        converts the new messages rather than the whole history.
+
         Example synchronous usage as a promise (Resolves to a `PredictionResult`):
 
         ```python
@@ -474,13 +774,21 @@ class LLMDynamicHandle(DynamicHandle):
         using `cancel()`.
 
         Args:
-            history: The chat history to use for generating a completion.
+            history: The chat history to use for generating a completion,
+                or a `ChatSession`.
             opts: Options for the prediction, if any. Defaults to using the
-                options set in the LM Studio server.
+                options set in the LM Studio server. Pass a
+                `CompiledPredictionConfig` to reuse the same options
+                across many predictions without re-converting them.
 
         Returns:
             An OngoingPrediction object representing the prediction process.
         """
+        if isinstance(history, dc.ChatSession):
+            return self.__predict(
+                history.context(), self.__compile_opts(opts), "respond"
+            )
+
         try:
             resolved_context = self.__resolve_conversation_context(history)
         except Exception as e:
@@ -490,44 +798,252 @@ class LLMDynamicHandle(DynamicHandle):
                 LLMConversationContextInput, got something else."
             )
 
-        config, extra_opts = self.__split_opts(opts)
+        return self.__predict(
+            resolved_context,
+            self.__compile_opts(opts),
+            "respond",
+        )
 
+    def __iter_predictions_sync(
+        self,
+        predict: Callable[[Any], comms.SyncOngoingPrediction],
+        items: List[Any],
+        concurrency: int,
+        return_exceptions: bool,
+    ) -> Iterator[IndexedResult]:
+        ongoing: Dict[int, comms.SyncOngoingPrediction] = {}
+        stopping = threading.Event()
+
+        def run(index: int, item: Any) -> IndexedResult:
+            try:
+                prediction = ongoing[index] = predict(item)
+                if stopping.is_set():
+                    prediction.cancel()
+                return index, prediction.result()
+            except Exception as e:
+                return index, e
+            finally:
+                ongoing.pop(index, None)
+
+        pool = ThreadPoolExecutor(concurrency)
+        futures = [pool.submit(run, i, item) for i, item in enumerate(items)]
+        try:
+            for future in futures_as_completed(futures):
+                index, result = future.result()
+                if isinstance(result, Exception) and not return_exceptions:
+                    raise result
+                yield index, result
+        finally:
+            stopping.set()
+            for future in futures:
+                future.cancel()
+            for prediction in list(ongoing.values()):
+                prediction.cancel()
+            pool.shutdown()
+
+    async def __iter_predictions_async(
+        self,
+        predict: Callable[
+            [Any], Coroutine[Any, Any, comms.AsyncOngoingPrediction]
+        ],
+        items: List[Any],
+        concurrency: int,
+        return_exceptions: bool,
+    ) -> AsyncIterator[IndexedResult]:
+        semaphore = asyncio.Semaphore(concurrency)
+
+        async def run(index: int, item: Any) -> IndexedResult:
+            async with semaphore:
+                prediction = None
+                try:
+                    prediction = await predict(item)
+                    # shielded, as cancelling the prediction's own future
+                    # would break it resolving once the cancel lands
+                    return index, await asyncio.shield(prediction.result())
+                except asyncio.CancelledError:
+                    if prediction is not None:
+                        await prediction.cancel()
+                    raise
+                except Exception as e:
+                    return index, e
+
+        tasks = [
+            asyncio.ensure_future(run(i, item)) for i, item in enumerate(items)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                index, result = await next_done
+                if isinstance(result, Exception) and not return_exceptions:
+                    raise result
+                yield index, result
+        finally:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+    def __predict_many(
+        self,
+        predict: Callable[[Any], Any],
+        inputs: Iterable[Any],
+        concurrency: int,
+        as_completed: bool,
+        return_exceptions: bool,
+    ):
+        utils._assert(
+            isinstance(concurrency, int) and concurrency >= 1,
+            "concurrency must be a positive integer, got %s",
+            concurrency,
+            logger,
+        )
+        items = list(inputs)
         if self._port.is_async():
-            OngoingPrediction = comms.AsyncOngoingPrediction
-            BufferedEvent = utils.AsyncBufferedEvent
-        else:
-            OngoingPrediction = comms.SyncOngoingPrediction
-            BufferedEvent = utils.SyncBufferedEvent
+            stream = self.__iter_predictions_async(
+                predict, items, concurrency, return_exceptions
+            )
+            if as_completed:
+                return stream
 
-        cancel_event, emit_cancel_event = BufferedEvent.create()
-        ongoing_prediction, finished, failed, push = OngoingPrediction.create(
-            emit_cancel_event
+            async def collect_async() -> List[Any]:
+                results: List[Any] = [None] * len(items)
+                async for index, result in stream:
+                    results[index] = result
+                return results
+
+            return collect_async()
+
+        stream = self.__iter_predictions_sync(
+            predict, items, concurrency, return_exceptions
         )
+        if as_completed:
+            return stream
+        results: List[Any] = [None] * len(items)
+        for index, result in stream:
+            results[index] = result
+        return results
+
+    def complete_many(
+        self,
+        prompts: Iterable[dc.LLMCompletionContextInput],
+        opts: Optional[
+            dc.LLMPredictionOpts | dc.CompiledPredictionConfig
+        ] = None,
+        concurrency: int = 4,
+        as_completed: bool = False,
+        return_exceptions: bool = False,
+    ) -> (
+        List[dc.PredictionResult]
+        | Iterator[IndexedResult]
+        | Coroutine[Any, Any, List[dc.PredictionResult]]
+        | AsyncIterator[IndexedResult]
+    ):
+        """Run `complete` on many prompts, a few at a time.
 
-        prediction_layers = self._internal_kv_config_stack.get("layers", [])
-        prediction_layers.append(
-            dc.KVConfigStackLayer(
-                layerName=dc.KVConfigLayerName.API_OVERRIDE,
-                config=self.__prediction_config_to_kv_config(config),
-            )
+        At most `concurrency` predictions run at once; the next one
+        starts as soon as one finishes. The options are compiled once
+        and shared by all predictions.
+
+        Example synchronous usage:
+
+        ```python
+        results = model.complete_many(prompts, concurrency=8)
+        for prompt, result in zip(prompts, results):
+            print(prompt, result.content)
+        ```
+
+        And asynchronous:
+
+        ```python
+        results = await model.complete_many(prompts, concurrency=8)
+        ```
+
+        To handle results as soon as they are done rather than all at
+        the end, pass `as_completed=True` and iterate over
+        `(index, result)` pairs, where `index` is the position of the
+        prompt in `prompts`:
+
+        ```python
+        for index, result in model.complete_many(
+            prompts, as_completed=True
+        ):
+            print(prompts[index], result.content)
+        ```
+
+        And asynchronous (without `await`):
+
+        ```python
+        async for index, result in model.complete_many(
+            prompts, as_completed=True
+        ):
+            print(prompts[index], result.content)
+        ```
+
+        Args:
+            prompts: The prompts to generate completions for.
+            opts: Options for every prediction, as in `complete`.
+            concurrency: The most predictions to run at once.
+            as_completed: Whether to return an (async) iterator of
+                `(index, result)` pairs in the order the predictions
+                finish, rather than a list in the order of `prompts`.
+            return_exceptions: Whether failed predictions give their
+                exception as their result. By default, the first
+                failure is raised and the predictions still running are
+                cancelled.
+
+        Returns:
+            The prediction results in the order of `prompts`, or an
+            iterator over them as they finish if `as_completed` is set.
+        """
+        compiled = self.__compile_opts(opts)
+        return self.__predict_many(
+            lambda prompt: self.complete(prompt, compiled),
+            prompts,
+            concurrency,
+            as_completed,
+            return_exceptions,
         )
 
-        return self.__predict_internal(
-            self._specifier,
-            resolved_context,
-            {"layers": prediction_layers},
-            cancel_event,
-            extra_opts,
-            lambda fragment: push(fragment),
-            lambda stats,
-            model_info,
-            load_model_config,
-            prediction_config: finished(
-                stats, model_info, load_model_config, prediction_config
-            ),
-            lambda error: failed(error),
-            lambda x: x.get("ongoing_prediction"),
-            extra={"ongoing_prediction": ongoing_prediction},
+    def respond_many(
+        self,
+        histories: Iterable[dc.LLMConversationContextInput | dc.ChatSession],
+        opts: Optional[
+            dc.LLMPredictionOpts | dc.CompiledPredictionConfig
+        ] = None,
+        concurrency: int = 4,
+        as_completed: bool = False,
+        return_exceptions: bool = False,
+    ) -> (
+        List[dc.PredictionResult]
+        | Iterator[IndexedResult]
+        | Coroutine[Any, Any, List[dc.PredictionResult]]
+        | AsyncIterator[IndexedResult]
+    ):
+        """Run `respond` on many chat histories, a few at a time.
+
+        Works like `complete_many`, see there for examples.
+
+        Args:
+            histories: The chat histories to generate responses for.
+            opts: Options for every prediction, as in `respond`.
+            concurrency: The most predictions to run at once.
+            as_completed: Whether to return an (async) iterator of
+                `(index, result)` pairs in the order the predictions
+                finish, rather than a list in the order of `histories`.
+            return_exceptions: Whether failed predictions give their
+                exception as their result. By default, the first
+                failure is raised and the predictions still running are
+                cancelled.
+
+        Returns:
+            The prediction results in the order of `histories`, or an
+            iterator over them as they finish if `as_completed` is set.
+        """
+        compiled = self.__compile_opts(opts)
+        return self.__predict_many(
+            lambda history: self.respond(history, compiled),
+            histories,
+            concurrency,
+            as_completed,
+            return_exceptions,
         )
 
     def unstable_get_context_length(self) -> utils.LiteralOrCoroutine[int]:
@@ -7,6 +7,10 @@ Classes:
     EmbeddingSpecificModel: reference to a specific embedding model.
     LLMSpecificModel: reference to a specific LLM model.
 
+Functions:
+    hedged_complete: complete on the first of several handles to answer.
+    hedged_respond: respond on the first of several handles to answer.
+
 SpecificModels are returned by `get` and `load` methods of any
 `ModelNamespace`, and are used to interact with the model.
 """
@@ -15,6 +19,7 @@ from .DynamicHandle import DynamicHandle
 from .EmbeddingDynamicHandle import EmbeddingDynamicHandle
 from .LLMDynamicHandle import LLMDynamicHandle
 from .SpecificModel import EmbeddingSpecificModel, LLMSpecificModel
+from .hedging import hedged_complete, hedged_respond
 
 __all__ = [
     "DynamicHandle",
@@ -22,4 +27,6 @@ __all__ = [
     "LLMDynamicHandle",
     "EmbeddingSpecificModel",
     "LLMSpecificModel",
+    "hedged_complete",
+    "hedged_respond",
 ]
@@ -0,0 +1,339 @@
+"""Hedged predictions: race a slow prediction against backups.
+
+A prediction that has not produced its first token after `hedge_delay`
+seconds is hedged: the same prediction is started on the next handle,
+e.g. another instance of the model or the same model on another
+server. Whichever prediction produces a first token first wins, and
+the others are cancelled. This trades a little extra load for a lower
+tail latency.
+"""
+
+import asyncio
+import copy
+import threading
+from typing import Any, Callable, Coroutine, Dict, Optional, Sequence
+
+import lmstudio_sdk.dataclasses as dc
+import lmstudio_sdk.utils as utils
+import lmstudio_sdk.backend.communications as comms
+
+from .LLMDynamicHandle import LLMDynamicHandle
+
+
+logger = utils.get_logger(__name__)
+
+
+def _with_first_token(
+    opts: Optional[dc.LLMPredictionOpts | dc.CompiledPredictionConfig],
+    on_first_token: Callable[[], None],
+) -> dc.LLMPredictionOpts | dc.CompiledPredictionConfig:
+    """Get the options with the `on_first_token` callback replaced."""
+    if isinstance(opts, dc.CompiledPredictionConfig):
+        # a shallow copy shares the compiled layers
+        hedged = copy.copy(opts)
+        hedged.extra_opts = {
+            **opts.extra_opts,
+            "on_first_token": on_first_token,
+        }
+        return hedged
+    return {**(opts or {}), "on_first_token": on_first_token}
+
+
+def _user_first_token(
+    opts: Optional[dc.LLMPredictionOpts | dc.CompiledPredictionConfig],
+) -> Optional[Callable[[], None]]:
+    if isinstance(opts, dc.CompiledPredictionConfig):
+        return opts.extra_opts.get("on_first_token")
+    return (opts or {}).get("on_first_token")
+
+
+class _Race:
+    """Tracks which of the hedged predictions won."""
+
+    def __init__(self, on_first_token: Optional[Callable[[], None]]):
+        self.winner: Optional[int] = None
+        self.started = 0
+        self.failed = 0
+        self.error: Optional[BaseException] = None
+        self._on_first_token = on_first_token
+        self._lock = threading.Lock()
+
+    def claim(self, index: int) -> bool:
+        """Make the prediction at `index` the winner, if there is none."""
+        with self._lock:
+            if self.winner is not None:
+                return False
+            self.winner = index
+        logger.debug("Hedged prediction %d won.", index)
+        if self._on_first_token is not None:
+            self._on_first_token()
+        return True
+
+    def fail(self, error: BaseException):
+        with self._lock:
+            self.failed += 1
+            self.error = error
+
+    @property
+    def lost(self) -> bool:
+        """Whether every prediction started so far has failed."""
+        return self.winner is None and self.failed == self.started
+
+
+def _check_hedge(handles: Sequence[LLMDynamicHandle], hedge_delay: float):
+    utils._assert(
+        len(handles) > 0,
+        "Hedging needs at least one handle, got %s",
+        len(handles),
+        logger,
+    )
+    utils._assert(
+        len({handle._port.is_async() for handle in handles}) == 1,
+        "Hedged handles must all be sync or all be async, got %s",
+        handles,
+        logger,
+    )
+    utils._assert(
+        hedge_delay >= 0,
+        "hedge_delay must not be negative, got %s",
+        hedge_delay,
+        logger,
+    )
+
+
+def _hedge_sync(
+    handles: Sequence[LLMDynamicHandle],
+    predict: Callable[..., comms.SyncOngoingPrediction],
+    opts: Optional[dc.LLMPredictionOpts | dc.CompiledPredictionConfig],
+    hedge_delay: float,
+) -> comms.SyncOngoingPrediction:
+    race = _Race(_user_first_token(opts))
+    settled = threading.Event()
+    predictions: Dict[int, comms.SyncOngoingPrediction] = {}
+
+    def on_first_token(index: int):
+        if race.claim(index):
+            settled.set()
+
+    def watch(index: int, prediction: comms.SyncOngoingPrediction):
+        prediction.finished_event.wait()
+        if prediction.status == "rejected":
+            race.fail(prediction.error)
+            if race.lost:
+                settled.set()
+        # a prediction may finish without producing a single token
+        elif race.claim(index):
+            settled.set()
+
+    try:
+        for index, handle in enumerate(handles):
+            if index > 0:
+                logger.debug("Hedging on handle %d.", index)
+            race.started += 1
+            try:
+                prediction = predict(
+                    handle,
+                    _with_first_token(
+                        opts, lambda index=index: on_first_token(index)
+                    ),
+                )
+            except Exception as e:
+                race.fail(e)
+                continue
+            predictions[index] = prediction
+            threading.Thread(
+                target=watch, args=(index, prediction), daemon=True
+            ).start()
+            if index < len(handles) - 1:
+                settled.wait(hedge_delay)
+            # cleared before checking, so a claim from now on is seen
+            settled.clear()
+            if race.winner is not None:
+                break
+        while race.winner is None and not race.lost:
+            settled.wait()
+            settled.clear()
+    except BaseException:
+        for prediction in predictions.values():
+            prediction.cancel()
+        raise
+
+    for index, prediction in predictions.items():
+        if index != race.winner and prediction.status == "pending":
+            prediction.cancel()
+    if race.winner is None:
+        raise race.error
+    return predictions[race.winner]
+
+
+async def _hedge_async(
+    handles: Sequence[LLMDynamicHandle],
+    predict: Callable[..., Coroutine[Any, Any, comms.AsyncOngoingPrediction]],
+    opts: Optional[dc.LLMPredictionOpts | dc.CompiledPredictionConfig],
+    hedge_delay: float,
+) -> comms.AsyncOngoingPrediction:
+    race = _Race(_user_first_token(opts))
+    settled = asyncio.Event()
+    predictions: Dict[int, comms.AsyncOngoingPrediction] = {}
+
+    def on_first_token(index: int):
+        if race.claim(index):
+            settled.set()
+
+    def on_done(index: int, result: asyncio.Future):
+        error = None if result.cancelled() else result.exception()
+        if result.cancelled() or error is not None:
+            race.fail(error or asyncio.CancelledError())
+            if race.lost:
+                settled.set()
+        # a prediction may finish without producing a single token
+        elif race.claim(index):
+            settled.set()
+
+    try:
+        for index, handle in enumerate(handles):
+            if index > 0:
+                logger.debug("Hedging on handle %d.", index)
+            race.started += 1
+            try:
+                prediction = await predict(
+                    handle,
+                    _with_first_token(
+                        opts, lambda index=index: on_first_token(index)
+                    ),
+                )
+            except Exception as e:
+                race.fail(e)
+                continue
+            predictions[index] = prediction
+            prediction.promise_final.add_done_callback(
+                lambda result, index=index: on_done(index, result)
+            )
+            if index < len(handles) - 1:
+                try:
+                    await asyncio.wait_for(settled.wait(), hedge_delay)
+                except asyncio.TimeoutError:
+                    pass
+            settled.clear()
+            if race.winner is not None:
+                break
+        while race.winner is None and not race.lost:
+            await settled.wait()
+            settled.clear()
+    except BaseException:
+        for prediction in predictions.values():
+            await prediction.cancel()
+        raise
+
+    for index, prediction in predictions.items():
+        if index != race.winner and prediction.status == "pending":
+            await prediction.cancel()
+    if race.winner is None:
+        raise race.error
+    return predictions[race.winner]
+
+
+def _hedge(
+    handles: Sequence[LLMDynamicHandle],
+    predict: Callable[..., Any],
+    opts: Optional[dc.LLMPredictionOpts | dc.CompiledPredictionConfig],
+    hedge_delay: float,
+):
+    handles = list(handles)
+    _check_hedge(handles, hedge_delay)
+    if handles[0]._port.is_async():
+        return _hedge_async(handles, predict, opts, hedge_delay)
+    return _hedge_sync(handles, predict, opts, hedge_delay)
+
+
+def hedged_complete(
+    handles: Sequence[LLMDynamicHandle],
+    prompt: dc.LLMCompletionContextInput,
+    opts: Optional[dc.LLMPredictionOpts | dc.CompiledPredictionConfig] = None,
+    hedge_delay: float = 0.5,
+) -> (
+    comms.SyncOngoingPrediction
+    | Coroutine[Any, Any, comms.AsyncOngoingPrediction]
+):
+    """Complete a prompt, hedging on further handles if it is slow.
+
+    The completion starts on the first handle. Each time `hedge_delay`
+    seconds pass without a first token, it is also started on the next
+    handle. The first to produce a token is returned, and the others
+    are cancelled. A handle that fails is hedged on the next one right
+    away.
+
+    ```python
+    primary = client.llm.create_dynamic_handle("llama-3.2-1b-instruct")
+    backup = other_client.llm.create_dynamic_handle("llama-3.2-1b-instruct")
+    prediction = hedged_complete([primary, backup], "Once upon a time")
+    for fragment in prediction:
+        print(fragment, end="", flush=True)
+    ```
+
+    Args:
+        handles: The handles to try, in order. They may be on different
+            clients, but must all be sync or all be async.
+        prompt: The prompt to complete.
+        opts: Options for the prediction, as for `complete`. Its
+            `on_first_token` is called once, for the winner.
+        hedge_delay: Seconds to wait for a first token before hedging.
+
+    Returns:
+        The winning prediction, once it has produced its first token
+        (or finished without any).
+
+    Raises:
+        Exception: the last error, if the prediction failed on every
+            handle.
+    """
+    return _hedge(
+        handles,
+        lambda handle, hedged_opts: handle.complete(prompt, hedged_opts),
+        opts,
+        hedge_delay,
+    )
+
+
+def hedged_respond(
+    handles: Sequence[LLMDynamicHandle],
+    history: dc.LLMConversationContextInput,
+    opts: Optional[dc.LLMPredictionOpts | dc.CompiledPredictionConfig] = None,
+    hedge_delay: float = 0.5,
+) -> (
+    comms.SyncOngoingPrediction
+    | Coroutine[Any, Any, comms.AsyncOngoingPrediction]
+):
+    """Respond to a conversation, hedging on further handles if it is slow.
+
+    See `hedged_complete`, which this mirrors for `respond`.
+
+    ```python
+    prediction = await hedged_respond(
+        [primary, backup],
+        [{"role": "user", "content": "What is the meaning of life?"}],
+        hedge_delay=0.25,
+    )
+    print((await prediction.result()).content)
+    ```
+
+    Args:
+        handles: The handles to try, in order.
+        history: The conversation to respond to.
+        opts: Options for the prediction, as for `respond`.
+        hedge_delay: Seconds to wait for a first token before hedging.
+
+    Returns:
+        The winning prediction, once it has produced its first token
+        (or finished without any).
+
+    Raises:
+        Exception: the last error, if the prediction failed on every
+            handle.
+    """
+    return _hedge(
+        handles,
+        lambda handle, hedged_opts: handle.respond(history, hedged_opts),
+        opts,
+        hedge_delay,
+    )
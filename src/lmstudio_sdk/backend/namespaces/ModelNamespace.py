@@ -220,7 +220,7 @@ class ModelNamespace(
                     full_path,
                     utils.pretty_print_error(message.get("error")),
                 )
-                reject(utils.ChannelError(message.get("error").get("title")))
+                reject(utils.channel_error(message))
 
         def cancel_send(channel_id):
             logger.info(
@@ -258,6 +258,7 @@ class ModelNamespace(
             handle_message,
             lambda x: load_process_result(x),
             extra=extra,
+            timeout=opts.get("timeout") if opts else None,
         )
 
     def unload(self, identifier: str) -> None:
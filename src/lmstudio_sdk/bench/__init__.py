@@ -0,0 +1,54 @@
+# pylance: disable=unused-imports
+# flake8: noqa: f401
+# ruff: noqa: F401
+"""End-to-end benchmarks of the SDK against a mock server.
+
+Measures RPC round-trip latency, prediction streaming throughput,
+concurrent prediction scaling, model load overhead and client startup
+time, for the sync and async clients, against `MockLMStudioServer`,
+so no LM Studio or GPU is needed. Run it from the command line:
+
+```
+python -m lmstudio_sdk.bench --output report.json
+python -m lmstudio_sdk.bench --baseline tests/benchmarks/baseline.json
+```
+
+The second form exits with status 1 if any metric regressed from the
+baseline by more than the tolerance (`--tolerance`, 20% by default).
+Timings depend on the machine, so compare against a baseline recorded
+on the same one, with `--save-baseline`; the one in the repository
+was recorded on a single developer machine. A baseline recorded with
+another `--scale` or `--repeat` is refused. See
+`python -m lmstudio_sdk.bench --help`.
+
+Functions:
+    run: Run benchmark scenarios and return a report.
+    compare: Find the regressions of a report against a baseline.
+    check_comparable: Check a report ran with its baseline's settings.
+    load_report: Read a report from a JSON file.
+    save_report: Write a report to a JSON file.
+
+Classes:
+    Regression: A metric that regressed from its baseline.
+"""
+
+from .report import (
+    Regression,
+    check_comparable,
+    compare,
+    load_report,
+    run,
+    save_report,
+)
+from .scenarios import SCENARIOS, Metrics
+
+__all__ = [
+    "Metrics",
+    "Regression",
+    "SCENARIOS",
+    "check_comparable",
+    "compare",
+    "load_report",
+    "run",
+    "save_report",
+]
@@ -0,0 +1,105 @@
+import argparse
+import json
+import logging
+import sys
+
+from .report import (
+    check_comparable,
+    compare,
+    load_report,
+    run,
+    save_report,
+)
+from .scenarios import SCENARIOS
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m lmstudio_sdk.bench",
+        description="Benchmark the SDK against a local mock server.",
+    )
+    parser.add_argument(
+        "scenarios",
+        nargs="*",
+        metavar="scenario",
+        help="scenarios to run: %s (default: all)" % ", ".join(SCENARIOS),
+    )
+    parser.add_argument(
+        "--scale",
+        type=float,
+        default=1.0,
+        help="multiply the iterations of every scenario (default: 1)",
+    )
+    parser.add_argument(
+        "--repeat",
+        type=int,
+        default=3,
+        help="runs of each scenario, keeping the best of each metric "
+        "(default: 3)",
+    )
+    parser.add_argument(
+        "-o", "--output", help="write the report as JSON to this file"
+    )
+    parser.add_argument(
+        "--baseline",
+        help="compare against the report in this file, recorded with the "
+        "same --scale and --repeat. Timings depend on the machine: "
+        "tests/benchmarks/baseline.json was recorded on one (Python 3.11.7, "
+        "Linux), so re-record it on each CI host with --save-baseline",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="write the report to the --baseline file instead",
+    )
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="relative change allowed against the baseline (default: 0.2)",
+    )
+    args = parser.parse_args(argv)
+    if args.save_baseline and not args.baseline:
+        parser.error("--save-baseline needs --baseline")
+    for name in args.scenarios:
+        if name not in SCENARIOS:
+            parser.error("unknown scenario %s" % name)
+    baseline = None
+    if args.baseline and not args.save_baseline:
+        baseline = load_report(args.baseline)
+        settings = {"scale": args.scale, "repeat": args.repeat}
+        try:
+            check_comparable(settings, baseline)
+        except ValueError as e:
+            parser.error(str(e))
+
+    # clients are opened and closed in quick succession, and closing
+    # sync clients logs harmless errors from websocket-client
+    logging.getLogger("lmstudio_sdk").setLevel(logging.CRITICAL)
+    report = run(args.scenarios, args.scale, args.repeat)
+    if args.output:
+        save_report(report, args.output)
+    else:
+        json.dump(report, sys.stdout, indent=2, sort_keys=True)
+        print()
+
+    if not args.baseline:
+        return 0
+    if args.save_baseline:
+        save_report(report, args.baseline)
+        return 0
+    for key in ("python", "platform"):
+        if report[key] != baseline.get(key):
+            print(
+                "warning: the baseline was recorded on %s %s, not %s"
+                % (key, baseline.get(key), report[key]),
+                file=sys.stderr,
+            )
+    regressions = compare(report, baseline, args.tolerance)
+    for regression in regressions:
+        print("regressed:", regression, file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
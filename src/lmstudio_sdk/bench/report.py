@@ -0,0 +1,167 @@
+import json
+import platform
+import sys
+import time
+from typing import Dict, Iterable, List, NamedTuple, Optional
+
+from .scenarios import SCENARIOS, Metrics
+
+
+def _is_rate(metric: str) -> bool:
+    return metric.endswith("_per_s")
+
+
+def _best(runs: List[Metrics]) -> Metrics:
+    return {
+        metric: (max if _is_rate(metric) else min)(r[metric] for r in runs)
+        for metric in runs[0]
+    }
+
+
+def run(
+    scenarios: Optional[Iterable[str]] = None,
+    scale: float = 1.0,
+    repeat: int = 3,
+) -> dict:
+    """Run benchmark scenarios against a local mock server.
+
+    Args:
+        scenarios: Names of the scenarios to run, from `SCENARIOS`.
+            Defaults to all of them.
+        scale: Multiplies the iterations of every scenario, e.g. 0.1
+            for a quick smoke run.
+        repeat: Times to run each scenario. Each metric keeps its best
+            value over the runs, which is far less noisy than any one
+            run on a busy machine.
+
+    Returns:
+        A report: the environment the scenarios ran in, and the
+        `Metrics` of each under `"results"`.
+
+    Raises:
+        KeyError: If a scenario does not exist.
+    """
+    names = list(scenarios or SCENARIOS)
+    for name in names:
+        if name not in SCENARIOS:
+            raise KeyError("Unknown benchmark scenario %s" % name)
+    results: Dict[str, Metrics] = {}
+    for name in names:
+        results[name] = _best(
+            [SCENARIOS[name](scale) for _ in range(max(repeat, 1))]
+        )
+    return {
+        "python": platform.python_version(),
+        "platform": sys.platform,
+        "timestamp": time.time(),
+        "scale": scale,
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def load_report(path: str) -> dict:
+    """Read a report written by `save_report`."""
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_report(report: dict, path: str):
+    """Write a report as JSON, e.g. to keep it as a baseline."""
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+class Regression(NamedTuple):
+    """A metric that got worse than its baseline by more than allowed."""
+
+    scenario: str
+    metric: str
+    baseline: float
+    value: float
+
+    @property
+    def change(self) -> float:
+        """Relative change from the baseline, e.g. 0.3 for +30%."""
+        return self.value / self.baseline - 1 if self.baseline else 0.0
+
+    def __str__(self) -> str:
+        return "%s.%s: %.4g -> %.4g (%+.0f%%)" % (
+            self.scenario,
+            self.metric,
+            self.baseline,
+            self.value,
+            self.change * 100,
+        )
+
+
+COMPARED_SETTINGS = ("scale", "repeat")
+"""Settings a report must share with its baseline to be compared."""
+
+
+def check_comparable(report: dict, baseline: dict):
+    """Check that a report ran with the same settings as a baseline.
+
+    Timings at another `scale` or `repeat` differ regardless of any
+    change to the code, e.g. a smaller scale spends a larger share of
+    its time starting up.
+
+    Args:
+        report: The report, or just its settings.
+        baseline: The report it is to be compared with.
+
+    Raises:
+        ValueError: If a setting in `COMPARED_SETTINGS` differs.
+    """
+    for setting in COMPARED_SETTINGS:
+        if report.get(setting) != baseline.get(setting):
+            raise ValueError(
+                "The baseline was recorded with %s %s, not %s; "
+                "record a new one with these settings to compare."
+                % (setting, baseline.get(setting), report.get(setting))
+            )
+
+
+def _is_regression(
+    metric: str, baseline: float, value: float, tolerance: float
+) -> bool:
+    if _is_rate(metric):
+        return value < baseline * (1 - tolerance)
+    return value > baseline * (1 + tolerance)
+
+
+def compare(
+    report: dict, baseline: dict, tolerance: float = 0.2
+) -> List[Regression]:
+    """Find the metrics of a report that regressed from a baseline.
+
+    Rates (`_per_s`) regress when they drop, everything else when
+    it rises. Metrics missing from either report are skipped.
+
+    Args:
+        report: The report to check, from `run`.
+        baseline: The report to check against.
+        tolerance: Relative change allowed before a metric counts as
+            regressed, e.g. 0.2 for 20%.
+
+    Raises:
+        ValueError: If the reports ran with different settings. See
+            `check_comparable`.
+    """
+    check_comparable(report, baseline)
+    regressions = []
+    for scenario, metrics in report["results"].items():
+        baseline_metrics = baseline["results"].get(scenario, {})
+        for metric, value in metrics.items():
+            if metric not in baseline_metrics:
+                continue
+            if _is_regression(
+                metric, baseline_metrics[metric], value, tolerance
+            ):
+                regressions.append(
+                    Regression(
+                        scenario, metric, baseline_metrics[metric], value
+                    )
+                )
+    return regressions
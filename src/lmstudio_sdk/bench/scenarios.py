@@ -0,0 +1,295 @@
+import asyncio
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List
+
+from lmstudio_sdk.backend import AsyncLMStudioClient, SyncLMStudioClient
+from lmstudio_sdk.mock import MockLMStudioServer
+
+
+Metrics = Dict[str, float]
+"""Metric names mapped to values.
+
+Names ending in `_ms` are durations, where lower is better; names
+ending in `_per_s` are rates, where higher is better.
+"""
+
+MODEL = "mock-model"
+
+
+def _ms(seconds: float) -> float:
+    return seconds * 1000
+
+
+def _percentiles(samples: List[float]) -> Metrics:
+    cuts = statistics.quantiles(samples, n=100, method="inclusive")
+    return {"p50_ms": _ms(cuts[49]), "p99_ms": _ms(cuts[98])}
+
+
+def _prefixed(prefix: str, metrics: Metrics) -> Metrics:
+    return {f"{prefix}_{name}": value for name, value in metrics.items()}
+
+
+def rpc_latency(scale: float = 1.0) -> Metrics:
+    """Round-trip time of one `call_rpc` at a time, sync and async."""
+    num_calls = max(int(1000 * scale), 10)
+
+    def run_sync(base_url: str) -> List[float]:
+        client = SyncLMStudioClient(base_url, None, None).connect()
+        model = client.llm.create_dynamic_handle(MODEL)
+        samples = []
+        try:
+            for _ in range(num_calls):
+                begin = time.perf_counter()
+                model.unstable_count_tokens("Hello, world!")
+                samples.append(time.perf_counter() - begin)
+        finally:
+            client.close()
+        return samples
+
+    async def run_async(base_url: str) -> List[float]:
+        client = await AsyncLMStudioClient(base_url, None, None).connect()
+        model = client.llm.create_dynamic_handle(MODEL)
+        samples = []
+        try:
+            for _ in range(num_calls):
+                begin = time.perf_counter()
+                await model.unstable_count_tokens("Hello, world!")
+                samples.append(time.perf_counter() - begin)
+        finally:
+            await client.close()
+        return samples
+
+    with MockLMStudioServer() as server:
+        sync = run_sync(server.base_url)
+        async_ = asyncio.run(run_async(server.base_url))
+    return {
+        **_prefixed("sync", _percentiles(sync)),
+        **_prefixed("async", _percentiles(async_)),
+    }
+
+
+def _stream_sync(model) -> int:
+    return sum(1 for _ in model.complete("Hello"))
+
+
+async def _stream_async(model) -> int:
+    return sum([1 async for _ in await model.complete("Hello")])
+
+
+def streaming_throughput(scale: float = 1.0) -> Metrics:
+    """Fragments per second of a single prediction, sync and async."""
+    num_fragments = max(int(20000 * scale), 100)
+
+    def run_sync(base_url: str) -> float:
+        client = SyncLMStudioClient(base_url, None, None).connect()
+        try:
+            model = client.llm.create_dynamic_handle(MODEL)
+            begin = time.perf_counter()
+            received = _stream_sync(model)
+            return received / (time.perf_counter() - begin)
+        finally:
+            client.close()
+
+    async def run_async(base_url: str) -> float:
+        client = await AsyncLMStudioClient(base_url, None, None).connect()
+        try:
+            model = client.llm.create_dynamic_handle(MODEL)
+            begin = time.perf_counter()
+            received = await _stream_async(model)
+            return received / (time.perf_counter() - begin)
+        finally:
+            await client.close()
+
+    with MockLMStudioServer(num_fragments=num_fragments) as server:
+        return {
+            "sync_fragments_per_s": run_sync(server.base_url),
+            "async_fragments_per_s": asyncio.run(run_async(server.base_url)),
+        }
+
+
+CONCURRENCY_LEVELS = [1, 4, 16]
+
+
+def concurrent_scaling(scale: float = 1.0) -> Metrics:
+    """Total fragments per second over concurrent predictions."""
+    num_fragments = max(int(2000 * scale), 50)
+
+    def run_sync(base_url: str, concurrency: int) -> float:
+        client = SyncLMStudioClient(base_url, None, None).connect()
+        try:
+            model = client.llm.create_dynamic_handle(MODEL)
+            begin = time.perf_counter()
+            with ThreadPoolExecutor(concurrency) as pool:
+                received = sum(
+                    pool.map(lambda _: _stream_sync(model), range(concurrency))
+                )
+            return received / (time.perf_counter() - begin)
+        finally:
+            client.close()
+
+    async def run_async(base_url: str, concurrency: int) -> float:
+        client = await AsyncLMStudioClient(base_url, None, None).connect()
+        try:
+            model = client.llm.create_dynamic_handle(MODEL)
+            begin = time.perf_counter()
+            received = sum(
+                await asyncio.gather(
+                    *[_stream_async(model) for _ in range(concurrency)]
+                )
+            )
+            return received / (time.perf_counter() - begin)
+        finally:
+            await client.close()
+
+    metrics = {}
+    with MockLMStudioServer(num_fragments=num_fragments) as server:
+        for concurrency in CONCURRENCY_LEVELS:
+            metrics[f"sync_x{concurrency}_fragments_per_s"] = run_sync(
+                server.base_url, concurrency
+            )
+            metrics[f"async_x{concurrency}_fragments_per_s"] = asyncio.run(
+                run_async(server.base_url, concurrency)
+            )
+    return metrics
+
+
+def model_load(scale: float = 1.0) -> Metrics:
+    """Client-side cost of a `loadModel` channel that loads instantly."""
+    num_loads = max(int(200 * scale), 10)
+
+    def run_sync(base_url: str) -> List[float]:
+        client = SyncLMStudioClient(base_url, None, None).connect()
+        samples = []
+        try:
+            for i in range(num_loads):
+                begin = time.perf_counter()
+                client.llm.load("mock/model", {"identifier": f"sync-{i}"})
+                samples.append(time.perf_counter() - begin)
+        finally:
+            client.close()
+        return samples
+
+    async def run_async(base_url: str) -> List[float]:
+        client = await AsyncLMStudioClient(base_url, None, None).connect()
+        samples = []
+        try:
+            for i in range(num_loads):
+                begin = time.perf_counter()
+                # the channel is open once awaited, the model loaded once
+                # the future it returns is awaited
+                await (
+                    await client.llm.load(
+                        "mock/model", {"identifier": f"async-{i}"}
+                    )
+                )
+                samples.append(time.perf_counter() - begin)
+        finally:
+            await client.close()
+        return samples
+
+    with MockLMStudioServer() as server:
+        sync = run_sync(server.base_url)
+        async_ = asyncio.run(run_async(server.base_url))
+    return {
+        "sync_median_ms": _ms(statistics.median(sync)),
+        "async_median_ms": _ms(statistics.median(async_)),
+    }
+
+
+def startup_time(scale: float = 1.0) -> Metrics:
+    """Time from creating a client to the end of its first RPC."""
+    runs = max(int(50 * scale), 3)
+
+    def run_sync(base_url: str) -> float:
+        begin = time.perf_counter()
+        client = SyncLMStudioClient(base_url, None, None).connect()
+        client.llm.create_dynamic_handle(MODEL).get_model_info()
+        elapsed = time.perf_counter() - begin
+        client.close()
+        return elapsed
+
+    async def run_async(base_url: str) -> float:
+        begin = time.perf_counter()
+        client = await AsyncLMStudioClient(base_url, None, None).connect()
+        await client.llm.create_dynamic_handle(MODEL).get_model_info()
+        elapsed = time.perf_counter() - begin
+        await client.close()
+        return elapsed
+
+    with MockLMStudioServer() as server:
+        sync = [run_sync(server.base_url) for _ in range(runs)]
+        async_ = [asyncio.run(run_async(server.base_url)) for _ in range(runs)]
+    return {
+        "sync_median_ms": _ms(statistics.median(sync)),
+        "async_median_ms": _ms(statistics.median(async_)),
+    }
+
+
+def _relay(chunk: str) -> bytes:
+    """What a web relay might do per chunk: frame it for the wire."""
+    return json.dumps({"type": "fragment", "text": chunk}).encode("utf-8")
+
+
+def fragment_coalescing(scale: float = 1.0) -> Metrics:
+    """Consumer CPU time per prediction, per token vs. coalesced.
+
+    Fragments arrive at a steady rate, as from a real model, and the
+    consumer relays each item it receives. CPU time is measured on the
+    consumer's thread, which for async clients also runs the receive
+    loop.
+    """
+    num_fragments = max(int(2000 * scale), 100)
+    modes = {"per_token": {}, "coalesced": {"coalesce": {}}}
+
+    def run_sync(base_url: str, opts: dict) -> float:
+        client = SyncLMStudioClient(base_url, None, None).connect()
+        try:
+            model = client.llm.create_dynamic_handle(MODEL)
+            begin = time.thread_time()
+            for chunk in model.complete("Hello", opts):
+                _relay(chunk)
+            return time.thread_time() - begin
+        finally:
+            client.close()
+
+    async def run_async(base_url: str, opts: dict) -> float:
+        client = await AsyncLMStudioClient(base_url, None, None).connect()
+        try:
+            model = client.llm.create_dynamic_handle(MODEL)
+            begin = time.thread_time()
+            async for chunk in await model.complete("Hello", opts):
+                _relay(chunk)
+            return time.thread_time() - begin
+        finally:
+            await client.close()
+
+    metrics = {}
+    with MockLMStudioServer(
+        num_fragments=num_fragments, fragment_rate=4000
+    ) as server:
+        for mode, opts in modes.items():
+            metrics[f"sync_{mode}_cpu_ms"] = _ms(
+                run_sync(server.base_url, opts)
+            )
+            metrics[f"async_{mode}_cpu_ms"] = _ms(
+                asyncio.run(run_async(server.base_url, opts))
+            )
+    return metrics
+
+
+SCENARIOS: Dict[str, Callable[[float], Metrics]] = {
+    "rpc_latency": rpc_latency,
+    "streaming_throughput": streaming_throughput,
+    "concurrent_scaling": concurrent_scaling,
+    "model_load": model_load,
+    "startup_time": startup_time,
+    "fragment_coalescing": fragment_coalescing,
+}
+"""Scenario names mapped to functions running them.
+
+Each takes a `scale` multiplying its number of iterations, and
+returns its `Metrics`.
+"""
@@ -10,7 +10,12 @@ For more information, see the individual classes and submodules.
 """
 
 from .configs import (
+    BackpressureOpts,
     BaseLoadModelOpts,
+    CoalesceOpts,
+    CompiledPredictionConfig,
+    DiscoveryOpts,
+    EarlyStopOpts,
     EmbeddingLoadModelConfig,
     LLMApplyPromptTemplateOpts,
     LLMContextOverflowPolicy,
@@ -21,8 +26,14 @@ from .configs import (
     LLMPredictionExtraOpts,
     LLMPredictionOpts,
     LLMStructuredPredictionSetting,
+    PredictionMode,
+    prediction_config_to_kv_config,
+    ReconnectOpts,
+    ScheduleOpts,
+    split_prediction_opts,
 )
 from .llms import (
+    ChatSession,
     convert_dict_to_kv_config,
     find_key_in_kv_config,
     KVConfig,
@@ -56,8 +67,14 @@ from .models import (
 )
 
 __all__ = [
+    "BackpressureOpts",
     "BaseLoadModelOpts",
+    "ChatSession",
+    "CoalesceOpts",
+    "CompiledPredictionConfig",
+    "DiscoveryOpts",
     "DownloadedModel",
+    "EarlyStopOpts",
     "EmbeddingLoadModelConfig",
     "InstanceReferenceModel",
     "KVConfig",
@@ -91,6 +108,9 @@ __all__ = [
     "ModelDomainType",
     "ModelQuery",
     "ModelSpecifier",
+    "PredictionMode",
+    "ReconnectOpts",
+    "ScheduleOpts",
     "PredictionResult",
     "QueryModel",
 ]
@@ -0,0 +1,31 @@
+from typing import Literal, NotRequired, TypedDict
+
+
+class BackpressureOpts(TypedDict):
+    """Options for bounding the fragments queued for a slow consumer.
+
+    Fragments wait in a queue between the connection and whatever is
+    streaming the prediction. By default the queue is unbounded, so a
+    consumer slower than the model makes memory grow without limit.
+    With these options, once `max_fragments` are queued the `policy`
+    applies:
+
+    - "pause": stop reading from the connection until the consumer
+      catches up. The server then buffers, and eventually stops sending.
+      Note that a connection is shared by every prediction and RPC of
+      its client, so they all wait for the slowest bounded consumer.
+    - "drop": discard fragments beyond the mark, counting them in the
+      prediction's `dropped`. The result's content is still complete.
+    - "cancel": cancel the prediction, as if by calling `cancel()`.
+
+    Waiting for the result, or cancelling, lifts the bound.
+    """
+
+    max_fragments: int
+    """How many fragments (or chunks, when coalescing) may be queued.
+
+    Must be at least 1.
+    """
+
+    policy: NotRequired[Literal["pause", "drop", "cancel"]]
+    """What to do when the queue is full. Defaults to "pause"."""
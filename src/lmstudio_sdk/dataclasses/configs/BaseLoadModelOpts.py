@@ -46,6 +46,14 @@ class BaseLoadModelOpts(TypedDict, Generic[TLoadModelConfig]):
     ```
     """
 
+    timeout: NotRequired[float]
+    """Seconds the server may go without reporting load progress.
+
+    If the server sends nothing for this long, the load is cancelled
+    on the server and fails with a `ChannelTimeoutError`.
+    Defaults to the `timeout` the client was created with.
+    """
+
     on_progress: NotRequired[Callable[[float], None]]
     """A callback to receive progress updates.
 
@@ -0,0 +1,20 @@
+from typing import NotRequired, TypedDict
+
+
+class CoalesceOpts(TypedDict):
+    """Options for streaming a prediction in chunks of fragments.
+
+    Fragments are joined into one chunk until it reaches `max_bytes`,
+    or until its first fragment has waited `max_latency` seconds,
+    whichever comes first. Consumers then wake up once per chunk
+    rather than once per token. The prediction's result is the same.
+    """
+
+    max_bytes: NotRequired[int]
+    """Size in UTF-8 bytes at which a chunk is delivered. Defaults to 4096."""
+
+    max_latency: NotRequired[float]
+    """Seconds a fragment may wait for others to join its chunk.
+
+    Defaults to 0.016, about one frame at 60 Hz.
+    """
@@ -0,0 +1,228 @@
+import json
+from typing import Dict, Literal, Optional, Tuple
+
+import lmstudio_sdk.dataclasses.llms as llms
+import lmstudio_sdk.utils as utils
+
+from .LLMPredictionOpts import (
+    LLMPredictionConfig,
+    LLMPredictionExtraOpts,
+    LLMPredictionOpts,
+)
+
+
+PredictionMode = Literal["complete", "respond"]
+"""The prediction method a config stack is built for."""
+
+_COMPLETE_MODE_TEMPLATE = (
+    "{% for message in messages %}{{ message['content'] }}{% endfor %}"
+)
+
+
+def split_prediction_opts(
+    opts: Optional[LLMPredictionOpts],
+) -> Tuple[LLMPredictionConfig, LLMPredictionExtraOpts]:
+    """Split prediction options into server config and client-only options.
+
+    The options passed in are not modified.
+    """
+    if opts is None:
+        return {}, {}
+    config: LLMPredictionConfig = {}
+    extra_opts: LLMPredictionExtraOpts = {}
+    for key, value in opts.items():
+        if key in LLMPredictionExtraOpts.__annotations__:
+            extra_opts[key] = value
+        else:
+            config[key] = value
+    return config, extra_opts
+
+
+def prediction_config_to_kv_config(
+    prediction_config: Optional[LLMPredictionConfig],
+) -> llms.KVConfig:
+    """Converts a prediction config to a KVConfig."""
+    fields = []
+    if prediction_config is not None:
+        for default_key in [
+            "temperature",
+            "context_overflow_policy",
+            "stop_strings",
+            "structured",
+            "top_k_sampling",
+            "seed",
+        ]:
+            if default_key in prediction_config:
+                fields.append(
+                    {
+                        "key": default_key,
+                        "value": prediction_config[default_key],
+                    }
+                )
+        if "max_predicted_tokens" in prediction_config:
+            fields.append(
+                {
+                    "key": "max_predicted_tokens",
+                    "value": utils.number_to_checkbox_numeric(
+                        prediction_config["max_predicted_tokens"], -1, 1
+                    ),
+                }
+            )
+        if "repeat_penalty" in prediction_config:
+            fields.append(
+                {
+                    "key": "repeat_penalty",
+                    "value": utils.number_to_checkbox_numeric(
+                        prediction_config["repeat_penalty"], 1, 1
+                    ),
+                }
+            )
+        if "min_p_sampling" in prediction_config:
+            fields.append(
+                {
+                    "key": "min_p_sampling",
+                    "value": utils.number_to_checkbox_numeric(
+                        prediction_config["min_p_sampling"], 0, 0.05
+                    ),
+                }
+            )
+        if "top_p_sampling" in prediction_config:
+            fields.append(
+                {
+                    "key": "top_p_sampling",
+                    "value": utils.number_to_checkbox_numeric(
+                        prediction_config["top_p_sampling"], 1, 0.95
+                    ),
+                }
+            )
+        if "cpu_threads" in prediction_config:
+            fields.append(
+                {
+                    "key": "llama.cpu_threads",
+                    "value": prediction_config["cpu_threads"],
+                }
+            )
+    return {"fields": fields}
+
+
+class CompiledPredictionConfig:
+    """Prediction options converted to their wire format once.
+
+    `.complete()` and `.respond()` accept either a `LLMPredictionOpts`
+    dict or an instance of this class. Passing a dict converts it to
+    KVConfig layers on every call; if you use the same options for
+    many predictions, compile them once and reuse the result instead:
+
+    ```python
+    config = CompiledPredictionConfig({"temperature": 0.2})
+    for prompt in prompts:
+        model.complete(prompt, config)
+    ```
+
+    The compiled layers (and their JSON encoding) are built lazily
+    per prediction mode and shared between predictions, so treat
+    them as read-only.
+
+    Attributes:
+        config: The options that are sent to the server.
+        extra_opts: The client-side options, e.g. callbacks.
+    """
+
+    config: LLMPredictionConfig
+    """The options that are sent to the server."""
+
+    extra_opts: LLMPredictionExtraOpts
+    """The client-side options, e.g. callbacks."""
+
+    def __init__(self, opts: Optional[LLMPredictionOpts] = None):
+        self.config, self.extra_opts = split_prediction_opts(opts)
+        self._layers: Dict[
+            PredictionMode, Tuple[llms.KVConfigStackLayer, ...]
+        ] = {}
+        self._encoded: Dict[PredictionMode, str] = {}
+
+    def __build_layers(
+        self, mode: PredictionMode
+    ) -> Tuple[llms.KVConfigStackLayer, ...]:
+        if mode == "respond":
+            return (
+                llms.KVConfigStackLayer(
+                    layerName=llms.KVConfigLayerName.API_OVERRIDE,
+                    config=prediction_config_to_kv_config(self.config),
+                ),
+            )
+        return (
+            llms.KVConfigStackLayer(
+                layerName=llms.KVConfigLayerName.API_OVERRIDE,
+                config=prediction_config_to_kv_config(
+                    {**self.config, "stop_strings": []}
+                ),
+            ),
+            llms.KVConfigStackLayer(
+                layerName=llms.KVConfigLayerName.COMPLETE_MODE_FORMATTING,
+                config=llms.convert_dict_to_kv_config(
+                    {
+                        "promptTemplate": {
+                            "type": "jinja",
+                            "jinjaPromptTemplate": {
+                                "bosToken": "",
+                                "eosToken": "",
+                                "template": _COMPLETE_MODE_TEMPLATE,
+                            },
+                            "stop_strings": [],
+                        }
+                    }
+                ),
+            ),
+        )
+
+    @property
+    def deterministic(self) -> bool:
+        """Whether predictions with this config can be cached.
+
+        True when `temperature` is 0 or a `seed` is set.
+        """
+        return (
+            self.config.get("temperature") == 0
+            or self.config.get("seed") is not None
+        )
+
+    def layers(
+        self, mode: PredictionMode
+    ) -> Tuple[llms.KVConfigStackLayer, ...]:
+        """Get the config stack layers for the given prediction mode.
+
+        Args:
+            mode: "complete" or "respond".
+
+        Returns:
+            The (cached) layers to append to a prediction config stack.
+        """
+        layers = self._layers.get(mode)
+        if layers is None:
+            layers = self.__build_layers(mode)
+            self._layers[mode] = layers
+        return layers
+
+    def encoded(self, mode: PredictionMode) -> str:
+        """Get the JSON encoding of the layers for the given mode.
+
+        Predictions with a `cache` key on this rather than encoding
+        the layers again each time.
+
+        Args:
+            mode: "complete" or "respond".
+
+        Returns:
+            The (cached) canonical JSON encoding of `layers(mode)`.
+        """
+        encoded = self._encoded.get(mode)
+        if encoded is None:
+            encoded = json.dumps(
+                self.layers(mode),
+                sort_keys=True,
+                separators=(",", ":"),
+                default=str,
+            )
+            self._encoded[mode] = encoded
+        return encoded
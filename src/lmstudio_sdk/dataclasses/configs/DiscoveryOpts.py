@@ -0,0 +1,27 @@
+from typing import Iterable, NotRequired, TypedDict
+
+
+class DiscoveryOpts(TypedDict):
+    """Options for finding a local LM Studio server.
+
+    Discovery only runs when no base URL is given, neither directly
+    nor through the `LMSTUDIO_BASE_URL` environment variable.
+    """
+
+    ports: NotRequired[Iterable[int]]
+    """Localhost ports to probe, all at once, e.g. `range(1234, 1244)`.
+
+    Defaults to LM Studio's default port, 1234.
+    """
+
+    timeout: NotRequired[float]
+    """Seconds to wait for any port to answer. Defaults to 1."""
+
+    cache: NotRequired[bool]
+    """Whether to cache the discovered URL on disk. Defaults to True.
+
+    Later clients then skip discovery, unless connecting to the cached
+    URL fails, in which case the cache is cleared and discovery runs
+    again. The cache lives in `$LMSTUDIO_SDK_CACHE_DIR`, falling back
+    to `lmstudio_sdk` in the user's cache directory.
+    """
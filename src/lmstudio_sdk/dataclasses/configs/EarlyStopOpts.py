@@ -0,0 +1,39 @@
+import re
+from typing import List, NotRequired, TypedDict, Union
+
+
+class EarlyStopOpts(TypedDict):
+    """Conditions on the generated text that stop a prediction early.
+
+    They are checked on the client as each fragment arrives. As soon as
+    one is met, the prediction is cancelled on the server, so no more
+    GPU time is spent on it, and it finishes with stop reason
+    `userStopped`. The fragment that met the condition is the last one
+    streamed. Unlike the server's `stop_strings`, it is not cut out of
+    the content.
+    """
+
+    regex: NotRequired[Union[str, re.Pattern]]
+    """A pattern to search the generated text for.
+
+    Matches must fit in the last `regex_window` characters.
+    """
+
+    regex_window: NotRequired[int]
+    """How many of the latest characters `regex` is searched in.
+
+    Bounds the cost of searching per fragment. Defaults to 1024.
+    """
+
+    strings: NotRequired[List[str]]
+    """Strings to search the generated text for, all at once.
+
+    Unlike `regex`, a match may be of any length, and the cost per
+    fragment does not grow with the number of strings.
+    """
+
+    max_chars: NotRequired[int]
+    """Stop once this many characters have been generated."""
+
+    max_bytes: NotRequired[int]
+    """Stop once this many UTF-8 bytes have been generated."""
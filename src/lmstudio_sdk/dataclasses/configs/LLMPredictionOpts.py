@@ -1,6 +1,12 @@
 from typing import Callable, List, Literal, NotRequired, TypedDict
 
+import lmstudio_sdk.utils as utils
+
+from .BackpressureOpts import BackpressureOpts
+from .CoalesceOpts import CoalesceOpts
+from .EarlyStopOpts import EarlyStopOpts
 from .LLMStructuredPredictionSetting import LLMStructuredPredictionSetting
+from .ScheduleOpts import ScheduleOpts
 
 
 LLMContextOverflowPolicy = Literal[
@@ -74,6 +80,13 @@ class LLMPredictionConfig(TypedDict):
     top_p_sampling: NotRequired[float]
     cpu_threads: NotRequired[int]
 
+    seed: NotRequired[int]
+    """Seed for the sampler's random number generator.
+
+    With a fixed seed, the same model, context and config always
+    produce the same prediction.
+    """
+
 
 class LLMPredictionExtraOpts(TypedDict):
     """Internal options for prediction that are not passed to the server."""
@@ -91,6 +104,82 @@ class LLMPredictionExtraOpts(TypedDict):
     on_first_token: NotRequired[Callable[[], None]]
     """A callback that is called when the model has output the first token."""
 
+    timeout: NotRequired[float]
+    """Seconds the server may go without sending anything for the prediction.
+
+    This includes prompt processing progress and fragments. If the
+    server sends nothing for this long, the prediction is cancelled
+    on the server and fails with a `ChannelTimeoutError`.
+    Defaults to the `timeout` the client was created with.
+    """
+
+    max_wall_time: NotRequired[float]
+    """Seconds the prediction may take in total, prompt processing included.
+
+    When they are up, the prediction is cancelled and finishes with stop
+    reason `userStopped` and the content generated so far. If the server
+    does not confirm the cancel within `DEADLINE_GRACE_PERIOD`, the
+    prediction is finished on the client instead; its stats then count
+    fragments rather than tokens, and its model info and configs
+    are None.
+    """
+
+    deadline_s: NotRequired[float]
+    """A `time.time()` timestamp by which the prediction must finish.
+
+    Like `max_wall_time`, but absolute, so one deadline can be passed
+    down through several predictions serving the same request. If both
+    are set, the earlier one applies.
+    """
+
+    coalesce: NotRequired[CoalesceOpts]
+    """Stream fragments in chunks rather than one by one.
+
+    Useful for consumers with a per-fragment cost, e.g. relaying each
+    fragment over a network. See `CoalesceOpts`.
+    """
+
+    retain: NotRequired[bool]
+    """Whether to keep the fragments to build the result's content.
+
+    Defaults to True. Set it to False when streaming a long prediction
+    straight to a socket or file: fragments are then dropped once
+    consumed, so memory stays bounded, and the result has its stats and
+    configs but `content` None. A `cache` still keeps the fragments of
+    the predictions it stores.
+    """
+
+    backpressure: NotRequired[BackpressureOpts]
+    """Bound the fragments queued while the consumer is slow.
+
+    Protects memory when streaming to slow clients. Without it, queued
+    fragments are only bounded by the prediction's length. See
+    `BackpressureOpts`.
+    """
+
+    stop_when: NotRequired[EarlyStopOpts]
+    """Stop the prediction as soon as the generated text meets a condition.
+
+    Checked on the client, e.g. for patterns the server's `stop_strings`
+    cannot express. See `EarlyStopOpts`.
+    """
+
+    cache: NotRequired[utils.PredictionCache]
+    """A cache to look the prediction up in, and to store it in.
+
+    Only used when the prediction is deterministic, i.e. `temperature`
+    is 0 or a `seed` is set, and none of `stop_when`, `max_wall_time`,
+    `deadline_s` and `backpressure` can cut it short. See
+    `PredictionCache`.
+    """
+
+    schedule: NotRequired[ScheduleOpts]
+    """Queue the prediction on the client before sending it.
+
+    Caps the predictions running per model and lets higher priority
+    ones jump the queue. See `ScheduleOpts` and `PredictionScheduler`.
+    """
+
 
 class LLMPredictionOpts(LLMPredictionConfig, LLMPredictionExtraOpts):
     """Shared options for any prediction methods (`.complete`/`.respond`).
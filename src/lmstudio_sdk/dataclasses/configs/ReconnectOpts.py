@@ -0,0 +1,22 @@
+from typing import NotRequired, TypedDict
+
+
+class ReconnectOpts(TypedDict):
+    """Options for reconnecting a client port whose connection dropped.
+
+    Waits `initial_delay` seconds before the first attempt, multiplying
+    the delay by `multiplier` after each failed attempt, up to
+    `max_delay`. Set `max_attempts` to 0 to disable reconnecting.
+    """
+
+    max_attempts: NotRequired[int]
+    """Attempts before giving up. Defaults to 5."""
+
+    initial_delay: NotRequired[float]
+    """Seconds to wait before the first attempt. Defaults to 0.1."""
+
+    max_delay: NotRequired[float]
+    """Upper bound on the wait between attempts. Defaults to 5."""
+
+    multiplier: NotRequired[float]
+    """Factor the wait grows by after each attempt. Defaults to 2."""
@@ -0,0 +1,36 @@
+from typing import NotRequired, TypedDict, Union
+
+import lmstudio_sdk.utils as utils
+
+
+class ScheduleOpts(TypedDict):
+    """Options for queueing a prediction in a `PredictionScheduler`.
+
+    The prediction is only sent to the server once the scheduler admits
+    it, i.e. once fewer than the scheduler's limit of predictions are
+    running on its model and no queued prediction has a higher priority.
+    Until then, `complete`/`respond` wait. Results from a cache skip the
+    queue. Embeddings can be scheduled too, see `embed_string`.
+    """
+
+    scheduler: utils.PredictionScheduler
+    """The scheduler to queue in. Share one between handles to share caps."""
+
+    priority: NotRequired[Union[str, int]]
+    """A name from `PRIORITY_CLASSES`, e.g. "interactive" or "batch",
+    or an integer rank; lower ranks go first. Defaults to "default".
+    """
+
+    signal: NotRequired[Union[utils.AsyncAbortSignal, utils.SyncAbortSignal]]
+    """Aborting it cancels the prediction while it is still queued.
+
+    The wait then raises `QueueCancelledError`. Once sent, cancel the
+    prediction itself instead.
+    """
+
+    tenant: NotRequired[str]
+    """Who the request is on behalf of, e.g. an API key.
+
+    Used by a `FairScheduler` to share capacity among tenants; other
+    schedulers only record it on the ticket.
+    """
@@ -1,7 +1,15 @@
+# pylance: disable=unused-imports
+# flake8: noqa: f401
+# ruff: noqa: F401
 """Configuration dict dataclasses for various operations.
 
 Classes:
+    BackpressureOpts: Options for bounding the fragments queued for a slow consumer.
     BaseLoadModelOpts: Base options for loading a model.
+    CoalesceOpts: Options for streaming a prediction in chunks of fragments.
+    CompiledPredictionConfig: Prediction options converted to their wire format once.
+    DiscoveryOpts: Options for finding a local LM Studio server.
+    EarlyStopOpts: Conditions on the generated text that stop a prediction early.
     EmbeddingLoadModelConfig: Configuration for loading an embedding model.
     LLMApplyPromptTemplateOpts: Options for applying a prompt template.
     LLMContextOverflowPolicy: Behavior when the generated tokens length exceeds the context window size.
@@ -12,9 +20,22 @@ Classes:
     LLMPredictionExtraOpts: Internal options for prediction that are not passed to the server.
     LLMPredictionOpts: Shared options for any prediction methods.
     LLMStructuredPredictionSetting: Structured prediction settings for an LLM model.
+    PredictionMode: The prediction method a config stack is built for.
+    ReconnectOpts: Options for reconnecting a client port whose connection dropped.
+    ScheduleOpts: Options for queueing a prediction in a `PredictionScheduler`.
 """
 
+from .BackpressureOpts import BackpressureOpts
 from .BaseLoadModelOpts import BaseLoadModelOpts
+from .CoalesceOpts import CoalesceOpts
+from .CompiledPredictionConfig import (
+    CompiledPredictionConfig,
+    PredictionMode,
+    prediction_config_to_kv_config,
+    split_prediction_opts,
+)
+from .DiscoveryOpts import DiscoveryOpts
+from .EarlyStopOpts import EarlyStopOpts
 from .EmbeddingLoadModelConfig import EmbeddingLoadModelConfig
 from .LLMApplyPromptTemplateOpts import LLMApplyPromptTemplateOpts
 from .LLMLoadModelConfig import (
@@ -29,9 +50,16 @@ from .LLMPredictionOpts import (
     LLMPredictionOpts,
 )
 from .LLMStructuredPredictionSetting import LLMStructuredPredictionSetting
+from .ReconnectOpts import ReconnectOpts
+from .ScheduleOpts import ScheduleOpts
 
 __all__ = [
+    "BackpressureOpts",
     "BaseLoadModelOpts",
+    "CoalesceOpts",
+    "CompiledPredictionConfig",
+    "DiscoveryOpts",
+    "EarlyStopOpts",
     "EmbeddingLoadModelConfig",
     "LLMApplyPromptTemplateOpts",
     "LLMContextOverflowPolicy",
@@ -42,4 +70,7 @@ __all__ = [
     "LLMPredictionExtraOpts",
     "LLMPredictionOpts",
     "LLMStructuredPredictionSetting",
+    "PredictionMode",
+    "ReconnectOpts",
+    "ScheduleOpts",
 ]
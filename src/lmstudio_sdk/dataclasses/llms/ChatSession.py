@@ -0,0 +1,166 @@
+from typing import Iterable, Iterator, Optional
+
+import lmstudio_sdk.utils as utils
+
+from .LLMChatHistory import (
+    LLMChatHistory,
+    LLMChatHistoryMessage,
+    LLMChatHistoryRole,
+    LLMContext,
+    LLMConversationContextInputItem,
+)
+from .PredictionResult import PredictionResult
+
+
+logger = utils.get_logger(__name__)
+
+
+ROLES = ("system", "user", "assistant")
+
+
+def _resolve_message(
+    content: str, role: LLMChatHistoryRole
+) -> LLMChatHistoryMessage:
+    utils._assert(role in ROLES, "ChatSession: unknown role %s", role, logger)
+    utils._assert(
+        isinstance(content, str),
+        "ChatSession: message content must be a string, got %s",
+        type(content).__name__,
+        logger,
+    )
+    return {"role": role, "content": [{"type": "text", "text": content}]}
+
+
+class ChatSession:
+    """A conversation that keeps its history ready to send to a model.
+
+    Passing a list of messages to `respond` converts the whole list to
+    the server's format on every turn. A session converts each message
+    once, when it is added, so the cost of a turn does not grow with
+    the length of the conversation:
+
+    ```python
+    session = ChatSession("You are a helpful assistant.")
+    while True:
+        session.append(input("> "))
+        result = model.respond(session).result()
+        session.append(result)
+        print(result.content)
+    ```
+
+    Messages can be read, edited and deleted by index, e.g. to let a
+    user edit an earlier message and regenerate from there:
+
+    ```python
+    session.edit(3, "What about in French?")
+    session.truncate(4)
+    result = model.respond(session).result()
+    ```
+
+    Attributes:
+        history: The messages, in the format sent to the model.
+    """
+
+    def __init__(
+        self,
+        system_prompt: Optional[str] = None,
+        messages: Optional[Iterable[LLMConversationContextInputItem]] = None,
+    ):
+        """Start a session.
+
+        Args:
+            system_prompt: A system prompt to start the history with.
+            messages: Messages to add after it, as given to `respond`.
+        """
+        self.history: LLMChatHistory = []
+        if system_prompt is not None:
+            self.append(system_prompt, "system")
+        if messages is not None:
+            self.extend(messages)
+
+    def append(
+        self,
+        message: str | PredictionResult,
+        role: Optional[LLMChatHistoryRole] = None,
+    ):
+        """Add a message to the end of the history.
+
+        Args:
+            message: The message's text, or a prediction's result to
+                add as the assistant's reply.
+            role: The message's role. Defaults to "assistant" for
+                prediction results and "user" otherwise.
+        """
+        if isinstance(message, PredictionResult):
+            utils._assert(
+                message.content is not None,
+                "ChatSession: cannot append %s made with retain=False",
+                "a prediction",
+                logger,
+            )
+            self.history.append(
+                _resolve_message(message.content, role or "assistant")
+            )
+        else:
+            self.history.append(_resolve_message(message, role or "user"))
+
+    def extend(self, messages: Iterable[LLMConversationContextInputItem]):
+        """Add messages to the end of the history.
+
+        Args:
+            messages: The messages, as given to `respond`.
+        """
+        for item in messages:
+            self.history.append(
+                _resolve_message(
+                    item.get("content", ""), item.get("role", "user")
+                )
+            )
+
+    def edit(
+        self,
+        index: int,
+        content: str,
+        role: Optional[LLMChatHistoryRole] = None,
+    ):
+        """Replace the text of a message, keeping the rest of the history.
+
+        Args:
+            index: The message's index; negative counts from the end.
+            content: Its new text.
+            role: Its new role. Defaults to its current one.
+        """
+        self.history[index] = _resolve_message(
+            content, role or self.history[index]["role"]
+        )
+
+    def truncate(self, length: int):
+        """Drop every message after the first `length`.
+
+        Args:
+            length: How many messages to keep.
+        """
+        del self.history[length:]
+
+    def __len__(self) -> int:
+        return len(self.history)
+
+    def __getitem__(self, index: int) -> LLMChatHistoryMessage:
+        return self.history[index]
+
+    def __delitem__(self, index: int):
+        del self.history[index]
+
+    def __iter__(self) -> Iterator[LLMChatHistoryMessage]:
+        return iter(self.history)
+
+    def context(self) -> LLMContext:
+        """Get the history as a context to send to the model.
+
+        The messages themselves are shared, not copied, but later
+        appends and edits do not change a context already taken.
+
+        Returns:
+            The context.
+        """
+        return {"history": list(self.history)}
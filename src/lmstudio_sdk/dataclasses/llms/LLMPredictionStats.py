@@ -105,3 +105,18 @@ class LLMPredictionStats:
         self.prompt_tokens_count = promptTokensCount
         self.predicted_tokens_count = predictedTokensCount
         self.total_tokens_count = totalTokensCount
+
+    def to_dict(self) -> dict:
+        """The stats in the form the server sends them.
+
+        `LLMPredictionStats(**stats.to_dict())` gives back equal stats.
+        """
+        return {
+            "stopReason": self.stop_reason,
+            "tokensPerSecond": self.tokens_per_second,
+            "numGpuLayers": self.num_gpu_layers,
+            "timeToFirstTokenSec": self.time_to_first_token_sec,
+            "promptTokensCount": self.prompt_tokens_count,
+            "predictedTokensCount": self.predicted_tokens_count,
+            "totalTokensCount": self.total_tokens_count,
+        }
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import lmstudio_sdk.dataclasses.models as models
 
 from .KVConfig import KVConfig
@@ -13,28 +15,36 @@ class PredictionResult:
     contains statistics about the prediction.
     """
 
-    content: str
-    """The newly generated text as predicted by the LLM."""
+    content: Optional[str]
+    """The newly generated text as predicted by the LLM.
+
+    None if the prediction was made with `retain` set to False.
+    """
 
     stats: LLMPredictionStats
     """Statistics about the prediction."""
 
-    model_info: models.ModelDescriptor
-    """Information about the model used for the prediction."""
+    model_info: Optional[models.ModelDescriptor]
+    """Information about the model used for the prediction.
+
+    None if the server did not stop the prediction by its deadline and
+    it was finished on the client (see `max_wall_time`), as are
+    `load_config` and `prediction_config`.
+    """
 
-    load_config: KVConfig
+    load_config: Optional[KVConfig]
     """The configuration used to load the model."""
 
-    prediction_config: KVConfig
+    prediction_config: Optional[KVConfig]
     """The configuration used for the prediction."""
 
     def __init__(
         self,
-        content: str,
+        content: Optional[str],
         stats: LLMPredictionStats,
-        model_info: models.ModelDescriptor,
-        load_config: KVConfig,
-        prediction_config: KVConfig,
+        model_info: Optional[models.ModelDescriptor],
+        load_config: Optional[KVConfig],
+        prediction_config: Optional[KVConfig],
     ):
         self.content = content
         self.stats = stats
@@ -4,6 +4,7 @@
 """Dataclasses representing the data structures used in the LLM API.
 
 Classes:
+    ChatSession: A conversation that keeps its history ready to send.
     KVConfig: A key-value configuration object.
     KVConfigField: A key-value configuration field.
     KVConfigLayerName: A key-value configuration layer name.
@@ -25,6 +26,7 @@ Classes:
     PredictionResult: Represents the result of a prediction.
 """
 
+from .ChatSession import ChatSession
 from .LLMChatHistory import (
     LLMChatHistory,
     LLMChatHistoryMessage,
@@ -51,6 +53,7 @@ from .LLMPredictionStats import LLMPredictionStopReason, LLMPredictionStats
 from .PredictionResult import PredictionResult
 
 __all__ = [
+    "ChatSession",
     "KVConfig",
     "KVConfigField",
     "KVConfigLayerName",
@@ -0,0 +1,470 @@
+import asyncio
+import json
+import random
+import threading
+import time
+from http import HTTPStatus
+from typing import Any, Dict, List, Optional
+
+import websockets
+
+import lmstudio_sdk.utils as utils
+
+
+logger = utils.get_logger(__name__)
+
+
+DEFAULT_MODELS = [
+    {"identifier": "mock-model", "path": "mock/model", "type": "llm"},
+    {
+        "identifier": "mock-embedding",
+        "path": "mock/embedding",
+        "type": "embedding",
+    },
+]
+"""Models the server reports as loaded and downloaded by default."""
+
+CLOSE_TIMEOUT = 0.5
+"""Seconds a client has to complete closing its connection on stop."""
+
+
+class MockLMStudioServer:
+    """A stand-in for the LM Studio server, for tests and benchmarks.
+
+    Speaks the same protocol as `BaseClientPort`: it takes the
+    authentication packet, answers `rpcCall`s, and serves `predict`,
+    `loadModel` and `streamLogs` channels, including `cancel` messages.
+    It also answers the `/lmstudio-greeting` discovery probe. No model
+    is actually run: predictions stream `fragment` a number of times.
+
+    Use it as an async context manager on the running event loop:
+
+    ```python
+    async with MockLMStudioServer(num_fragments=100) as server:
+        client = await LMStudioClient(base_url=server.base_url)
+    ```
+
+    or as a context manager, which runs it on an event loop in a
+    background thread, e.g. for the sync client:
+
+    ```python
+    with MockLMStudioServer(rpc_latency=0.005) as server:
+        client = LMStudioClient(base_url=server.base_url)
+    ```
+
+    Attributes:
+        base_url: URL to pass to `LMStudioClient`, once started.
+        port: Port the server listens on, once started. Kept across
+            `restart`.
+        loop: Event loop the server runs on, once started.
+        rpc_latency: Seconds to wait before answering an RPC.
+        handshake_latency: Seconds to delay each WebSocket handshake.
+        num_fragments: Fragments per prediction.
+        fragment: Text of each fragment.
+        fragments: If set, the texts of the fragments of each
+            prediction, in place of `num_fragments` times `fragment`.
+        fragment_rate: Fragments per second, or None for no limit.
+        first_token_latency: Seconds before a prediction's first fragment.
+        max_parallel: If set, predictions beyond this many at once wait
+            for one to finish, as on a server with that many slots.
+        load_latency: Seconds a model load takes.
+        errors: Endpoint names (RPCs or channels) mapped to the error
+            title to fail them with.
+        error_rate: Chance that any RPC or channel fails.
+        error_after_fragments: If set, predictions fail with a channel
+            error after this many fragments.
+        models: Descriptors of the loaded models.
+        counts: How many RPCs and channels were received, by
+            endpoint, e.g. `counts["rpc:tokenize"]`, and how many
+            `cancel` and `channelClose` messages.
+    """
+
+    def __init__(
+        self,
+        rpc_latency: float = 0.0,
+        handshake_latency: float = 0.0,
+        num_fragments: int = 16,
+        fragment: str = " token",
+        fragments: Optional[List[str]] = None,
+        fragment_rate: Optional[float] = None,
+        first_token_latency: float = 0.0,
+        max_parallel: Optional[int] = None,
+        load_latency: float = 0.0,
+        errors: Optional[Dict[str, str]] = None,
+        error_rate: float = 0.0,
+        error_after_fragments: Optional[int] = None,
+        models: Optional[List[dict]] = None,
+        seed: Optional[int] = None,
+    ):
+        self.rpc_latency = rpc_latency
+        self.handshake_latency = handshake_latency
+        self.num_fragments = num_fragments
+        self.fragment = fragment
+        self.fragments = fragments
+        self.fragment_rate = fragment_rate
+        self.first_token_latency = first_token_latency
+        self.max_parallel = max_parallel
+        self._slots: Optional[asyncio.Semaphore] = None
+        self.load_latency = load_latency
+        self.errors = errors or {}
+        self.error_rate = error_rate
+        self.error_after_fragments = error_after_fragments
+        self.models = [dict(m) for m in (models or DEFAULT_MODELS)]
+        self.counts: Dict[str, int] = {}
+        self.base_url: Optional[str] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self._random = random.Random(seed)
+        self.port = 0
+        self._server = None
+        self._thread: Optional[threading.Thread] = None
+
+    async def __aenter__(self):
+        await self.start_async()
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.stop_async()
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    async def start_async(self):
+        """Start serving on the running event loop."""
+        self.loop = asyncio.get_running_loop()
+        if self.max_parallel is not None:
+            self._slots = asyncio.Semaphore(self.max_parallel)
+        self._server = await websockets.serve(
+            self._handle,
+            "127.0.0.1",
+            self.port,
+            process_request=self._process_request,
+            close_timeout=CLOSE_TIMEOUT,
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self.base_url = f"ws://127.0.0.1:{self.port}"
+        logger.debug("Mock LM Studio server listening on %s.", self.base_url)
+
+    async def stop_async(self):
+        """Stop serving, closing all connections.
+
+        Connections whose peer has not finished closing them within
+        `CLOSE_TIMEOUT` seconds, e.g. half-closed ones, are aborted, so
+        that stopping (and `restart`) does not wait on them.
+        """
+        self._server.close()
+        try:
+            await asyncio.wait_for(self._server.wait_closed(), CLOSE_TIMEOUT)
+        except asyncio.TimeoutError:
+            for connection in list(self._server.all_connections):
+                connection.transport.abort()
+            await self._server.wait_closed()
+
+    def start(self):
+        """Start serving on an event loop in a background thread."""
+        loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=loop.run_forever, daemon=True)
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.start_async(), loop).result()
+
+    def stop(self):
+        """Stop serving and the background thread started by `start`."""
+        loop = self.loop
+        asyncio.run_coroutine_threadsafe(self.stop_async(), loop).result()
+        loop.call_soon_threadsafe(loop.stop)
+        self._thread.join()
+        loop.close()
+
+    def run(self, coroutine) -> Any:
+        """Run a coroutine, e.g. `restart()`, on the server's loop.
+
+        For servers started with `start`, from another thread.
+        """
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+    async def restart(self, downtime: float = 0.0):
+        """Drop all connections, and refuse new ones for `downtime` s."""
+        await self.stop_async()
+        await asyncio.sleep(downtime)
+        await self.start_async()
+
+    def __count(self, key: str):
+        self.counts[key] = self.counts.get(key, 0) + 1
+
+    def __injected_error(self, endpoint: str) -> Optional[str]:
+        if endpoint in self.errors:
+            return self.errors[endpoint]
+        if self.error_rate and self._random.random() < self.error_rate:
+            return "Injected error in %s" % endpoint
+        return None
+
+    async def _process_request(self, connection, request):
+        if request.path == utils.GREETING_PATH:
+            return connection.respond(HTTPStatus.OK, '{"lmstudio": true}')
+        if self.handshake_latency:
+            await asyncio.sleep(self.handshake_latency)
+        return None
+
+    async def _handle(self, websocket):
+        try:
+            await websocket.recv()  # authentication packet
+            cancelled: Dict[int, asyncio.Event] = {}
+            async for message in websocket:
+                packet = json.loads(message)
+                packet_type = packet.get("type")
+                if packet_type == "rpcCall":
+                    asyncio.ensure_future(self._call(websocket, packet))
+                elif packet_type == "channelCreate":
+                    channel_id = packet["channelId"]
+                    cancel = cancelled[channel_id] = asyncio.Event()
+                    asyncio.ensure_future(
+                        self._channel(websocket, packet, cancel)
+                    ).add_done_callback(
+                        lambda _, c=channel_id: cancelled.pop(c, None)
+                    )
+                elif packet_type == "channelSend":
+                    message_type = (packet.get("message") or {}).get("type")
+                    cancel = cancelled.get(packet.get("channelId"))
+                    if cancel is not None and message_type in (
+                        "cancel",
+                        "channelClose",
+                    ):
+                        self.__count(message_type)
+                        cancel.set()
+        except websockets.ConnectionClosed:
+            pass
+
+    async def _send(self, websocket, packet: dict) -> bool:
+        try:
+            await websocket.send(json.dumps(packet))
+            return True
+        except websockets.ConnectionClosed:
+            return False
+
+    async def _call(self, websocket, packet: dict):
+        endpoint = packet.get("endpoint")
+        self.__count("rpc:%s" % endpoint)
+        if self.rpc_latency:
+            await asyncio.sleep(self.rpc_latency)
+        error = self.__injected_error(endpoint)
+        if error is None:
+            try:
+                result = self._rpc_result(endpoint, packet.get("parameter"))
+            except LookupError as e:
+                error = str(e)
+        if error is not None:
+            await self._send(
+                websocket,
+                {
+                    "type": "rpcError",
+                    "callId": packet["callId"],
+                    "error": {"title": error},
+                },
+            )
+            return
+        await self._send(
+            websocket,
+            {
+                "type": "rpcResult",
+                "callId": packet["callId"],
+                "result": result,
+            },
+        )
+
+    def _find_model(self, parameter: Optional[dict]) -> dict:
+        specifier = (parameter or {}).get("specifier") or {}
+        query = specifier.get("query") or {}
+        for model in self.models:
+            if specifier.get("instanceReference") in (
+                None,
+                model.get("instanceReference"),
+            ) and query.get("identifier") in (None, model["identifier"]):
+                return model
+        if (parameter or {}).get("throwIfNotFound", False):
+            raise LookupError("No model found for %s" % specifier)
+        return self.models[0]
+
+    def _descriptor(self, model: dict) -> dict:
+        return {"identifier": model["identifier"], "path": model["path"]}
+
+    def _rpc_result(self, endpoint: str, parameter: Any) -> Any:
+        input_string = (parameter or {}).get("inputString", "")
+        if endpoint == "tokenize":
+            return {"tokens": list(range(len(input_string.split())))}
+        if endpoint == "countTokens":
+            return {"tokenCount": len(input_string.split())}
+        if endpoint == "embedString":
+            return {"embedding": [0.0] * 8}
+        if endpoint == "getModelInfo":
+            model = self._find_model(parameter)
+            return {
+                "descriptor": self._descriptor(model),
+                "instanceReference": model.get("instanceReference", ""),
+            }
+        if endpoint == "getLoadConfig":
+            return {
+                "fields": [
+                    {"key": "llm.load.contextLength", "value": 4096},
+                    {"key": "embedding.load.contextLength", "value": 4096},
+                ]
+            }
+        if endpoint == "applyPromptTemplate":
+            context = (parameter or {}).get("context") or {}
+            return {
+                "formatted": "\n".join(
+                    m.get("content", "") for m in context.get("history", [])
+                )
+            }
+        if endpoint == "listLoaded":
+            return [self._descriptor(model) for model in self.models]
+        if endpoint == "listDownloadedModels":
+            return [
+                {
+                    "type": model.get("type", "llm"),
+                    "path": model["path"],
+                    "sizeBytes": 0,
+                }
+                for model in self.models
+            ]
+        if endpoint == "unloadModel":
+            identifier = (parameter or {}).get("identifier")
+            self.models = [
+                m for m in self.models if m["identifier"] != identifier
+            ]
+            return None
+        raise LookupError("Unknown RPC endpoint %s" % endpoint)
+
+    async def _channel(self, websocket, packet: dict, cancel: asyncio.Event):
+        endpoint = packet.get("endpoint")
+        channel_id = packet["channelId"]
+        self.__count("channel:%s" % endpoint)
+
+        async def send(message: dict) -> bool:
+            return await self._send(
+                websocket,
+                {
+                    "type": "channelSend",
+                    "channelId": channel_id,
+                    "message": message,
+                },
+            )
+
+        async def fail(title: str):
+            await self._send(
+                websocket,
+                {
+                    "type": "channelError",
+                    "channelId": channel_id,
+                    "error": {"title": title},
+                },
+            )
+
+        error = self.__injected_error(endpoint)
+        if error is not None:
+            await fail(error)
+            return
+        if endpoint == "predict":
+            await self._predict(send, fail, cancel)
+        elif endpoint == "loadModel":
+            await self._load(packet.get("creationParameter") or {}, send)
+        elif endpoint == "streamLogs":
+            await cancel.wait()
+            return
+        else:
+            await fail("Unknown channel endpoint %s" % endpoint)
+            return
+        await self._send(
+            websocket, {"type": "channelClose", "channelId": channel_id}
+        )
+
+    async def _predict(self, send, fail, cancel: asyncio.Event):
+        begin = time.monotonic()
+        if self._slots is None:
+            await self._generate(send, fail, cancel, begin)
+            return
+        async with self._slots:
+            await self._generate(send, fail, cancel, begin)
+
+    async def _generate(self, send, fail, cancel: asyncio.Event, begin):
+        if self.first_token_latency:
+            await asyncio.sleep(self.first_token_latency)
+        interval = 1 / self.fragment_rate if self.fragment_rate else 0.0
+        next_at = time.monotonic()
+        stop_reason = "eosFound"
+        sent = 0
+        first_token_at = None
+        if self.fragments is not None:
+            num_fragments = len(self.fragments)
+        else:
+            num_fragments = self.num_fragments
+        for sent in range(num_fragments):
+            if cancel.is_set():
+                stop_reason = "userStopped"
+                break
+            if sent == self.error_after_fragments:
+                await fail("Injected error after %d fragments" % sent)
+                return
+            if interval:
+                next_at += interval
+                delay = next_at - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif sent % 64 == 63:
+                await asyncio.sleep(0)  # let cancels in
+            if self.fragments is not None:
+                fragment = self.fragments[sent]
+            else:
+                fragment = self.fragment
+            if not await send({"type": "fragment", "fragment": fragment}):
+                return
+            if first_token_at is None:
+                first_token_at = time.monotonic()
+        else:
+            sent = num_fragments
+        elapsed = time.monotonic() - begin
+        await send(
+            {
+                "type": "success",
+                "stats": {
+                    "stopReason": stop_reason,
+                    "tokensPerSecond": sent / elapsed if elapsed else None,
+                    "numGpuLayers": 0,
+                    "timeToFirstTokenSec": (
+                        first_token_at - begin if first_token_at else None
+                    ),
+                    "promptTokensCount": 1,
+                    "predictedTokensCount": sent,
+                    "totalTokensCount": sent + 1,
+                },
+                "descriptor": self._descriptor(self.models[0])
+                if self.models
+                else {},
+            }
+        )
+
+    async def _load(self, parameter: dict, send):
+        path = parameter.get("path", "mock/model")
+        await send({"type": "resolved", "fullPath": path, "ambiguous": False})
+        for step in range(1, 5):
+            if self.load_latency:
+                await asyncio.sleep(self.load_latency / 4)
+            await send({"type": "progress", "progress": step / 4})
+        instance_reference = "%016x" % self._random.getrandbits(64)
+        identifier = parameter.get("identifier", path)
+        self.models.append(
+            {
+                "identifier": identifier,
+                "path": path,
+                "instanceReference": instance_reference,
+            }
+        )
+        await send(
+            {
+                "type": "success",
+                "identifier": identifier,
+                "instanceReference": instance_reference,
+            }
+        )
@@ -0,0 +1,17 @@
+# pylance: disable=unused-imports
+# flake8: noqa: f401
+# ruff: noqa: F401
+"""A mock LM Studio server for tests and benchmarks.
+
+Runs offline, with no models or GPU: see `MockLMStudioServer`.
+Not imported by `lmstudio_sdk` itself.
+
+Classes:
+    MockLMStudioServer: A stand-in for the LM Studio server.
+"""
+
+from .MockLMStudioServer import DEFAULT_MODELS, MockLMStudioServer
+
+__all__ = [
+    "MockLMStudioServer",
+]
@@ -0,0 +1,192 @@
+import time
+from typing import Any, Dict, Optional
+
+from .logger import get_logger
+from .PredictionScheduler import PredictionScheduler, SchedulerTicket
+from .utils import _assert
+
+
+logger = get_logger(__name__)
+
+
+class _Window:
+    """The adaptive limit of one model, and what it was learned from."""
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.ttft: Optional[float] = None
+        self.throughput: Optional[float] = None
+        self.best_throughput = 0.0
+        self.best_limit = 1
+        self.last_decrease_at = 0.0
+        self.decreases = 0
+
+    def to_dict(self) -> Dict[str, Optional[float]]:
+        return {
+            "limit": int(self.limit),
+            "ttft": self.ttft,
+            "throughput": self.throughput,
+            "best_limit": self.best_limit,
+            "decreases": self.decreases,
+        }
+
+
+class AdaptiveConcurrencyLimiter(PredictionScheduler):
+    """A `PredictionScheduler` that finds each model's best concurrency.
+
+    Serving more predictions at once raises a server's throughput until
+    its slots are full; beyond that, predictions only wait longer for
+    their first token. The limiter adapts each model's limit AIMD-style,
+    as TCP does its congestion window, from every finished prediction:
+
+    - If its time to first token exceeded `target_ttft`, or it failed,
+      the limit is multiplied by `backoff`. Only predictions admitted
+      since the last decrease count, so one burst backs off once.
+    - If aggregate throughput (tokens per second times predictions
+      running) has dropped more than `tolerance` below the best seen at
+      a lower limit, more concurrency is not helping, so it backs off
+      too.
+    - Otherwise the limit grows by `increase` per limit's worth of
+      predictions, i.e. about `increase` per round trip.
+
+    Time to first token is measured on the client, from admission to
+    the first fragment, so it includes the network; the server's
+    `time_to_first_token_sec` is used for predictions without any.
+
+    ```python
+    limiter = AdaptiveConcurrencyLimiter(target_ttft=0.5, max_limit=32)
+    opts = {"schedule": {"scheduler": limiter}}
+    results = model.complete_many(prompts, opts, concurrency=64)
+    print(limiter.model_stats())
+    ```
+
+    Attributes:
+        target_ttft: Seconds to first token not to exceed.
+        min_limit: Lowest limit per model.
+        max_limit: Highest limit per model.
+        increase: Additive increase per round trip.
+        backoff: Multiplicative decrease, between 0 and 1.
+        smoothing: Weight of each sample in the moving averages.
+        tolerance: Relative throughput drop that counts as a plateau.
+    """
+
+    def __init__(
+        self,
+        target_ttft: float,
+        min_limit: int = 1,
+        max_limit: int = 64,
+        initial_limit: Optional[int] = None,
+        increase: float = 1.0,
+        backoff: float = 0.7,
+        smoothing: float = 0.3,
+        tolerance: float = 0.1,
+    ):
+        _assert(
+            target_ttft > 0,
+            "target_ttft must be positive, got %s",
+            target_ttft,
+            logger,
+        )
+        _assert(
+            1 <= min_limit <= max_limit,
+            "Expected 1 <= min_limit <= max_limit, got %s",
+            (min_limit, max_limit),
+            logger,
+        )
+        _assert(
+            0 < backoff < 1,
+            "backoff must be in (0, 1), got %s",
+            backoff,
+            logger,
+        )
+        initial_limit = initial_limit or min_limit
+        super().__init__(initial_limit)
+        self.target_ttft = target_ttft
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.increase = increase
+        self.backoff = backoff
+        self.smoothing = smoothing
+        self.tolerance = tolerance
+        self._windows: Dict[str, _Window] = {}
+
+    def __average(self, average: Optional[float], sample: float) -> float:
+        if average is None:
+            return sample
+        return self.smoothing * sample + (1 - self.smoothing) * average
+
+    @staticmethod
+    def __ttft(ticket: SchedulerTicket, stats: Any) -> Optional[float]:
+        if ticket.first_token_at is not None:
+            admitted_at = ticket.queued_at + (ticket.queue_time or 0.0)
+            return ticket.first_token_at - admitted_at
+        return stats.time_to_first_token_sec
+
+    def __decrease(self, window: _Window, ticket: SchedulerTicket, why: str):
+        admitted_at = ticket.queued_at + (ticket.queue_time or 0.0)
+        if admitted_at < window.last_decrease_at:
+            return
+        window.limit = max(self.min_limit, window.limit * self.backoff)
+        window.last_decrease_at = time.monotonic()
+        window.decreases += 1
+        logger.debug(
+            "Backing %s off to %d (%s).", ticket.model, window.limit, why
+        )
+
+    def _observe(self, ticket: SchedulerTicket, outcome: Any):
+        if outcome is None:
+            return
+        window = self._windows.get(ticket.model)
+        if window is None:
+            window = self._windows[ticket.model] = _Window(
+                self.limit(ticket.model)
+            )
+
+        if isinstance(outcome, BaseException) or outcome.stop_reason in (
+            "failed",
+            "modelUnloaded",
+        ):
+            self.__decrease(window, ticket, "failed")
+        else:
+            ttft = self.__ttft(ticket, outcome)
+            if ttft is not None:
+                window.ttft = self.__average(window.ttft, ttft)
+            if outcome.tokens_per_second:
+                window.throughput = self.__average(
+                    window.throughput,
+                    outcome.tokens_per_second * ticket.concurrency,
+                )
+                if window.throughput > window.best_throughput:
+                    window.best_throughput = window.throughput
+                    window.best_limit = int(window.limit)
+
+            if ttft is not None and ttft > self.target_ttft:
+                self.__decrease(window, ticket, "slow first token")
+            elif (
+                window.throughput is not None
+                and int(window.limit) > window.best_limit
+                and window.throughput
+                < window.best_throughput * (1 - self.tolerance)
+            ):
+                self.__decrease(window, ticket, "throughput plateau")
+            else:
+                window.limit = min(
+                    self.max_limit,
+                    window.limit + self.increase / window.limit,
+                )
+        self._limits[ticket.model] = int(window.limit)
+
+    def model_stats(self) -> Dict[str, Dict[str, Optional[float]]]:
+        """Get each model's current limit and the averages behind it.
+
+        Returns:
+            For each model: its `limit`, the moving averages of its
+            `ttft` in seconds and aggregate `throughput` in tokens per
+            second, the `best_limit` for throughput so far, and how many
+            `decreases` there were.
+        """
+        with self._lock:
+            return {
+                model: window.to_dict()
+                for model, window in self._windows.items()
+            }
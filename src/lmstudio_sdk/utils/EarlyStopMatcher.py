@@ -0,0 +1,117 @@
+import re
+from collections import deque
+from typing import Dict, Iterable, List, Optional
+
+
+class AhoCorasick:
+    """Finds any of many strings in text that arrives in pieces.
+
+    The automaton keeps its state between calls to `feed`, so matches
+    spanning two pieces are found, and each character is looked at
+    once whatever the number of strings.
+    """
+
+    def __init__(self, strings: Iterable[str]):
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._output: List[Optional[str]] = [None]
+        for string in strings:
+            if string:
+                self.__add(string)
+        self.__link()
+        self._state = 0
+
+    def __add(self, string: str):
+        state = 0
+        for char in string:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append(None)
+                self._goto[state][char] = next_state
+            state = next_state
+        if self._output[state] is None:
+            self._output[state] = string
+
+    def __link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                if self._output[next_state] is None:
+                    self._output[next_state] = self._output[
+                        self._fail[next_state]
+                    ]
+
+    def feed(self, text: str) -> Optional[str]:
+        """Scan the next piece of text.
+
+        Returns:
+            A string found ending in this piece, if any.
+        """
+        goto, fail, output = self._goto, self._fail, self._output
+        state = self._state
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state] is not None:
+                self._state = state
+                return output[state]
+        self._state = state
+        return None
+
+
+class EarlyStopMatcher:
+    """Checks generated text against `EarlyStopOpts` as it streams.
+
+    Attributes:
+        reason: Which condition was met, once one is.
+    """
+
+    def __init__(self, opts: dict):
+        regex = opts.get("regex")
+        self._regex = re.compile(regex) if isinstance(regex, str) else regex
+        self._window = opts.get("regex_window", 1024)
+        self._tail = ""
+        strings = opts.get("strings")
+        self._strings = AhoCorasick(strings) if strings else None
+        self._max_chars = opts.get("max_chars")
+        self._max_bytes = opts.get("max_bytes")
+        self._chars = 0
+        self._bytes = 0
+        self.reason: Optional[str] = None
+
+    def feed(self, fragment: str) -> bool:
+        """Check the next fragment.
+
+        Returns:
+            Whether a condition has been met, now or before.
+        """
+        if self.reason is not None:
+            return True
+        if self._max_chars is not None:
+            self._chars += len(fragment)
+            if self._chars >= self._max_chars:
+                self.reason = "max_chars"
+        if self._max_bytes is not None:
+            self._bytes += len(fragment.encode("utf-8"))
+            if self._bytes >= self._max_bytes:
+                self.reason = "max_bytes"
+        if self._strings is not None:
+            found = self._strings.feed(fragment)
+            if found is not None:
+                self.reason = "strings: %r" % found
+        if self._regex is not None:
+            self._tail = (self._tail + fragment)[-self._window :]
+            match = self._regex.search(self._tail)
+            if match is not None:
+                self.reason = "regex: %r" % match.group(0)
+        return self.reason is not None
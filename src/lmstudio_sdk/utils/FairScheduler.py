@@ -0,0 +1,239 @@
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from .logger import get_logger
+from .PredictionScheduler import PredictionScheduler, SchedulerTicket
+from .utils import _assert
+
+
+logger = get_logger(__name__)
+
+
+DEFAULT_TENANT = "default"
+"""Tenant of requests submitted without one."""
+
+
+class _Tenant:
+    """A tenant's share, budget and counters."""
+
+    def __init__(self, weight: float):
+        self.configure(weight, None, None, None)
+        self.submitted = 0
+        self.admitted = 0
+        self.throttled = 0
+        self.completed = 0
+        self.failed = 0
+        self.running = 0
+        self.total_queue_time = 0.0
+
+    def configure(
+        self,
+        weight: float,
+        rate: Optional[float],
+        burst: Optional[float],
+        max_in_flight: Optional[int],
+    ):
+        self.weight = weight
+        self.rate = rate
+        self.burst = burst if burst is not None else max(1.0, rate or 0.0)
+        self.max_in_flight = max_in_flight
+        self.tokens = self.burst
+        self.refilled_at = time.monotonic()
+
+    def refill(self, now: float):
+        if self.rate is None:
+            return
+        self.tokens = min(
+            self.burst, self.tokens + (now - self.refilled_at) * self.rate
+        )
+        self.refilled_at = now
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "weight": self.weight,
+            "submitted": self.submitted,
+            "admitted": self.admitted,
+            "running": self.running,
+            "completed": self.completed,
+            "failed": self.failed,
+            "throttled": self.throttled,
+            "mean_queue_time": (
+                self.total_queue_time / self.admitted if self.admitted else 0.0
+            ),
+        }
+
+
+class FairScheduler(PredictionScheduler):
+    """A `PredictionScheduler` that shares capacity fairly among tenants.
+
+    For gateways serving many users or API keys over one client. Give
+    each request a `tenant` in its `ScheduleOpts`; within a priority,
+    queued requests are then admitted by weighted fair queuing, so each
+    tenant with requests waiting gets a share of the model's slots in
+    proportion to its weight, however many requests it queues. A tenant
+    can also be held to a request rate by a token bucket, and to a
+    number of requests in flight:
+
+    ```python
+    scheduler = FairScheduler(max_concurrency=8)
+    scheduler.set_tenant("free", weight=1, rate=0.5, max_in_flight=2)
+    scheduler.set_tenant("pro", weight=4)
+    opts = {"schedule": {"scheduler": scheduler, "tenant": api_key_tier}}
+    prediction = model.respond(history, opts)
+    print(scheduler.tenant_stats())
+    ```
+
+    Requests over a tenant's budget wait in the queue until it refills,
+    without blocking other tenants. Tenants not set up with
+    `set_tenant` have `default_weight` and no budget.
+
+    Attributes:
+        default_weight: Weight of tenants not set up with `set_tenant`.
+    """
+
+    def __init__(self, max_concurrency: int = 4, default_weight: float = 1.0):
+        super().__init__(max_concurrency)
+        self.default_weight = default_weight
+        self._tenants: Dict[str, _Tenant] = {}
+        self._virtual_time: Dict[str, float] = {}
+        self._finish_tags: Dict[Tuple[str, str], float] = {}
+        self._refill_timers: Dict[str, threading.Timer] = {}
+
+    def set_tenant(
+        self,
+        tenant: str,
+        weight: float = 1.0,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        max_in_flight: Optional[int] = None,
+    ):
+        """Set up a tenant's share and budget.
+
+        Args:
+            tenant: The tenant's name, as given in `ScheduleOpts`.
+            weight: Its share of slots relative to other tenants.
+            rate: Requests per second it may make on average, or None
+                for no limit.
+            burst: Requests it may make at once before `rate` applies.
+                Defaults to `rate`, and at least 1.
+            max_in_flight: Its most requests running at once, or None
+                for no limit other than the model's.
+        """
+        _assert(weight > 0, "weight must be positive, got %s", weight, logger)
+        _assert(
+            rate is None or rate > 0,
+            "rate must be positive, got %s",
+            rate,
+            logger,
+        )
+        with self._lock:
+            if tenant not in self._tenants:
+                self._tenants[tenant] = _Tenant(weight)
+            self._tenants[tenant].configure(weight, rate, burst, max_in_flight)
+        for model in list(self._queues):
+            self._readmit(model)
+
+    def __tenant(self, ticket: SchedulerTicket) -> Tuple[str, _Tenant]:
+        name = ticket.tenant or DEFAULT_TENANT
+        tenant = self._tenants.get(name)
+        if tenant is None:
+            tenant = self._tenants[name] = _Tenant(self.default_weight)
+        return name, tenant
+
+    def _on_queued(self, ticket: SchedulerTicket):
+        # start-time fair queuing: a tenant's next request starts where
+        # its last one finishes, or now if it has been idle
+        name, tenant = self.__tenant(ticket)
+        tenant.submitted += 1
+        start = max(
+            self._virtual_time.get(ticket.model, 0.0),
+            self._finish_tags.get((ticket.model, name), 0.0),
+        )
+        ticket._tag = start + 1.0 / tenant.weight
+        self._finish_tags[(ticket.model, name)] = ticket._tag
+        ticket._start = start
+
+    def _can_admit(self, ticket: SchedulerTicket) -> bool:
+        _, tenant = self.__tenant(ticket)
+        if (
+            tenant.max_in_flight is not None
+            and tenant.running >= tenant.max_in_flight
+        ):
+            return False
+        if tenant.rate is None:
+            return True
+        now = time.monotonic()
+        tenant.refill(now)
+        if tenant.tokens >= 1.0:
+            return True
+        if not getattr(ticket, "_throttled", False):
+            ticket._throttled = True
+            tenant.throttled += 1
+        self.__readmit_after(ticket.model, (1.0 - tenant.tokens) / tenant.rate)
+        return False
+
+    def __readmit_after(self, model: str, delay: float):
+        """Try admitting again once a budget has refilled."""
+        if model in self._refill_timers:
+            return
+
+        def readmit():
+            with self._lock:
+                self._refill_timers.pop(model, None)
+            self._readmit(model)
+
+        timer = threading.Timer(delay, readmit)
+        timer.daemon = True
+        self._refill_timers[model] = timer
+        timer.start()
+
+    def _on_admitted(self, ticket: SchedulerTicket):
+        _, tenant = self.__tenant(ticket)
+        if tenant.rate is not None:
+            tenant.tokens -= 1.0
+        tenant.admitted += 1
+        tenant.running += 1
+        tenant.total_queue_time += ticket.queue_time or 0.0
+        self._virtual_time[ticket.model] = max(
+            self._virtual_time.get(ticket.model, 0.0),
+            ticket._start,
+        )
+
+    def _observe(self, ticket: SchedulerTicket, outcome: Any):
+        _, tenant = self.__tenant(ticket)
+        tenant.running -= 1
+        if isinstance(outcome, BaseException):
+            tenant.failed += 1
+        else:
+            tenant.completed += 1
+
+    def release(self, ticket: SchedulerTicket, outcome: Any = None):
+        """Free a request's slot. See `PredictionScheduler.release`."""
+        was_admitted = ticket.state == "admitted"
+        super().release(ticket, outcome)
+        if not was_admitted:
+            return
+        with self._lock:
+            _, tenant = self.__tenant(ticket)
+            if tenant.max_in_flight is None:
+                return
+            models = [model for model in self._queues if model != ticket.model]
+        # the freed slot may let its requests for other models go
+        for model in models:
+            self._readmit(model)
+
+    def tenant_stats(self) -> Dict[str, Dict[str, float]]:
+        """Get each tenant's counters.
+
+        Returns:
+            For each tenant seen: its `weight`, how many requests it
+            `submitted`, got `admitted`, has `running`, `completed` and
+            `failed`, how many were `throttled` by its rate, and its
+            `mean_queue_time` in seconds.
+        """
+        with self._lock:
+            return {
+                name: tenant.to_dict()
+                for name, tenant in self._tenants.items()
+            }
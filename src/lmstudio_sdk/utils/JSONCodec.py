@@ -0,0 +1,118 @@
+import json
+from typing import Any, Optional, Union
+
+
+class JSONCodec:
+    """Encodes and decodes the JSON packets sent over the wire.
+
+    This is the standard library implementation, which is always
+    available. Faster third-party implementations are used instead
+    when installed; see `get_json_codec`.
+    """
+
+    name = "json"
+
+    def dumps(self, obj: Any) -> str:
+        """Encode an object as a JSON string."""
+        return json.dumps(obj)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        """Decode a JSON string or bytes."""
+        return json.loads(data)
+
+
+class OrjsonCodec(JSONCodec):
+    """JSON codec backed by `orjson`."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+
+        self._dumps = orjson.dumps
+        self._loads = orjson.loads
+
+    def dumps(self, obj: Any) -> str:
+        # orjson returns bytes, but packets must go out as text frames
+        return self._dumps(obj).decode("utf-8")
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._loads(data)
+
+
+class MsgspecCodec(JSONCodec):
+    """JSON codec backed by `msgspec`."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+
+        self._encode = msgspec.json.Encoder().encode
+        self._decode = msgspec.json.Decoder().decode
+
+    def dumps(self, obj: Any) -> str:
+        return self._encode(obj).decode("utf-8")
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._decode(data)
+
+
+class UjsonCodec(JSONCodec):
+    """JSON codec backed by `ujson`."""
+
+    name = "ujson"
+
+    def __init__(self):
+        import ujson
+
+        self._dumps = ujson.dumps
+        self._loads = ujson.loads
+
+    def dumps(self, obj: Any) -> str:
+        return self._dumps(obj, ensure_ascii=False)
+
+    def loads(self, data: Union[str, bytes]) -> Any:
+        return self._loads(data)
+
+
+_codecs = {
+    codec.name: codec
+    for codec in [OrjsonCodec, MsgspecCodec, UjsonCodec, JSONCodec]
+}
+"""Known codecs, in order of preference."""
+
+
+def get_json_codec(
+    codec: Optional[Union[str, JSONCodec]] = None,
+) -> JSONCodec:
+    """Get a JSON codec for the client ports.
+
+    Args:
+        codec: A codec instance, which is returned as is, or the name
+            of a codec ("orjson", "msgspec", "ujson" or "json").
+            If None, the fastest installed codec is selected.
+
+    Returns:
+        The JSON codec.
+
+    Raises:
+        ValueError: If the named codec is unknown or not installed.
+    """
+    if isinstance(codec, JSONCodec):
+        return codec
+    if codec is None:
+        for codec_class in _codecs.values():
+            try:
+                return codec_class()
+            except ImportError:
+                continue
+    if codec not in _codecs:
+        raise ValueError(
+            "Unknown JSON codec %s, expected one of %s."
+            % (codec, ", ".join(_codecs))
+        )
+    try:
+        return _codecs[codec]()
+    except ImportError:
+        raise ValueError("JSON codec %s is not installed." % codec)
@@ -0,0 +1,497 @@
+import json
+import re
+from typing import Any, List, Optional, Sequence, Tuple, Union
+
+from .utils import JSONSchemaError, JSONStreamError
+
+Path = Tuple[Union[str, int], ...]
+
+# parser states
+_VALUE = 0  # expecting a value
+_ITEM_OR_END = 1  # after "[": a value or "]"
+_KEY_OR_END = 2  # after "{": a key or "}"
+_KEY = 3  # after "," in an object: a key
+_COLON = 4
+_COMMA_OR_END = 5
+_STRING = 6
+_SCALAR = 7
+_END = 8  # the document is complete
+
+_WHITESPACE = " \t\n\r"
+_STRING_SPECIAL = re.compile(r'["\\]')
+_SCALAR_END = re.compile(r"[\s,\]}]")
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(\.\d+)?([eE][+-]?\d+)?")
+_PARTIAL_ESCAPE = re.compile(r"\\(u[0-9a-fA-F]{0,3})?$")
+_LITERALS = {"true": True, "false": False, "null": None}
+_DECODER = json.JSONDecoder(strict=False)
+
+_KINDS = {
+    "{": "object",
+    "[": "array",
+    '"': "string",
+    "t": "boolean",
+    "f": "boolean",
+    "n": "null",
+}
+
+
+def _format_path(path: Path) -> str:
+    return "$" + "".join(
+        "[%d]" % part if isinstance(part, int) else ".%s" % part
+        for part in path
+    )
+
+
+def _copy(value: Any) -> Any:
+    if isinstance(value, dict):
+        return {key: _copy(item) for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy(item) for item in value]
+    return value
+
+
+def _decode_string(raw: str) -> str:
+    return _DECODER.decode('"' + raw + '"')
+
+
+class _Frame:
+    """An object or array that is still open."""
+
+    __slots__ = ("container", "schema", "path", "key", "count")
+
+    def __init__(self, container: Any, schema: dict, path: Path):
+        self.container = container
+        self.schema = schema
+        self.path = path
+        self.key: Optional[str] = None
+        self.count = 0
+
+    def child(self) -> Tuple[dict, Path]:
+        """Get the schema and path of the value being parsed in here."""
+        if isinstance(self.container, list):
+            items = self.schema.get("items")
+            schema = items if isinstance(items, dict) else {}
+            return schema, self.path + (self.count - 1,)
+        properties = self.schema.get("properties") or {}
+        schema = properties.get(self.key)
+        if schema is None:
+            additional = self.schema.get("additionalProperties")
+            schema = additional if isinstance(additional, dict) else {}
+        return schema, self.path + (self.key,)
+
+
+class JSONStreamParser:
+    """An incremental parser for JSON arriving in fragments.
+
+    Feed it fragments as they are generated; it returns values as soon
+    as they are complete, rather than once the whole document is:
+
+    ```python
+    parser = JSONStreamParser(path=("results",))
+    parser.feed('{"results": [{"id": 1}, {"i')  # [{"id": 1}]
+    parser.feed('d": 2}]}')  # [{"id": 2}]
+    parser.close()  # []
+    parser.value  # {"results": [{"id": 1}, {"id": 2}]}
+    ```
+
+    With a `schema`, values are validated while they are parsed, so a
+    mismatch is raised as early as it can be seen, e.g. at the first
+    character of a value of the wrong type or at a key that is not
+    allowed. Only a subset of JSON Schema is checked: `type`, `enum`,
+    `const`, `properties`, `required`, `additionalProperties`, `items`,
+    `minItems`, `maxItems`, `minLength`, `maxLength`, `pattern`,
+    `minimum`, `maximum`, `exclusiveMinimum` and `exclusiveMaximum`.
+    Anything else, e.g. `anyOf` or `$ref`, is not validated.
+
+    Attributes:
+        schema: The JSON schema to validate against, if any.
+        path: Keys and indices from the root to the array whose
+            elements are returned. If the value there is not an array,
+            it is returned whole instead.
+    """
+
+    def __init__(
+        self,
+        schema: Optional[dict] = None,
+        path: Sequence[Union[str, int]] = (),
+    ):
+        self.schema = schema or {}
+        self.path: Path = tuple(path)
+        self._state = _VALUE
+        self._stack: List[_Frame] = []
+        self._root: Any = None
+        self._buffer: List[str] = []
+        self._escaped = False
+        self._string_is_key = False
+        self._value_schema: dict = self.schema
+        self._value_path: Path = ()
+
+    @property
+    def done(self) -> bool:
+        """Whether the whole document has been parsed."""
+        return self._state == _END
+
+    @property
+    def value(self) -> Any:
+        """The parsed document, once `done`.
+
+        Raises:
+            JSONStreamError: if the document is not complete yet.
+        """
+        if self._state != _END:
+            raise JSONStreamError("The JSON document is not complete.")
+        return self._root
+
+    def feed(self, text: str) -> List[Any]:
+        """Parse the next fragment.
+
+        Args:
+            text: The next fragment of the document.
+
+        Returns:
+            The values at `path` completed by this fragment.
+
+        Raises:
+            JSONStreamError: if the JSON is malformed.
+            JSONSchemaError: if it does not match the schema.
+        """
+        completed: List[Any] = []
+        i, n = 0, len(text)
+        while i < n:
+            state = self._state
+            if state == _STRING:
+                i = self.__feed_string(text, i, completed)
+                continue
+            if state == _SCALAR:
+                match = _SCALAR_END.search(text, i)
+                if match is None:
+                    self._buffer.append(text[i:])
+                    break
+                self._buffer.append(text[i : match.start()])
+                self.__end_scalar(completed)
+                i = match.start()
+                continue
+
+            char = text[i]
+            i += 1
+            if char in _WHITESPACE:
+                continue
+            if state == _VALUE or state == _ITEM_OR_END:
+                if char == "]" and state == _ITEM_OR_END:
+                    self.__close(list, completed)
+                else:
+                    i = self.__start_value(char, i)
+            elif state == _KEY_OR_END or state == _KEY:
+                if char == "}" and state == _KEY_OR_END:
+                    self.__close(dict, completed)
+                elif char == '"':
+                    self._buffer = []
+                    self._string_is_key = True
+                    self._state = _STRING
+                else:
+                    self.__unexpected(char)
+            elif state == _COLON:
+                if char != ":":
+                    self.__unexpected(char)
+                self._state = _VALUE
+            elif state == _COMMA_OR_END:
+                is_array = isinstance(self._stack[-1].container, list)
+                if char == ",":
+                    self._state = _VALUE if is_array else _KEY
+                elif char == ("]" if is_array else "}"):
+                    self.__close(list if is_array else dict, completed)
+                else:
+                    self.__unexpected(char)
+            else:
+                self.__unexpected(char)
+        return completed
+
+    def close(self) -> List[Any]:
+        """Finish parsing at the end of the input.
+
+        Returns:
+            The values at `path` completed by the end of the input,
+            i.e. a number, `true`, `false` or `null` at the root.
+
+        Raises:
+            JSONStreamError: if the document is incomplete.
+        """
+        completed: List[Any] = []
+        if self._state == _SCALAR and not self._stack:
+            self.__end_scalar(completed)
+        if self._state != _END:
+            raise JSONStreamError(
+                "The JSON document ended before it was complete."
+            )
+        return completed
+
+    def partial(self) -> Any:
+        """Get a copy of the document as parsed so far.
+
+        Open objects and arrays hold the values completed in them, and
+        a string being parsed holds the part of it parsed so far.
+        Numbers and keys being parsed are left out.
+        """
+        if self._state != _STRING or self._string_is_key:
+            return _copy(self._root)
+        raw = _PARTIAL_ESCAPE.sub("", "".join(self._buffer))
+        try:
+            string = _decode_string(raw)
+        except ValueError:
+            string = raw
+        if not self._stack:
+            return string
+        container = self._stack[-1].container
+        if isinstance(container, list):
+            container.append(string)
+            snapshot = _copy(self._root)
+            container.pop()
+        else:
+            key = self._stack[-1].key
+            container[key] = string
+            snapshot = _copy(self._root)
+            del container[key]
+        return snapshot
+
+    def __unexpected(self, char: str):
+        raise JSONStreamError(
+            "Unexpected %r in JSON at %s."
+            % (char, _format_path(self.__current_path()))
+        )
+
+    def __current_path(self) -> Path:
+        if not self._stack:
+            return ()
+        frame = self._stack[-1]
+        if self._state in (_VALUE, _STRING, _SCALAR) and (
+            isinstance(frame.container, list) or frame.key is not None
+        ):
+            return frame.child()[1]
+        return frame.path
+
+    def __start_value(self, char: str, i: int) -> int:
+        """Start parsing a value at `char`, returning where to continue."""
+        if self._stack:
+            frame = self._stack[-1]
+            if isinstance(frame.container, list):
+                frame.count += 1
+                max_items = frame.schema.get("maxItems")
+                if max_items is not None and frame.count > max_items:
+                    raise JSONSchemaError(
+                        "Array at %s has more than %d items."
+                        % (_format_path(frame.path), max_items)
+                    )
+            schema, path = frame.child()
+        else:
+            schema, path = self.schema, ()
+        self._value_schema, self._value_path = schema, path
+
+        if char == "-" or char.isdigit():
+            kind = "number"
+        else:
+            kind = _KINDS.get(char)
+            if kind is None:
+                self.__unexpected(char)
+        self.__check_type(kind, schema, path)
+
+        if char == "{" or char == "[":
+            container = {} if char == "{" else []
+            if self._stack:
+                self.__attach(container)
+            else:
+                self._root = container
+            self._stack.append(_Frame(container, schema, path))
+            self._state = _KEY_OR_END if char == "{" else _ITEM_OR_END
+            return i
+        self._buffer = []
+        if char == '"':
+            self._string_is_key = False
+            self._state = _STRING
+            return i
+        # scalars are re-read from their first character
+        self._state = _SCALAR
+        return i - 1
+
+    def __feed_string(self, text: str, i: int, completed: List[Any]) -> int:
+        """Parse string contents from `i`, returning where to continue."""
+        if self._escaped:
+            self._buffer.append(text[i])
+            self._escaped = False
+            i += 1
+        match = _STRING_SPECIAL.search(text, i)
+        if match is None:
+            self._buffer.append(text[i:])
+            return len(text)
+        j = match.start()
+        if text[j] == "\\":
+            if j + 1 < len(text):
+                self._buffer.append(text[i : j + 2])
+                return j + 2
+            self._buffer.append(text[i : j + 1])
+            self._escaped = True
+            return j + 1
+        self._buffer.append(text[i:j])
+        try:
+            string = _decode_string("".join(self._buffer))
+        except ValueError as e:
+            raise JSONStreamError(
+                "Invalid string in JSON at %s: %s"
+                % (_format_path(self.__current_path()), e)
+            ) from e
+        if self._string_is_key:
+            self.__end_key(string)
+        else:
+            self.__end_value(string, completed)
+        return j + 1
+
+    def __end_key(self, key: str):
+        frame = self._stack[-1]
+        if frame.schema.get("additionalProperties") is False and key not in (
+            frame.schema.get("properties") or {}
+        ):
+            raise JSONSchemaError(
+                "Object at %s has unexpected property %r."
+                % (_format_path(frame.path), key)
+            )
+        frame.key = key
+        self._state = _COLON
+
+    def __end_scalar(self, completed: List[Any]):
+        token = "".join(self._buffer)
+        if token in _LITERALS:
+            value = _LITERALS[token]
+        else:
+            match = _NUMBER.fullmatch(token)
+            if match is None:
+                raise JSONStreamError(
+                    "Invalid value %r in JSON at %s."
+                    % (token, _format_path(self._value_path))
+                )
+            if match.group(1) or match.group(2):
+                value = float(token)
+            else:
+                value = int(token)
+        self.__end_value(value, completed)
+
+    def __attach(self, value: Any):
+        frame = self._stack[-1]
+        if isinstance(frame.container, list):
+            frame.container.append(value)
+        else:
+            frame.container[frame.key] = value
+
+    def __end_value(self, value: Any, completed: List[Any]):
+        """Finish a string or scalar value."""
+        self.__check_value(value, self._value_schema, self._value_path)
+        if self._stack:
+            self.__attach(value)
+        else:
+            self._root = value
+        self.__completed(value, self._value_path, completed)
+
+    def __close(self, kind: type, completed: List[Any]):
+        """Finish the innermost object or array."""
+        frame = self._stack.pop()
+        schema = frame.schema
+        if kind is dict:
+            missing = [
+                key
+                for key in schema.get("required") or ()
+                if key not in frame.container
+            ]
+            if missing:
+                raise JSONSchemaError(
+                    "Object at %s is missing required properties %s."
+                    % (_format_path(frame.path), ", ".join(missing))
+                )
+        else:
+            min_items = schema.get("minItems")
+            if min_items is not None and frame.count < min_items:
+                raise JSONSchemaError(
+                    "Array at %s has fewer than %d items."
+                    % (_format_path(frame.path), min_items)
+                )
+        self.__check_value(frame.container, schema, frame.path)
+        self.__completed(frame.container, frame.path, completed)
+
+    def __completed(self, value: Any, path: Path, completed: List[Any]):
+        if path[:-1] == self.path and self._stack:
+            if isinstance(self._stack[-1].container, list):
+                completed.append(value)
+        elif path == self.path and not isinstance(value, list):
+            completed.append(value)
+        self._state = _COMMA_OR_END if self._stack else _END
+
+    def __check_type(self, kind: str, schema: dict, path: Path):
+        types = schema.get("type")
+        if types is None:
+            return
+        if isinstance(types, str):
+            types = [types]
+        if kind in types or (kind == "number" and "integer" in types):
+            return
+        raise JSONSchemaError(
+            "Expected %s at %s, got %s."
+            % (" or ".join(types), _format_path(path), kind)
+        )
+
+    def __check_value(self, value: Any, schema: dict, path: Path):
+        if not schema:
+            return
+        where = _format_path(path)
+        if "const" in schema and value != schema["const"]:
+            raise JSONSchemaError(
+                "Expected %r at %s, got %r." % (schema["const"], where, value)
+            )
+        if "enum" in schema and value not in schema["enum"]:
+            raise JSONSchemaError(
+                "Expected one of %r at %s, got %r."
+                % (schema["enum"], where, value)
+            )
+        if isinstance(value, str):
+            self.__check_string(value, schema, where)
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            self.__check_number(value, schema, where)
+
+    def __check_string(self, value: str, schema: dict, where: str):
+        min_length = schema.get("minLength")
+        if min_length is not None and len(value) < min_length:
+            raise JSONSchemaError(
+                "String at %s is shorter than %d." % (where, min_length)
+            )
+        max_length = schema.get("maxLength")
+        if max_length is not None and len(value) > max_length:
+            raise JSONSchemaError(
+                "String at %s is longer than %d." % (where, max_length)
+            )
+        pattern = schema.get("pattern")
+        if pattern is not None and re.search(pattern, value) is None:
+            raise JSONSchemaError(
+                "String at %s does not match %r." % (where, pattern)
+            )
+
+    def __check_number(self, value: float, schema: dict, where: str):
+        types = schema.get("type")
+        if isinstance(types, str):
+            types = [types]
+        if (
+            types is not None
+            and "number" not in types
+            and not float(value).is_integer()
+        ):
+            raise JSONSchemaError(
+                "Expected integer at %s, got %r." % (where, value)
+            )
+        bounds = (
+            ("minimum", lambda bound: value < bound, "less than"),
+            ("maximum", lambda bound: value > bound, "greater than"),
+            ("exclusiveMinimum", lambda bound: value <= bound, "at most"),
+            ("exclusiveMaximum", lambda bound: value >= bound, "at least"),
+        )
+        for keyword, violates, description in bounds:
+            bound = schema.get(keyword)
+            if isinstance(bound, (int, float)) and violates(bound):
+                raise JSONSchemaError(
+                    "Number %r at %s is %s %r."
+                    % (value, where, description, bound)
+                )
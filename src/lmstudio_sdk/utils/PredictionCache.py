@@ -0,0 +1,222 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+
+def _canonical_json(obj: Any) -> str:
+    return json.dumps(obj, sort_keys=True, separators=(",", ":"), default=str)
+
+
+class PredictionCache:
+    """An LRU cache of deterministic prediction results.
+
+    Predictions made with `temperature` 0 or a fixed `seed` always give
+    the same result for the same model, context and config. Pass a cache
+    as the `cache` prediction option to skip the server for repeats:
+
+    ```python
+    cache = PredictionCache(max_entries=1000)
+    opts = {"temperature": 0, "cache": cache}
+    first = model.complete("The capital of France is", opts)
+    again = model.complete("The capital of France is", opts)  # cached
+    print(cache.hits, cache.misses)  # 1 1
+    ```
+
+    Cached predictions are replayed: iterating over them yields the
+    original fragments, and their result has the original stats.
+    Predictions with other options are never cached, nor are those
+    with options that can cut them short, such as `stop_when` or
+    `max_wall_time`. Neither are predictions that were cancelled or
+    failed.
+
+    With a `directory`, entries are also written there as JSON files,
+    so they survive the process and can be shared between processes.
+    The directory is bounded by `max_entries` too: the least recently
+    used files are deleted when there are more, counting those found
+    when the cache is created. Files other processes write meanwhile
+    are only counted by caches created after them.
+
+    The cache is thread-safe, so it can be shared by sync clients
+    predicting from many threads.
+
+    Attributes:
+        max_entries: The most entries kept in memory, and on disk.
+        directory: Where entries are stored on disk, if anywhere.
+        hits: Lookups that found an entry, in memory or on disk.
+        misses: Lookups that found none.
+        evictions: Entries dropped from memory to make room.
+    """
+
+    def __init__(
+        self, max_entries: int = 1024, directory: Optional[str] = None
+    ):
+        self.max_entries = max_entries
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries: OrderedDict[str, dict] = OrderedDict()
+        self._files: OrderedDict[str, None] = OrderedDict()
+        self._lock = threading.Lock()
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+            self.__scan()
+
+    @staticmethod
+    def make_key(model_path: str, context: Any, config_stack: Any) -> str:
+        """Hash what determines a prediction's result into a cache key.
+
+        Args:
+            model_path: The path of the model making the prediction.
+            context: The resolved `LLMContext` predicted from.
+            config_stack: The prediction `KVConfigStack`, or anything
+                else JSON-serializable that identifies it.
+
+        Returns:
+            A hex SHA-256 digest, stable across processes.
+        """
+        return hashlib.sha256(
+            _canonical_json(
+                {
+                    "model": model_path,
+                    "context": context,
+                    "config": config_stack,
+                }
+            ).encode("utf-8")
+        ).hexdigest()
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key + ".json")
+
+    def __scan(self):
+        """Index the files already on disk, oldest first, and prune them."""
+        found = []
+        for name in os.listdir(self.directory):
+            if name.endswith(".json"):
+                path = os.path.join(self.directory, name)
+                try:
+                    mtime = os.path.getmtime(path)
+                except OSError:
+                    continue
+                found.append((mtime, name[: -len(".json")]))
+        for _, key in sorted(found):
+            self._files[key] = None
+        self.__remove(self.__evict_files())
+
+    def __track_file(self, key: str) -> List[str]:
+        """Mark a file as most recently used; return the files to delete."""
+        self._files[key] = None
+        self._files.move_to_end(key)
+        return self.__evict_files()
+
+    def __evict_files(self) -> List[str]:
+        evicted = []
+        while len(self._files) > self.max_entries:
+            evicted.append(self._files.popitem(last=False)[0])
+        return evicted
+
+    def __remove(self, keys: List[str]):
+        for key in keys:
+            try:
+                os.remove(self.__path(key))
+            except OSError:
+                pass
+
+    def __read(self, key: str) -> Optional[dict]:
+        try:
+            with open(self.__path(key), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def __write(self, key: str, entry: dict):
+        # write then rename, so readers never see half an entry
+        try:
+            fd, tmp_path = tempfile.mkstemp(dir=self.directory)
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(entry, f)
+            os.replace(tmp_path, self.__path(key))
+        except OSError:
+            pass
+
+    def __remember(self, key: str, entry: dict):
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def get(self, key: str) -> Optional[dict]:
+        """Look up an entry, counting a hit or a miss."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                if key in self._files:
+                    self._files.move_to_end(key)
+                self.hits += 1
+                return entry
+        if self.directory is not None:
+            entry = self.__read(key)
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None
+            self.__remember(key, entry)
+            evicted = self.__track_file(key)
+            self.hits += 1
+        # so the next cache on this directory sees it as recently used
+        try:
+            os.utime(self.__path(key))
+        except OSError:
+            pass
+        self.__remove(evicted)
+        return entry
+
+    def put(self, key: str, entry: dict):
+        """Store an entry, evicting the least recently used if full.
+
+        Args:
+            key: The key from `make_key`.
+            entry: The prediction to replay, as JSON-serializable data.
+        """
+        with self._lock:
+            self.__remember(key, entry)
+            if self.directory is None:
+                return
+            evicted = self.__track_file(key)
+        self.__write(key, entry)
+        self.__remove(evicted)
+
+    def clear(self):
+        """Drop all entries, including those on disk, and reset stats."""
+        with self._lock:
+            self._entries.clear()
+            self._files.clear()
+            self.hits = self.misses = self.evictions = 0
+        if self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".json"):
+                    try:
+                        os.remove(os.path.join(self.directory, name))
+                    except OSError:
+                        pass
+
+    def stats(self) -> Dict[str, float]:
+        """Get the hit and miss counts, hit rate and size of the cache."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,469 @@
+import asyncio
+import heapq
+import itertools
+import threading
+import time
+from typing import Any, Dict, List, Optional, Union
+
+from .AbortSignal import AsyncAbortSignal, SyncAbortSignal
+from .logger import get_logger
+from .utils import _assert, QueueCancelledError
+
+
+logger = get_logger(__name__)
+
+
+PRIORITY_CLASSES: Dict[str, int] = {"interactive": 0, "default": 1, "batch": 2}
+"""Named priorities; lower ranks are admitted first."""
+
+
+Priority = Union[str, int]
+
+
+class SchedulerTicket:
+    """A request's place in a `PredictionScheduler`.
+
+    Attributes:
+        model: The model the request is for.
+        priority: The priority it was submitted with.
+        tenant: Who the request is on behalf of, if anyone.
+        state: "queued", "admitted", "cancelled" or "released".
+        queued_at: `time.monotonic()` when it was submitted.
+        queue_time: Seconds it waited, once admitted or cancelled.
+        concurrency: Requests running on the model once it was
+            admitted, itself included.
+        first_token_at: `time.monotonic()` when its prediction produced
+            a first token, if it did.
+    """
+
+    def __init__(
+        self,
+        model: str,
+        priority: Priority,
+        rank: int,
+        seq: int,
+        future: Optional[asyncio.Future] = None,
+        tenant: Optional[str] = None,
+    ):
+        self.model = model
+        self.priority = priority
+        self.tenant = tenant
+        self.state = "queued"
+        self.queued_at = time.monotonic()
+        self.queue_time: Optional[float] = None
+        self.concurrency = 0
+        self.first_token_at: Optional[float] = None
+        self._rank = rank
+        self._tag = 0.0
+        self._start = 0.0
+        self._seq = seq
+        self._event = threading.Event()
+        self._future = future
+
+    def __lt__(self, other: "SchedulerTicket") -> bool:
+        return (self._rank, self._tag, self._seq) < (
+            other._rank,
+            other._tag,
+            other._seq,
+        )
+
+    def _wake(self):
+        self._event.set()
+        future = self._future
+        if future is not None:
+            future.get_loop().call_soon_threadsafe(
+                lambda: future.done() or future.set_result(None)
+            )
+
+
+class _PriorityStats:
+    def __init__(self):
+        self.queued = 0
+        self.admitted = 0
+        self.cancelled = 0
+        self.total_queue_time = 0.0
+        self.max_queue_time = 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        return {
+            "queued": self.queued,
+            "admitted": self.admitted,
+            "cancelled": self.cancelled,
+            "mean_queue_time": (
+                self.total_queue_time / self.admitted if self.admitted else 0.0
+            ),
+            "max_queue_time": self.max_queue_time,
+        }
+
+
+class PredictionScheduler:
+    """Admits predictions per model by priority, up to a concurrency cap.
+
+    Pass a scheduler in the `schedule` prediction option to queue the
+    prediction on the client until fewer than `max_concurrency`
+    predictions are running on its model. Queued predictions are
+    admitted by priority, then in the order they were submitted, so
+    interactive requests jump ahead of batch work:
+
+    ```python
+    scheduler = PredictionScheduler(max_concurrency=2)
+    batch = {"schedule": {"scheduler": scheduler, "priority": "batch"}}
+    chat = {"schedule": {"scheduler": scheduler, "priority": "interactive"}}
+    results = model.complete_many(documents, batch, concurrency=32)
+    # meanwhile, in another thread, this waits for one slot at most
+    print(model.respond(history, chat).result().content)
+    ```
+
+    Priorities are the names in `PRIORITY_CLASSES` or integer ranks,
+    lower first. A queued request can be cancelled with the `signal`
+    of its `ScheduleOpts`, by cancelling the task awaiting it, or with
+    `cancel_queued`; it then raises `QueueCancelledError`.
+
+    The scheduler is thread-safe, and can be shared by several handles
+    and clients, sync or async.
+
+    Attributes:
+        max_concurrency: Running predictions allowed per model, unless
+            overridden with `set_limit`.
+    """
+
+    def __init__(self, max_concurrency: int = 4):
+        _assert(
+            isinstance(max_concurrency, int) and max_concurrency >= 1,
+            "max_concurrency must be a positive integer, got %s",
+            max_concurrency,
+            logger,
+        )
+        self.max_concurrency = max_concurrency
+        self._limits: Dict[str, int] = {}
+        self._running: Dict[str, int] = {}
+        self._queues: Dict[str, List[SchedulerTicket]] = {}
+        self._stats: Dict[Priority, _PriorityStats] = {}
+        self._seq = itertools.count()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _rank(priority: Priority) -> int:
+        if isinstance(priority, int):
+            return priority
+        _assert(
+            priority in PRIORITY_CLASSES,
+            "Unknown priority %s, expected an int or one of "
+            + ", ".join(PRIORITY_CLASSES),
+            priority,
+            logger,
+        )
+        return PRIORITY_CLASSES[priority]
+
+    def limit(self, model: str) -> int:
+        """Get how many predictions may run on `model` at once."""
+        return self._limits.get(model, self.max_concurrency)
+
+    def set_limit(self, model: str, limit: int):
+        """Change how many predictions may run on `model` at once.
+
+        Raising the limit admits queued predictions right away; lowering
+        it lets running predictions finish.
+        """
+        _assert(limit >= 1, "limit must be at least 1, got %s", limit, logger)
+        with self._lock:
+            self._limits[model] = limit
+            admitted = self._admit_queued(model)
+        for ticket in admitted:
+            ticket._wake()
+
+    def running(self, model: Optional[str] = None) -> int:
+        """Running predictions on `model`, or on all models."""
+        with self._lock:
+            if model is not None:
+                return self._running.get(model, 0)
+            return sum(self._running.values())
+
+    def queued(self, model: Optional[str] = None) -> int:
+        """Queued predictions for `model`, or for all models."""
+        with self._lock:
+            if model is not None:
+                return len(self._queues.get(model, []))
+            return sum(len(queue) for queue in self._queues.values())
+
+    def __stats(self, priority: Priority) -> _PriorityStats:
+        stats = self._stats.get(priority)
+        if stats is None:
+            stats = self._stats[priority] = _PriorityStats()
+        return stats
+
+    def __mark_admitted(self, ticket: SchedulerTicket):
+        ticket.state = "admitted"
+        ticket.queue_time = time.monotonic() - ticket.queued_at
+        self._running[ticket.model] = self._running.get(ticket.model, 0) + 1
+        ticket.concurrency = self._running[ticket.model]
+        stats = self.__stats(ticket.priority)
+        stats.admitted += 1
+        stats.total_queue_time += ticket.queue_time
+        stats.max_queue_time = max(stats.max_queue_time, ticket.queue_time)
+        self._on_admitted(ticket)
+
+    def _on_queued(self, ticket: SchedulerTicket):
+        """Called with the lock held as a request is queued.
+
+        A hook for subclasses, e.g. to set the ticket's place in line.
+        """
+        pass
+
+    def _can_admit(self, ticket: SchedulerTicket) -> bool:
+        """Whether a request may be admitted once there is room.
+
+        Called with the lock held. Requests it holds back keep their
+        place in line; call `_readmit` once they may go.
+        """
+        return True
+
+    def _on_admitted(self, ticket: SchedulerTicket):
+        """Called with the lock held as a request is admitted."""
+        pass
+
+    def _admit_queued(self, model: str) -> List[SchedulerTicket]:
+        """Admit what fits under the model's limit. Call with the lock."""
+        queue = self._queues.get(model, [])
+        admitted = []
+        held_back = []
+        while queue and self._running.get(model, 0) < self.limit(model):
+            ticket = heapq.heappop(queue)
+            if not self._can_admit(ticket):
+                held_back.append(ticket)
+                continue
+            self.__stats(ticket.priority).queued -= 1
+            self.__mark_admitted(ticket)
+            admitted.append(ticket)
+        for ticket in held_back:
+            heapq.heappush(queue, ticket)
+        return admitted
+
+    def _readmit(self, model: str):
+        """Admit what can go for `model`, e.g. once a budget refilled."""
+        with self._lock:
+            admitted = self._admit_queued(model)
+        for ticket in admitted:
+            ticket._wake()
+
+    def submit(
+        self,
+        model: str,
+        priority: Priority = "default",
+        future: Optional[asyncio.Future] = None,
+        tenant: Optional[str] = None,
+    ) -> SchedulerTicket:
+        """Queue a request without waiting for it to be admitted.
+
+        Most code should let the `schedule` prediction option call
+        this, or use `acquire`/`acquire_async`.
+
+        Args:
+            model: The model the request is for.
+            priority: A name from `PRIORITY_CLASSES` or a rank.
+            future: Resolved when the request is admitted or cancelled.
+            tenant: Who the request is on behalf of, if anyone.
+
+        Returns:
+            The request's ticket. Release it with `release` once the
+            request is done.
+        """
+        ticket = SchedulerTicket(
+            model,
+            priority,
+            self._rank(priority),
+            next(self._seq),
+            future,
+            tenant,
+        )
+        with self._lock:
+            queue = self._queues.setdefault(model, [])
+            self._on_queued(ticket)
+            heapq.heappush(queue, ticket)
+            self.__stats(priority).queued += 1
+            admitted = self._admit_queued(model)
+        for other in admitted:
+            other._wake()
+        if ticket.state == "queued":
+            logger.debug(
+                "Queued %s request for %s behind %d running.",
+                priority,
+                model,
+                self.running(model),
+            )
+        return ticket
+
+    def _observe(self, ticket: SchedulerTicket, outcome: Any):
+        """Learn from a released request. Called with the lock held.
+
+        A hook for subclasses, e.g. to adapt limits as
+        `AdaptiveConcurrencyLimiter` does.
+
+        Args:
+            ticket: The request's ticket, with its timings.
+            outcome: As passed to `release`.
+        """
+        pass
+
+    def release(self, ticket: SchedulerTicket, outcome: Any = None):
+        """Free an admitted request's slot for the next one.
+
+        Releasing a ticket twice, or one that never got admitted, is
+        a no-op apart from cancelling it if still queued.
+
+        Args:
+            ticket: The ticket to release.
+            outcome: The `LLMPredictionStats` of the finished prediction,
+                the exception it failed with, or None if it was never
+                sent or has no stats (e.g. an embedding). Cancellation
+                counts as never sent.
+        """
+        if isinstance(outcome, BaseException) and not isinstance(
+            outcome, Exception
+        ):
+            outcome = None
+        if ticket.state == "queued":
+            self.cancel(ticket)
+            return
+        with self._lock:
+            if ticket.state != "admitted":
+                return
+            ticket.state = "released"
+            self._running[ticket.model] -= 1
+            self._observe(ticket, outcome)
+            admitted = self._admit_queued(ticket.model)
+        for other in admitted:
+            other._wake()
+
+    def cancel(self, ticket: SchedulerTicket) -> bool:
+        """Cancel a queued request.
+
+        Returns:
+            Whether it was still queued, and so got cancelled.
+        """
+        with self._lock:
+            if ticket.state != "queued":
+                return False
+            queue = self._queues[ticket.model]
+            queue.remove(ticket)
+            heapq.heapify(queue)
+            ticket.state = "cancelled"
+            ticket.queue_time = time.monotonic() - ticket.queued_at
+            stats = self.__stats(ticket.priority)
+            stats.queued -= 1
+            stats.cancelled += 1
+        logger.debug("Cancelled queued request for %s.", ticket.model)
+        ticket._wake()
+        return True
+
+    def cancel_queued(
+        self,
+        model: Optional[str] = None,
+        priority: Optional[Priority] = None,
+    ) -> int:
+        """Cancel every queued request, or those for a model or priority.
+
+        Returns:
+            How many requests were cancelled.
+        """
+        with self._lock:
+            tickets = [
+                ticket
+                for queue_model, queue in self._queues.items()
+                if model is None or queue_model == model
+                for ticket in queue
+                if priority is None or ticket.priority == priority
+            ]
+        return sum(self.cancel(ticket) for ticket in tickets)
+
+    def acquire(
+        self,
+        model: str,
+        priority: Priority = "default",
+        signal: Optional[SyncAbortSignal] = None,
+        tenant: Optional[str] = None,
+    ) -> SchedulerTicket:
+        """Wait until a request for `model` is admitted.
+
+        Args:
+            model: The model the request is for.
+            priority: A name from `PRIORITY_CLASSES` or a rank.
+            signal: Aborting it cancels the request while queued.
+            tenant: Who the request is on behalf of, if anyone.
+
+        Returns:
+            The admitted ticket, to pass to `release`.
+
+        Raises:
+            QueueCancelledError: if it was cancelled while queued.
+        """
+        ticket = self.submit(model, priority, tenant=tenant)
+        listener = lambda: self.cancel(ticket)  # noqa: E731
+        if signal is not None:
+            if signal.aborted:
+                self.cancel(ticket)
+            signal.add_listener(listener)
+        try:
+            ticket._event.wait()
+        finally:
+            if signal is not None:
+                signal.remove_listener(listener)
+        if ticket.state != "admitted":
+            raise QueueCancelledError(
+                "Request for %s cancelled while queued." % model
+            )
+        return ticket
+
+    async def acquire_async(
+        self,
+        model: str,
+        priority: Priority = "default",
+        signal: Optional[AsyncAbortSignal] = None,
+        tenant: Optional[str] = None,
+    ) -> SchedulerTicket:
+        """Wait until a request for `model` is admitted.
+
+        Cancelling the awaiting task cancels the request while queued.
+        See `acquire`.
+        """
+        future = asyncio.get_running_loop().create_future()
+        ticket = self.submit(model, priority, future, tenant)
+
+        async def listener():
+            self.cancel(ticket)
+
+        if signal is not None:
+            # listeners added to an aborted signal are not awaited
+            if signal.aborted:
+                self.cancel(ticket)
+            else:
+                signal.add_listener(listener)
+        try:
+            if ticket.state == "queued":
+                await future
+        except asyncio.CancelledError:
+            # admitted just as we were cancelled
+            self.release(ticket)
+            raise
+        finally:
+            if signal is not None:
+                signal.remove_listener(listener)
+        if ticket.state != "admitted":
+            raise QueueCancelledError(
+                "Request for %s cancelled while queued." % model
+            )
+        return ticket
+
+    def stats(self) -> Dict[Priority, Dict[str, float]]:
+        """Get queue-time metrics for each priority.
+
+        Returns:
+            For each priority seen: how many requests are `queued`,
+            how many were `admitted` and `cancelled`, and their
+            `mean_queue_time` and `max_queue_time` in seconds.
+        """
+        with self._lock:
+            return {
+                priority: stats.to_dict()
+                for priority, stats in self._stats.items()
+            }
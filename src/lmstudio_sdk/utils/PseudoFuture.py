@@ -18,9 +18,19 @@ class PseudoFuture(threading.Event):
         self._exception = exception
         self.set()
 
-    def result(self):
-        """Return the result of the future, or raise the exception."""
-        self.wait()
+    def done(self):
+        """Return True if the result or exception has been set."""
+        return self.is_set()
+
+    def result(self, timeout=None):
+        """Return the result of the future, or raise the exception.
+
+        Raises:
+            TimeoutError: If the result is not set within `timeout`
+                seconds (if given).
+        """
+        if not self.wait(timeout):
+            raise TimeoutError("Future did not complete in time.")
         if hasattr(self, "_exception"):
             raise self._exception
         return self._result
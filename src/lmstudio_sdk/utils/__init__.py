@@ -4,43 +4,114 @@
 """Utility functions/classes and ported TypeScript classes.
 
 Classes:
+    AdaptiveConcurrencyLimiter: A `PredictionScheduler` that finds each model's best concurrency.
+    AhoCorasick: Finds any of many strings in text that arrives in pieces.
     AsyncAbortSignal: An asynchronous signal that can be used to abort an operation.
     SyncAbortSignal:A synchronous signal that can be used to abort an operation.
     ChannelError: An error that occurs during a channel operation.
+    ChannelTimeoutError: The server went quiet on a channel for too long.
+    ConnectionLostError: The connection dropped before a call or channel finished.
+    EarlyStopMatcher: Checks generated text against `EarlyStopOpts` as it streams.
+    FairScheduler: A `PredictionScheduler` that shares capacity fairly among tenants.
+    JSONCodec: Encodes and decodes the JSON packets sent over the wire.
+    JSONSchemaError: Streamed JSON does not match its schema.
+    JSONStreamError: Streamed JSON is malformed, or ended before it was complete.
+    JSONStreamParser: An incremental parser for JSON arriving in fragments.
+    PredictionCache: An LRU cache of deterministic prediction results.
+    PredictionScheduler: Admits predictions per model by priority, up to a concurrency cap.
+    QueueCancelledError: A queued request was cancelled before it was dispatched.
     RPCError: An error that occurs during an RPC call.
+    RPCTimeoutError: An RPC call did not get a response in time.
+
+Discovery:
+    BASE_URL_ENV_VAR: Environment variable that sets the base URL.
+    cache_base_url: Remember a discovered base URL for later processes.
+    clear_cached_base_url: Forget the cached base URL.
+    get_cached_base_url: Get the base URL discovered by a previous process.
+    is_lmstudio_greeting: Check whether a greeting response body is from LM Studio.
+    parse_greeting_response: Check whether a raw HTTP greeting response is from LM Studio.
 
 Logging:
     get_logger: A function to get a logger for the SDK.
+    LazyFormat: Defers formatting of a log argument until it is emitted.
     RECV: Debug level for sent and received packets from the LM Studio server.
     SEND: Debug level for sent packets to the LM Studio server
     WEBSOCKET: Debug level for WebSocket connection events.
 """
 
 from .AbortSignal import AsyncAbortSignal, SyncAbortSignal
+from .AdaptiveConcurrencyLimiter import AdaptiveConcurrencyLimiter
 from .BufferedEvent import (
     AsyncBufferedEvent,
     SyncBufferedEvent,
 )
-from .logger import get_logger, RECV, SEND, WEBSOCKET
+from .discovery import (
+    BASE_URL_ENV_VAR,
+    cache_base_url,
+    clear_cached_base_url,
+    get_cached_base_url,
+    GREETING_PATH,
+    is_lmstudio_greeting,
+    parse_greeting_response,
+)
+from .EarlyStopMatcher import AhoCorasick, EarlyStopMatcher
+from .FairScheduler import FairScheduler
+from .JSONCodec import get_json_codec, JSONCodec
+from .JSONStreamParser import JSONStreamParser
+from .logger import (
+    get_logger,
+    lazy_pretty_print,
+    LazyFormat,
+    RECV,
+    SEND,
+    WEBSOCKET,
+)
+from .PredictionCache import PredictionCache
+from .PredictionScheduler import (
+    PredictionScheduler,
+    PRIORITY_CLASSES,
+    SchedulerTicket,
+)
 from .PseudoFuture import PseudoFuture
 from .utils import (
     _assert,
+    channel_error,
     ChannelError,
+    ChannelTimeoutError,
+    ConnectionLostError,
     generate_random_base64,
+    JSONSchemaError,
+    JSONStreamError,
     lms_default_ports,
     LiteralOrCoroutine,
     number_to_checkbox_numeric,
     pretty_print,
     pretty_print_error,
+    QueueCancelledError,
     RPCError,
+    RPCTimeoutError,
 )
 
 __all__ = [
+    "AdaptiveConcurrencyLimiter",
     "AsyncAbortSignal",
     "ChannelError",
+    "ChannelTimeoutError",
+    "ConnectionLostError",
+    "FairScheduler",
+    "get_json_codec",
     "get_logger",
+    "JSONCodec",
+    "JSONSchemaError",
+    "JSONStreamError",
+    "JSONStreamParser",
+    "PredictionCache",
+    "PredictionScheduler",
+    "PRIORITY_CLASSES",
+    "QueueCancelledError",
     "RECV",
     "RPCError",
+    "RPCTimeoutError",
     "SEND",
     "SyncAbortSignal",
     "WEBSOCKET",
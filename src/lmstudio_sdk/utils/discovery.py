@@ -0,0 +1,96 @@
+import json
+import os
+from typing import Optional
+
+
+BASE_URL_ENV_VAR = "LMSTUDIO_BASE_URL"
+"""Environment variable that sets the base URL, skipping discovery."""
+
+CACHE_DIR_ENV_VAR = "LMSTUDIO_SDK_CACHE_DIR"
+"""Environment variable overriding where the discovered URL is cached."""
+
+GREETING_PATH = "/lmstudio-greeting"
+"""HTTP path an LM Studio server answers with `{"lmstudio": true}`."""
+
+
+def _cache_path() -> str:
+    cache_dir = os.environ.get(CACHE_DIR_ENV_VAR)
+    if not cache_dir:
+        cache_dir = os.path.join(
+            os.environ.get("XDG_CACHE_HOME")
+            or os.path.join(os.path.expanduser("~"), ".cache"),
+            "lmstudio_sdk",
+        )
+    return os.path.join(cache_dir, "base_url")
+
+
+def is_lmstudio_greeting(body: bytes) -> bool:
+    """Check whether a greeting response body is from LM Studio."""
+    try:
+        return bool(json.loads(body.decode("utf-8")).get("lmstudio", False))
+    except (ValueError, AttributeError):
+        return False
+
+
+def parse_greeting_response(response: bytes) -> bool:
+    """Check whether a raw HTTP greeting response is from LM Studio.
+
+    Args:
+        response: The full response to a `GET` of `GREETING_PATH`
+            sent with `Connection: close`, i.e. read until EOF.
+    """
+    head, _, body = response.partition(b"\r\n\r\n")
+    lines = head.split(b"\r\n")
+    status = lines[0].split(b" ")
+    if len(status) < 2 or status[1] != b"200":
+        return False
+    headers = {
+        name.strip().lower(): value.strip().lower()
+        for name, _, value in (line.partition(b":") for line in lines[1:])
+    }
+    if headers.get(b"transfer-encoding") == b"chunked":
+        chunks = []
+        while body:
+            size, _, body = body.partition(b"\r\n")
+            try:
+                size = int(size.split(b";")[0], 16)
+            except ValueError:
+                return False
+            if size == 0:
+                break
+            chunks.append(body[:size])
+            body = body[size + 2 :]
+        body = b"".join(chunks)
+    return is_lmstudio_greeting(body)
+
+
+def get_cached_base_url() -> Optional[str]:
+    """Get the base URL discovered by a previous process, if any."""
+    try:
+        with open(_cache_path(), encoding="utf-8") as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+
+def cache_base_url(base_url: str):
+    """Remember a discovered base URL for later processes.
+
+    Failing to write the cache is not an error: discovery just
+    runs again next time.
+    """
+    path = _cache_path()
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(base_url)
+    except OSError:
+        pass
+
+
+def clear_cached_base_url():
+    """Forget the cached base URL, e.g. once it stopped working."""
+    try:
+        os.remove(_cache_path())
+    except OSError:
+        pass
@@ -1,5 +1,7 @@
 import logging
 
+from .utils import pretty_print
+
 
 RECV = 5
 """Debug level for sent and received packets from the LM Studio server."""
@@ -30,6 +32,33 @@ def websocket(self, message, *args, **kws):
         self._log(WEBSOCKET, message, args, **kws)
 
 
+class LazyFormat:
+    """Defers formatting of a log argument until the record is emitted.
+
+    Arguments to logging calls are evaluated eagerly, even when the
+    level is disabled. Wrapping an expensive formatter in this class
+    means it only runs if a handler actually formats the message:
+
+    ```python
+    logger.recv("Received:\n%s", LazyFormat(pretty_print, data))
+    ```
+    """
+
+    __slots__ = ("_func", "_args")
+
+    def __init__(self, func, *args):
+        self._func = func
+        self._args = args
+
+    def __str__(self):
+        return str(self._func(*self._args))
+
+
+def lazy_pretty_print(obj) -> LazyFormat:
+    """Pretty print the object, but only when it is logged."""
+    return LazyFormat(pretty_print, obj)
+
+
 logging.Logger.recv = recv
 logging.Logger.send = send
 logging.Logger.websocket = websocket
@@ -12,7 +12,6 @@ def generate_random_base64(byte_length: int) -> str:
 
 
 def number_to_checkbox_numeric(
-    self,
     value: Optional[float],
     unchecked_value: float,
     value_when_unchecked: float,
@@ -58,5 +57,47 @@ class ChannelError(Exception):
     pass
 
 
+class RPCTimeoutError(RPCError, TimeoutError):
+    """An RPC call did not get a response in time."""
+    pass
+
+
+class ChannelTimeoutError(ChannelError, TimeoutError):
+    """The server went quiet on a channel for too long."""
+    pass
+
+
+class ConnectionLostError(ChannelError, RPCError, ConnectionError):
+    """The connection dropped before a call or channel finished."""
+    pass
+
+
+class QueueCancelledError(Exception):
+    """A queued request was cancelled before it was dispatched."""
+    pass
+
+
+class JSONStreamError(ValueError):
+    """Streamed JSON is malformed, or ended before it was complete."""
+    pass
+
+
+class JSONSchemaError(JSONStreamError):
+    """Streamed JSON does not match its schema."""
+    pass
+
+
+def channel_error(message: dict) -> ChannelError:
+    """Get the error to raise for a `channelError` packet.
+
+    Packets raised on the client side (e.g. for timeouts) carry their
+    own exception, which is returned as is.
+    """
+    exception = message.get("exception")
+    if isinstance(exception, ChannelError):
+        return exception
+    return ChannelError((message.get("error") or {}).get("title"))
+
+
 T = TypeVar("T")
 LiteralOrCoroutine = Union[T, Coroutine[Any, Any, T]]
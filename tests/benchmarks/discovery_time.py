@@ -0,0 +1,90 @@
+"""Time to find the server without a base URL.
+
+Probes localhost ports where one is a local mock server, a few accept
+connections but never answer, as a busy unrelated service might, and
+the rest are closed. Probes one port after another as the sync client
+used to, then concurrently with the sync and async clients, and finally
+with the discovered URL cached, which skips probing.
+
+Usage: python tests/benchmarks/discovery_time.py [num_ports] [runs]
+"""
+
+import asyncio
+import os
+import socket
+import sys
+import tempfile
+import time
+
+import lmstudio_sdk.utils as utils
+from lmstudio_sdk import AsyncLMStudioClient, SyncLMStudioClient
+from lmstudio_sdk.mock import MockLMStudioServer
+
+
+def sequential_guess(client: SyncLMStudioClient) -> str:
+    """`_guess_base_url` as it was before probes ran concurrently."""
+    for port in client._discovery_ports():
+        try:
+            client._is_localhost_with_given_port_lmstudio_server(port)
+            return f"ws://127.0.0.1:{port}"
+        except ValueError:
+            continue
+    raise ValueError("No server found.")
+
+
+def measure(guess, runs) -> float:
+    begin = time.perf_counter()
+    for _ in range(runs):
+        utils.clear_cached_base_url()
+        guess()
+    return (time.perf_counter() - begin) / runs
+
+
+def black_hole() -> socket.socket:
+    """A port that completes the TCP handshake but never responds."""
+    sock = socket.socket()
+    sock.bind(("127.0.0.1", 0))
+    sock.listen(16)
+    return sock
+
+
+def main(num_ports: int = 20, runs: int = 3, num_silent: int = 3):
+    os.environ[utils.discovery.CACHE_DIR_ENV_VAR] = tempfile.mkdtemp()
+    silent = [black_hole() for _ in range(num_silent)]
+    server = MockLMStudioServer()
+    server.start()
+    # the server's port is the last one probed
+    ports = [sock.getsockname()[1] for sock in silent]
+    ports += range(server.port - num_ports + len(ports) + 1, server.port)
+    discovery = {"ports": ports + [server.port], "timeout": 0.5}
+
+    sync_client = SyncLMStudioClient(None, None, None, discovery=discovery)
+    async_client = AsyncLMStudioClient(None, None, None, discovery=discovery)
+    try:
+        sequential = measure(lambda: sequential_guess(sync_client), runs)
+        concurrent = measure(sync_client._guess_base_url, runs)
+        concurrent_async = measure(
+            lambda: asyncio.run(async_client._guess_base_url()), runs
+        )
+        utils.cache_base_url(server.base_url)
+        begin = time.perf_counter()
+        for _ in range(runs):
+            sync_client._get_cached_base_url()
+        cached = (time.perf_counter() - begin) / runs
+    finally:
+        server.stop()
+        for sock in silent:
+            sock.close()
+
+    print(
+        f"discovery over {num_ports} ports, {num_silent} silent, "
+        f"0.5 s timeout, {runs} runs"
+    )
+    print(f"sequential:       {sequential * 1000:7.2f} ms")
+    print(f"concurrent sync:  {concurrent * 1000:7.2f} ms")
+    print(f"concurrent async: {concurrent_async * 1000:7.2f} ms")
+    print(f"cached:           {cached * 1000:7.2f} ms")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,96 @@
+"""Receive throughput of concurrent predictions by connection pool size.
+
+Streams many predictions at once from a local mock server, running in
+its own process, through clients with 1, 2 and 4 connections to the
+llm endpoint, and reports fragments received per second.
+
+Usage: python tests/benchmarks/pool_throughput.py [predictions] [fragments]
+"""
+
+import asyncio
+import multiprocessing
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lmstudio_sdk import LMStudioClient
+from lmstudio_sdk.mock import MockLMStudioServer
+
+
+POOL_SIZES = [1, 2, 4]
+
+
+def serve(num_fragments, urls):
+    async def run():
+        async with MockLMStudioServer(num_fragments=num_fragments) as server:
+            urls.put(server.base_url)
+            await asyncio.Future()
+
+    asyncio.run(run())
+
+
+def stream(model) -> int:
+    return sum(1 for _ in model.complete("Hello"))
+
+
+def run_sync(base_url, pool_size, num_predictions) -> float:
+    client = LMStudioClient(base_url=base_url, pool_size=pool_size)
+    try:
+        model = client.llm.create_dynamic_handle("mock-model")
+        begin = time.perf_counter()
+        with ThreadPoolExecutor(num_predictions) as pool:
+            received = sum(
+                pool.map(lambda _: stream(model), range(num_predictions))
+            )
+        return received / (time.perf_counter() - begin)
+    finally:
+        client.close()
+
+
+async def run_async(base_url, pool_size, num_predictions) -> float:
+    client = await LMStudioClient(base_url=base_url, pool_size=pool_size)
+    try:
+        model = client.llm.create_dynamic_handle("mock-model")
+
+        async def stream_async():
+            return sum([1 async for _ in await model.complete("Hello")])
+
+        begin = time.perf_counter()
+        received = sum(
+            await asyncio.gather(
+                *[stream_async() for _ in range(num_predictions)]
+            )
+        )
+        return received / (time.perf_counter() - begin)
+    finally:
+        await client.close()
+
+
+def main(num_predictions: int = 16, num_fragments: int = 2000):
+    urls = multiprocessing.Queue()
+    server = multiprocessing.Process(
+        target=serve, args=(num_fragments, urls), daemon=True
+    )
+    server.start()
+    base_url = urls.get()
+
+    try:
+        print(
+            f"{num_predictions} concurrent predictions "
+            f"of {num_fragments} fragments"
+        )
+        for pool_size in POOL_SIZES:
+            sync = run_sync(base_url, pool_size, num_predictions)
+            async_ = asyncio.run(
+                run_async(base_url, pool_size, num_predictions)
+            )
+            print(
+                f"pool_size={pool_size}: sync {sync:9.0f} fragments/s, "
+                f"async {async_:9.0f} fragments/s"
+            )
+    finally:
+        server.terminate()
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
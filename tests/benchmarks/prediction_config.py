@@ -0,0 +1,65 @@
+"""Payload size and per-call cost of building prediction config stacks.
+
+Runs many `complete()` calls against a port that captures the outgoing
+`channelCreate` payload instead of sending it, so no server is needed.
+Both the payload size and the time per call should stay flat.
+
+Usage: python tests/benchmarks/prediction_config.py [num_predictions]
+"""
+
+import json
+import sys
+import time
+
+from lmstudio_sdk import CompiledPredictionConfig, LLMDynamicHandle
+from lmstudio_sdk.backend.communications import SyncClientPort
+
+
+class CapturePort(SyncClientPort):
+    """A sync port that records payload sizes instead of sending them."""
+
+    def __init__(self):
+        super().__init__("ws://127.0.0.1:0", "llm", "bench", "bench")
+        self._websocket = object()
+        self.payload_sizes = []
+
+    def _send_payload(self, payload, extra=None, postprocess=None):
+        # the channel ID grows over time, so only size the parameter
+        self.payload_sizes.append(
+            len(json.dumps(payload["creationParameter"]))
+        )
+        # nothing will ever close these channels
+        self.channel_handlers.clear()
+        if postprocess:
+            return postprocess(extra)
+        return extra
+
+
+def main(num_predictions: int = 100_000, windows: int = 10):
+    port = CapturePort()
+    handle = LLMDynamicHandle(
+        port, {"type": "query", "query": {"identifier": "bench"}}
+    )
+    config = CompiledPredictionConfig(
+        {"temperature": 0.2, "max_predicted_tokens": 64}
+    )
+
+    window = max(num_predictions // windows, 1)
+    print(f"{'calls':>10} {'us/call':>10} {'param bytes':>14}")
+    for start in range(0, num_predictions, window):
+        begin = time.perf_counter()
+        for _ in range(window):
+            handle.complete("Hello", config)
+        elapsed = time.perf_counter() - begin
+        print(
+            f"{start + window:>10} {elapsed / window * 1e6:>10.2f} "
+            f"{port.payload_sizes[-1]:>14}"
+        )
+
+    assert port.payload_sizes[0] == port.payload_sizes[-1], (
+        "payload size grew between the first and last prediction"
+    )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,108 @@
+"""Recovery time of RPCs in flight when the server restarts.
+
+Sends a batch of `tokenize`/`getModelInfo`/`embedString` calls against
+a local mock server, restarts the server while they are in flight,
+and measures how long the calls take to complete over the restored
+connection, for the sync and async clients. A non-idempotent
+`unloadModel` call in flight at the same time should fail fast with
+`ConnectionLostError` instead.
+
+Usage: python tests/benchmarks/reconnect_recovery.py [num_calls] [downtime_ms]
+"""
+
+import asyncio
+import logging
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from lmstudio_sdk import ConnectionLostError, LMStudioClient
+from lmstudio_sdk.mock import MockLMStudioServer
+
+
+RECONNECT = {"initial_delay": 0.01, "max_delay": 0.5, "max_attempts": 20}
+
+
+def issue_call(model, embedding_model, i):
+    kind = i % 3
+    if kind == 0:
+        return model.unstable_tokenize("Hello, world!")
+    if kind == 1:
+        return model.get_model_info()
+    return embedding_model.embed_string("Hello, world!")
+
+
+async def run_async(server, num_calls, downtime):
+    client = await LMStudioClient(
+        base_url=server.base_url, reconnect=RECONNECT
+    )
+    try:
+        model = client.llm.create_dynamic_handle("mock-model")
+        embedding_model = client.embedding.create_dynamic_handle(
+            "mock-embedding"
+        )
+        calls = [
+            issue_call(model, embedding_model, i) for i in range(num_calls)
+        ]
+        unload = client.llm.unload("mock-model")
+        await asyncio.sleep(server.rpc_latency / 2)
+
+        begin = time.perf_counter()
+        await server.restart(downtime)
+        try:
+            await unload
+            unload_failed = False
+        except ConnectionLostError:
+            unload_failed = True
+        await asyncio.gather(*calls)
+        return time.perf_counter() - begin, unload_failed
+    finally:
+        await client.close()
+
+
+def run_sync(server, num_calls, downtime):
+    client = LMStudioClient(base_url=server.base_url, reconnect=RECONNECT)
+    try:
+        model = client.llm.create_dynamic_handle("mock-model")
+        embedding_model = client.embedding.create_dynamic_handle(
+            "mock-embedding"
+        )
+        with ThreadPoolExecutor(num_calls + 1) as pool:
+            calls = [
+                pool.submit(issue_call, model, embedding_model, i)
+                for i in range(num_calls)
+            ]
+            unload = pool.submit(client.llm.unload, "mock-model")
+            time.sleep(server.rpc_latency / 2)
+
+            begin = time.perf_counter()
+            server.run(server.restart(downtime))
+            unload_failed = isinstance(unload.exception(), ConnectionLostError)
+            for call in calls:
+                call.result()
+            return time.perf_counter() - begin, unload_failed
+    finally:
+        client.close()
+
+
+def main(num_calls: int = 30, downtime_ms: float = 200.0):
+    downtime = downtime_ms / 1000
+    # reconnect attempts log every refused connection
+    logging.getLogger("lmstudio_sdk").setLevel(logging.CRITICAL)
+    with MockLMStudioServer(rpc_latency=0.1) as server:
+        results = {
+            "async": server.run(run_async(server, num_calls, downtime)),
+            "sync": run_sync(server, num_calls, downtime),
+        }
+
+    print(f"{num_calls} calls in flight, server down for {downtime_ms} ms")
+    for name, (recovery, unload_failed) in results.items():
+        print(
+            f"{name:5}: recovered in {recovery * 1000:7.1f} ms, "
+            f"unloadModel failed fast: {unload_failed}"
+        )
+
+
+if __name__ == "__main__":
+    parsers = [int, float]
+    main(*(p(a) for p, a in zip(parsers, sys.argv[1:])))
@@ -0,0 +1,61 @@
+"""Sequential vs pipelined async RPCs on a single socket.
+
+Issues `tokenize`/`getModelInfo`/`embedString` calls against a local
+mock server with a fixed per-call latency, first awaiting each call
+before sending the next, then sending all of them back-to-back and
+gathering the futures.
+
+Usage: python tests/benchmarks/rpc_pipelining.py [num_calls] [latency_ms]
+"""
+
+import asyncio
+import sys
+import time
+
+from lmstudio_sdk import LMStudioClient
+from lmstudio_sdk.mock import MockLMStudioServer
+
+
+def issue_call(model, embedding_model, i):
+    kind = i % 3
+    if kind == 0:
+        return model.unstable_tokenize("Hello, world!")
+    if kind == 1:
+        return model.get_model_info()
+    return embedding_model.embed_string("Hello, world!")
+
+
+async def main(num_calls: int = 300, latency_ms: float = 5.0):
+    async with MockLMStudioServer(rpc_latency=latency_ms / 1000) as server:
+        client = await LMStudioClient(base_url=server.base_url)
+        try:
+            model = client.llm.create_dynamic_handle("mock-model")
+            embedding_model = client.embedding.create_dynamic_handle(
+                "mock-embedding"
+            )
+
+            begin = time.perf_counter()
+            for i in range(num_calls):
+                await issue_call(model, embedding_model, i)
+            sequential = time.perf_counter() - begin
+
+            begin = time.perf_counter()
+            await asyncio.gather(
+                *[
+                    issue_call(model, embedding_model, i)
+                    for i in range(num_calls)
+                ]
+            )
+            pipelined = time.perf_counter() - begin
+        finally:
+            await client.close()
+
+    print(f"{num_calls} calls, {latency_ms} ms server latency per call")
+    print(f"sequential: {sequential * 1000:9.1f} ms")
+    print(f"pipelined:  {pipelined * 1000:9.1f} ms")
+    print(f"speedup:    {sequential / pipelined:9.1f}x")
+
+
+if __name__ == "__main__":
+    parsers = [int, float]
+    asyncio.run(main(*(p(a) for p, a in zip(parsers, sys.argv[1:]))))
@@ -0,0 +1,59 @@
+"""Cold start time of the sync client.
+
+Connects a `SyncLMStudioClient` to a local mock server whose opening
+handshake takes a fixed time, connecting the four ports one after
+another as `connect()` used to, then concurrently as it does now, then
+lazily, where only the port used by the first call connects.
+
+Usage: python tests/benchmarks/startup_time.py [handshake_ms] [runs]
+"""
+
+import sys
+import time
+
+from lmstudio_sdk import SyncLMStudioClient
+from lmstudio_sdk.mock import MockLMStudioServer
+
+
+def sequential_connect(client: SyncLMStudioClient):
+    """`connect()` as it was before ports connected concurrently."""
+    client._create_ports(False)
+    client.llm.connect()
+    client.embedding.connect()
+    client.system.connect()
+    client.diagnostics.connect()
+
+
+def first_call(client: SyncLMStudioClient):
+    client.llm.create_dynamic_handle("mock-model").get_model_info()
+
+
+def measure(base_url, connect, runs, **kwargs) -> float:
+    total = 0.0
+    for _ in range(runs):
+        client = SyncLMStudioClient(base_url, None, None, **kwargs)
+        begin = time.perf_counter()
+        connect(client)
+        first_call(client)
+        total += time.perf_counter() - begin
+        client.close()
+    return total / runs
+
+
+def main(handshake_ms: float = 50.0, runs: int = 5):
+    with MockLMStudioServer(handshake_latency=handshake_ms / 1000) as server:
+        sequential = measure(server.base_url, sequential_connect, runs)
+        parallel = measure(server.base_url, lambda c: c.connect(), runs)
+        lazy = measure(
+            server.base_url, lambda c: c.connect(), runs, lazy_connect=True
+        )
+
+    print(f"connect + first call, {handshake_ms} ms handshake, {runs} runs")
+    print(f"sequential: {sequential * 1000:7.1f} ms")
+    print(f"parallel:   {parallel * 1000:7.1f} ms")
+    print(f"lazy:       {lazy * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    parsers = [float, int]
+    main(*(p(a) for p, a in zip(parsers, sys.argv[1:])))
@@ -0,0 +1,66 @@
+"""Per-fragment overhead of wire logging in the receive loop.
+
+Feeds prediction fragment packets through `SyncClientPort.on_message`
+with RECV logging disabled, and compares it against the same loop
+with the packet pretty-printed eagerly, as the ports used to do.
+
+Usage: python tests/benchmarks/wire_logging.py [num_fragments]
+"""
+
+import json
+import logging
+import sys
+import time
+
+import lmstudio_sdk.utils as utils
+from lmstudio_sdk.backend.communications import SyncClientPort
+
+
+logger = utils.get_logger("lmstudio_sdk.bench.wire_logging")
+
+
+def eager_on_message(port: SyncClientPort, message: str):
+    """`on_message` as it was before wire logging became lazy."""
+    data = json.loads(message)
+    logger.recv(
+        "Message received on sync port %s:\n%s",
+        port.endpoint,
+        utils.pretty_print(data),
+    )
+    port._handle_data(data)
+
+
+def run(on_message, port, message, num_fragments) -> float:
+    begin = time.perf_counter()
+    for _ in range(num_fragments):
+        on_message(message)
+    return (time.perf_counter() - begin) / num_fragments
+
+
+def main(num_fragments: int = 200_000):
+    logging.getLogger("lmstudio_sdk").setLevel(logging.INFO)
+    logger.setLevel(logging.INFO)
+
+    port = SyncClientPort("ws://127.0.0.1:0", "llm", "bench", "bench")
+    port.channel_handlers[0] = lambda message: None
+    message = json.dumps(
+        {
+            "type": "channelSend",
+            "channelId": 0,
+            "message": {"type": "fragment", "fragment": " token"},
+        }
+    )
+
+    before = run(
+        lambda m: eager_on_message(port, m), port, message, num_fragments
+    )
+    after = run(
+        lambda m: port.on_message(None, m), port, message, num_fragments
+    )
+    print(f"eager pretty_print: {before * 1e6:8.3f} us/fragment")
+    print(f"lazy wire logging:  {after * 1e6:8.3f} us/fragment")
+    print(f"speedup:            {before / after:8.2f}x")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:]))
@@ -0,0 +1,41 @@
+import unittest
+from lmstudio_sdk import AdaptiveConcurrencyLimiter
+from mock_case import AsyncMockServerMixin
+
+SLOTS = 4
+
+
+class TestAdaptiveConcurrencyLimiter(
+    AsyncMockServerMixin, unittest.IsolatedAsyncioTestCase
+):
+    server_kwargs = None
+
+    async def connect(self, **server_kwargs) -> None:
+        _, _, self.model = await self.start_mock(**server_kwargs)
+
+    async def test_finds_server_slots(self) -> None:
+        await self.connect(
+            num_fragments=10,
+            fragment_rate=200,
+            first_token_latency=0.02,
+            max_parallel=SLOTS,
+        )
+        limiter = AdaptiveConcurrencyLimiter(target_ttft=0.06, max_limit=32)
+        opts = {"schedule": {"scheduler": limiter}}
+        await self.model.complete_many(["Hello"] * 120, opts, concurrency=32)
+        stats = limiter.model_stats()["mock-model"]
+        self.assertGreaterEqual(stats["limit"], SLOTS - 1)
+        self.assertLessEqual(stats["limit"], SLOTS + 2)
+        self.assertGreater(stats["decreases"], 0)
+
+    async def test_backs_off_on_failures(self) -> None:
+        await self.connect(errors={"predict": "boom"})
+        limiter = AdaptiveConcurrencyLimiter(
+            target_ttft=1.0, initial_limit=16, backoff=0.5
+        )
+        opts = {"schedule": {"scheduler": limiter}}
+        results = await self.model.complete_many(
+            ["Hello"] * 40, opts, concurrency=16, return_exceptions=True
+        )
+        self.assertTrue(all(isinstance(r, Exception) for r in results))
+        self.assertEqual(limiter.limit("mock-model"), 1)
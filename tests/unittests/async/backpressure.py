@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+from mock_case import AsyncMockServerMixin
+
+NUM_FRAGMENTS = 200
+MAX_FRAGMENTS = 8
+
+
+class TestBackpressure(AsyncMockServerMixin, unittest.IsolatedAsyncioTestCase):
+    server_kwargs = {"num_fragments": NUM_FRAGMENTS, "fragment_rate": 100000}
+
+    async def stream_slowly(self, policy: str):
+        """Let a prediction outrun its consumer, then stream it."""
+        opts = {
+            "backpressure": {"max_fragments": MAX_FRAGMENTS, "policy": policy}
+        }
+        prediction = await self.model.complete("Hello", opts)
+        await asyncio.sleep(0.2)
+        self.assertLessEqual(prediction.queue.qsize(), MAX_FRAGMENTS + 1)
+        fragments = [fragment async for fragment in prediction]
+        return prediction, fragments
+
+    async def test_pause_delivers_everything(self) -> None:
+        prediction, fragments = await self.stream_slowly("pause")
+        self.assertEqual(len(fragments), NUM_FRAGMENTS)
+        self.assertEqual(prediction.dropped, 0)
+
+    async def test_drop_counts_fragments(self) -> None:
+        prediction, fragments = await self.stream_slowly("drop")
+        self.assertEqual(len(fragments), MAX_FRAGMENTS)
+        self.assertEqual(prediction.dropped, NUM_FRAGMENTS - MAX_FRAGMENTS)
+        result = await prediction
+        self.assertEqual(len(result.content), NUM_FRAGMENTS * len(" token"))
+
+    async def test_result_lifts_the_bound(self) -> None:
+        opts = {"backpressure": {"max_fragments": MAX_FRAGMENTS}}
+        prediction = await self.model.complete("Hello", opts)
+        result = await prediction.result()
+        self.assertEqual(len(result.content), NUM_FRAGMENTS * len(" token"))
+
+    async def test_breaking_early_unpauses_the_port(self) -> None:
+        opts = {"backpressure": {"max_fragments": 4}}
+        prediction = await self.model.complete("Hello", opts)
+        await asyncio.sleep(0.1)
+        async for _ in prediction:
+            break
+        result = await asyncio.wait_for(
+            await self.model.complete("Hello again"), 5
+        )
+        self.assertEqual(len(result.content), NUM_FRAGMENTS * len(" token"))
+
+    async def test_invalid_max_fragments(self) -> None:
+        for backpressure in ({"max_fragments": 0}, {"policy": "pause"}):
+            with self.assertRaises(ValueError):
+                await self.model.complete(
+                    "Hello", {"backpressure": backpressure}
+                )
+        result = await asyncio.wait_for(await self.model.complete("Hello"), 5)
+        self.assertEqual(len(result.content), NUM_FRAGMENTS * len(" token"))
+
+    async def test_pause_coalesced_chunks_flushed_by_timer(self) -> None:
+        _, _, model = await self.start_mock(
+            num_fragments=60, fragment_rate=200
+        )
+        opts = {
+            "coalesce": {"max_latency": 0.001},
+            "backpressure": {"max_fragments": 4},
+        }
+        prediction = await model.complete("Hello", opts)
+        await asyncio.sleep(0.2)
+        self.assertLessEqual(prediction.queue.qsize(), 5)
+        chunks = [chunk async for chunk in prediction]
+        self.assertEqual("".join(chunks), " token" * 60)
@@ -0,0 +1,32 @@
+import unittest
+from mock_case import AsyncMockServerMixin
+
+
+class TestBatchPrediction(
+    AsyncMockServerMixin, unittest.IsolatedAsyncioTestCase
+):
+    server_kwargs = {"num_fragments": 3, "fragment_rate": 300}
+
+    async def test_complete_many(self) -> None:
+        results = await self.model.complete_many(["a"] * 10, concurrency=3)
+        self.assertEqual(len(results), 10)
+        self.assertTrue(all(r.content == " token" * 3 for r in results))
+        self.assertEqual(self.server.counts["channel:predict"], 10)
+
+    async def test_respond_many_as_completed(self) -> None:
+        histories = [[{"role": "user", "content": "a"}]] * 5
+        indices = [
+            index
+            async for index, _ in self.model.respond_many(
+                histories, concurrency=2, as_completed=True
+            )
+        ]
+        self.assertEqual(sorted(indices), list(range(5)))
+
+    async def test_complete_many_return_exceptions(self) -> None:
+        results = await self.model.complete_many(
+            ["a", 1, "b"], return_exceptions=True
+        )
+        self.assertIsInstance(results[1], ValueError)
+        with self.assertRaises(ValueError):
+            await self.model.complete_many(["a", 1, "b"])
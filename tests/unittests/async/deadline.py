@@ -0,0 +1,42 @@
+import time
+import unittest
+from lmstudio_sdk import LMStudioClient
+from mock_case import AsyncMockServerMixin
+
+
+class TestDeadline(AsyncMockServerMixin, unittest.IsolatedAsyncioTestCase):
+    server_kwargs = {"num_fragments": 1000, "fragment_rate": 100}
+
+    async def test_max_wall_time_cancels(self) -> None:
+        start = time.monotonic()
+        prediction = await self.model.complete("Hello", {"max_wall_time": 0.2})
+        result = await prediction
+        self.assertLess(time.monotonic() - start, 1)
+        self.assertEqual(result.stats.stop_reason, "userStopped")
+        self.assertTrue(result.content)
+        self.assertEqual(self.server.counts["cancel"], 1)
+
+    async def test_resolves_locally_without_server(self) -> None:
+        # the mock server only notices cancels between fragments
+        self.server.first_token_latency = 5
+        deadline = time.time() + 0.2
+        prediction = await self.model.complete(
+            "Hello", {"deadline_s": deadline}
+        )
+        result = await prediction
+        self.assertEqual(result.stats.stop_reason, "userStopped")
+        self.assertEqual(result.content, "")
+        self.assertEqual(result.stats.predicted_tokens_count, 0)
+        self.assertIsNone(result.model_info)
+        self.assertEqual(self.client.llm._port.outstanding(), 0)
+
+    async def test_max_wall_time_on_pooled_client(self) -> None:
+        client = await LMStudioClient(
+            base_url=self.server.base_url, pool_size=2
+        )
+        self.addAsyncCleanup(client.close)
+        model = client.llm.create_dynamic_handle("mock-model")
+        prediction = await model.complete("Hello", {"max_wall_time": 0.2})
+        result = await prediction
+        self.assertEqual(result.stats.stop_reason, "userStopped")
+        self.assertTrue(result.content)
@@ -0,0 +1,78 @@
+import asyncio
+import time
+import unittest
+from lmstudio_sdk import FairScheduler
+from mock_case import AsyncMockServerMixin
+
+
+class TestFairScheduler(
+    AsyncMockServerMixin, unittest.IsolatedAsyncioTestCase
+):
+    server_kwargs = {"num_fragments": 5, "fragment_rate": 200}
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.scheduler = FairScheduler(max_concurrency=2)
+
+    async def predict(self, tenant: str, started: list):
+        opts = {"schedule": {"scheduler": self.scheduler, "tenant": tenant}}
+        prediction = await self.model.complete("Hello", opts)
+        started.append(tenant)
+        await prediction
+
+    async def test_noisy_tenant_does_not_starve_others(self) -> None:
+        self.scheduler.set_tenant("pro", weight=2)
+        started = []
+        tasks = [
+            asyncio.ensure_future(self.predict("noisy", started))
+            for _ in range(20)
+        ]
+        await asyncio.sleep(0.01)
+        for tenant in ["pro"] * 4 + ["quiet"] * 2:
+            tasks.append(asyncio.ensure_future(self.predict(tenant, started)))
+        await asyncio.gather(*tasks)
+        # everyone else is served before the noisy tenant's backlog
+        self.assertLess(len(started) - started[::-1].index("pro"), 12)
+        self.assertLess(len(started) - started[::-1].index("quiet"), 12)
+        stats = self.scheduler.tenant_stats()
+        self.assertEqual(stats["noisy"]["completed"], 20)
+        self.assertEqual(stats["pro"]["running"], 0)
+
+    async def test_max_in_flight_per_tenant(self) -> None:
+        self.scheduler.set_limit("mock-model", 8)
+        self.scheduler.set_tenant("noisy", max_in_flight=1)
+        started = []
+        tasks = [
+            asyncio.ensure_future(self.predict("noisy", started))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.scheduler.running("mock-model"), 1)
+        await asyncio.gather(*tasks)
+        self.assertEqual(started, ["noisy"] * 3)
+
+    async def test_rate_budget_applies_to_embeddings(self) -> None:
+        self.scheduler.set_tenant("limited", rate=20, burst=2)
+        model = self.client.embedding.create_dynamic_handle("mock-embedding")
+        schedule = {"scheduler": self.scheduler, "tenant": "limited"}
+        begin = time.monotonic()
+        await asyncio.gather(
+            *[model.embed_string("Hello", schedule) for _ in range(6)]
+        )
+        # two at once, then one per 50 ms
+        self.assertGreaterEqual(time.monotonic() - begin, 0.19)
+        stats = self.scheduler.tenant_stats()["limited"]
+        self.assertEqual(stats["completed"], 6)
+        self.assertEqual(stats["throttled"], 4)
+
+    async def test_max_in_flight_frees_other_models(self) -> None:
+        self.scheduler.set_tenant("capped", max_in_flight=1)
+        self.scheduler.set_tenant("limited", rate=0.5, burst=1)
+        self.scheduler.submit("other-model", tenant="limited")
+        # throttled, so a budget refill is pending for other-model
+        self.scheduler.submit("other-model", tenant="limited")
+        running = self.scheduler.submit("mock-model", tenant="capped")
+        held = self.scheduler.submit("other-model", tenant="capped")
+        self.assertEqual(held.state, "queued")
+        self.scheduler.release(running)
+        self.assertEqual(held.state, "admitted")
@@ -0,0 +1,36 @@
+import asyncio
+import unittest
+from lmstudio_sdk import hedged_complete, hedged_respond
+from mock_case import AsyncMockServerMixin
+
+
+class TestHedging(AsyncMockServerMixin, unittest.IsolatedAsyncioTestCase):
+    server_kwargs = None
+
+    async def asyncSetUp(self) -> None:
+        self.slow, _, slow_model = await self.start_mock(
+            first_token_latency=2, num_fragments=3
+        )
+        _, _, fast_model = await self.start_mock(num_fragments=3)
+        self.handles = [slow_model, fast_model]
+
+    async def test_backup_wins_and_primary_is_cancelled(self) -> None:
+        first_tokens = []
+        prediction = await hedged_respond(
+            self.handles,
+            [{"role": "user", "content": "Hello"}],
+            {"on_first_token": lambda: first_tokens.append(True)},
+            hedge_delay=0.1,
+        )
+        result = await prediction
+        self.assertEqual(result.content, " token" * 3)
+        self.assertEqual(first_tokens, [True])
+        await asyncio.sleep(0.1)
+        self.assertEqual(self.slow.counts["cancel"], 1)
+
+    async def test_fast_primary_is_not_hedged(self) -> None:
+        prediction = await hedged_complete(
+            self.handles[::-1], "Hello", hedge_delay=0.5
+        )
+        await prediction
+        self.assertNotIn("channel:predict", self.slow.counts)
@@ -0,0 +1,33 @@
+from typing import Any, Dict, Optional, Tuple
+from lmstudio_sdk import AsyncLMStudioClient, LMStudioClient
+from lmstudio_sdk.backend.handles import LLMDynamicHandle
+from lmstudio_sdk.mock import MockLMStudioServer
+
+
+class AsyncMockServerMixin:
+    """Runs each test against a mock server and an async client.
+
+    Mix into an `unittest.IsolatedAsyncioTestCase`. Before each test,
+    `server`, `client` and `model` (a handle to "mock-model") are set
+    up with a `MockLMStudioServer(**server_kwargs)`; set `server_kwargs`
+    to None to call `start_mock` from the tests instead.
+    """
+
+    server_kwargs: Optional[Dict[str, Any]] = {}
+
+    async def asyncSetUp(self) -> None:
+        if self.server_kwargs is not None:
+            self.server, self.client, self.model = await self.start_mock(
+                **self.server_kwargs
+            )
+
+    async def start_mock(
+        self, **server_kwargs
+    ) -> Tuple[MockLMStudioServer, AsyncLMStudioClient, LLMDynamicHandle]:
+        """Start a mock server and a client, stopped after the test."""
+        server = MockLMStudioServer(**server_kwargs)
+        await server.start_async()
+        self.addAsyncCleanup(server.stop_async)
+        client = await LMStudioClient(base_url=server.base_url)
+        self.addAsyncCleanup(client.close)
+        return server, client, client.llm.create_dynamic_handle("mock-model")
@@ -0,0 +1,46 @@
+import unittest
+from lmstudio_sdk import ChannelError, LMStudioClient, RPCError
+from lmstudio_sdk.mock import MockLMStudioServer
+
+
+class TestMockServer(unittest.IsolatedAsyncioTestCase):
+    async def test_rpc(self) -> None:
+        async with MockLMStudioServer() as server:
+            client = await LMStudioClient(base_url=server.base_url)
+            model = client.llm.create_dynamic_handle("mock-model")
+            self.assertEqual(await model.unstable_count_tokens("a b c"), 3)
+            self.assertEqual(server.counts["rpc:countTokens"], 1)
+            await client.close()
+
+    async def test_predict(self) -> None:
+        async with MockLMStudioServer(num_fragments=4, fragment="x") as server:
+            client = await LMStudioClient(base_url=server.base_url)
+            model = client.llm.create_dynamic_handle("mock-model")
+            prediction = await model.complete("Hello")
+            fragments = [fragment async for fragment in prediction]
+            self.assertEqual(fragments, ["x"] * 4)
+            result = await prediction
+            self.assertEqual(result.content, "xxxx")
+            self.assertEqual(result.stats.stop_reason, "eosFound")
+            await client.close()
+
+    async def test_load_model(self) -> None:
+        async with MockLMStudioServer() as server:
+            client = await LMStudioClient(base_url=server.base_url)
+            await client.llm.load("mock/other")
+            loaded = await client.llm.list_loaded()
+            self.assertIn("mock/other", [m["path"] for m in loaded])
+            await client.close()
+
+    async def test_injected_errors(self) -> None:
+        async with MockLMStudioServer(
+            errors={"tokenize": "Injected"}, error_after_fragments=2
+        ) as server:
+            client = await LMStudioClient(base_url=server.base_url)
+            model = client.llm.create_dynamic_handle("mock-model")
+            with self.assertRaises(RPCError):
+                await model.unstable_tokenize("Hello")
+            with self.assertRaises(ChannelError):
+                prediction = await model.complete("Hello")
+                await prediction
+            await client.close()
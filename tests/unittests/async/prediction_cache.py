@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+from lmstudio_sdk import CompiledPredictionConfig, PredictionCache
+from mock_case import AsyncMockServerMixin
+
+
+class TestPredictionCache(
+    AsyncMockServerMixin, unittest.IsolatedAsyncioTestCase
+):
+    server_kwargs = {"num_fragments": 3}
+
+    async def test_replays_deterministic_prediction(self) -> None:
+        cache = PredictionCache()
+        opts = {"temperature": 0, "cache": cache}
+        first = await (await self.model.complete("Hello", opts))
+        replay = await self.model.complete("Hello", opts)
+        fragments = [fragment async for fragment in replay]
+        self.assertEqual("".join(fragments), first.content)
+        self.assertEqual((await replay).stats.stop_reason, "eosFound")
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+        self.assertEqual(self.server.counts["channel:predict"], 1)
+
+    async def test_skips_nondeterministic_prediction(self) -> None:
+        cache = PredictionCache()
+        opts = {"temperature": 0.7, "cache": cache}
+        await (await self.model.complete("Hello", opts))
+        await (await self.model.complete("Hello", opts))
+        self.assertEqual(len(cache), 0)
+        self.assertEqual(self.server.counts["channel:predict"], 2)
+
+    async def test_disk_cache_outlives_memory(self) -> None:
+        directory = tempfile.mkdtemp()
+        opts = {"seed": 1, "cache": PredictionCache(directory=directory)}
+        await (await self.model.respond([{"content": "Hello"}], opts))
+        cache = PredictionCache(directory=directory)
+        opts = {"seed": 1, "cache": cache}
+        await (await self.model.respond([{"content": "Hello"}], opts))
+        self.assertEqual(cache.hits, 1)
+        self.assertEqual(self.server.counts["channel:predict"], 1)
+
+    async def test_disk_cache_is_bounded(self) -> None:
+        directory = tempfile.mkdtemp()
+        cache = PredictionCache(max_entries=2, directory=directory)
+        for key in ("a", "b", "c"):
+            cache.put(key, {})
+        self.assertEqual(sorted(os.listdir(directory)), ["b.json", "c.json"])
+        PredictionCache(max_entries=1, directory=directory)
+        self.assertEqual(len(os.listdir(directory)), 1)
+
+    async def test_key_follows_compiled_config(self) -> None:
+        cache = PredictionCache()
+        compiled = CompiledPredictionConfig({"temperature": 0, "cache": cache})
+        await (await self.model.complete("Hello", compiled))
+        await (await self.model.complete("Hello", compiled))
+        opts = {"temperature": 0, "cache": cache}
+        await (await self.model.complete("Hello", opts))
+        await (await self.model.complete("Hello", {**opts, "seed": 2}))
+        self.assertEqual((cache.hits, cache.misses), (2, 2))
+
+    async def test_bypassed_when_output_can_be_cut_short(self) -> None:
+        cache = PredictionCache()
+        opts = {"temperature": 0, "cache": cache}
+        full = await (await self.model.complete("Hello", opts))
+        opts["stop_when"] = {"max_chars": 2}
+        result = await (await self.model.complete("Hello", opts))
+        self.assertLess(len(result.content), len(full.content))
+        self.assertEqual((cache.hits, cache.misses), (0, 1))
+        self.assertEqual(self.server.counts["channel:predict"], 2)
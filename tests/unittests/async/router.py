@@ -0,0 +1,55 @@
+import asyncio
+import unittest
+from lmstudio_sdk import LMStudioClient, LMStudioRouter
+from lmstudio_sdk.mock import MockLMStudioServer
+
+SHARED = {"identifier": "shared-model", "path": "shared/model", "type": "llm"}
+ONLY_B = {"identifier": "b-model", "path": "b/model", "type": "llm"}
+
+
+class TestRouter(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.servers = [
+            MockLMStudioServer(fragment_rate=200, models=[SHARED]),
+            MockLMStudioServer(fragment_rate=200, models=[SHARED, ONLY_B]),
+        ]
+        for server in self.servers:
+            await server.start_async()
+        clients = [
+            await LMStudioClient(
+                base_url=server.base_url,
+                timeout=0.5,
+                reconnect={"max_attempts": 0},
+            )
+            for server in self.servers
+        ]
+        self.router = await LMStudioRouter(
+            clients, health_check_interval=0.1, health_check_timeout=0.5
+        ).connect()
+
+    async def asyncTearDown(self) -> None:
+        await self.router.close()
+        for server in self.servers:
+            await server.stop_async()
+
+    async def test_routes_to_server_with_model(self) -> None:
+        model = self.router.llm.create_dynamic_handle("b-model")
+        for _ in range(3):
+            await (await model.complete("Hello"))
+        self.assertNotIn("channel:predict", self.servers[0].counts)
+        self.assertEqual(self.servers[1].counts["channel:predict"], 3)
+
+    async def test_spreads_over_least_loaded(self) -> None:
+        model = self.router.llm.create_dynamic_handle("shared-model")
+        predictions = [await model.complete("Hello") for _ in range(4)]
+        await asyncio.gather(*predictions)
+        for server in self.servers:
+            self.assertEqual(server.counts["channel:predict"], 2)
+
+    async def test_ejects_unhealthy_server(self) -> None:
+        await self.servers[0].stop_async()
+        await asyncio.sleep(0.5)
+        model = self.router.llm.create_dynamic_handle("shared-model")
+        result = await (await model.complete("Hello"))
+        self.assertEqual(result.stats.stop_reason, "eosFound")
+        self.assertEqual(self.servers[1].counts["channel:predict"], 1)
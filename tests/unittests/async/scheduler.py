@@ -0,0 +1,73 @@
+import asyncio
+import unittest
+from lmstudio_sdk import (
+    AsyncAbortSignal,
+    PredictionScheduler,
+    QueueCancelledError,
+)
+from mock_case import AsyncMockServerMixin
+
+
+class TestPredictionScheduler(
+    AsyncMockServerMixin, unittest.IsolatedAsyncioTestCase
+):
+    server_kwargs = {"num_fragments": 5, "fragment_rate": 200}
+
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.scheduler = PredictionScheduler(max_concurrency=1)
+
+    def opts(self, priority: str, **schedule) -> dict:
+        schedule.update({"scheduler": self.scheduler, "priority": priority})
+        return {"schedule": schedule}
+
+    async def test_interactive_jumps_batch_queue(self) -> None:
+        started = []
+
+        async def run(name: str, priority: str):
+            prediction = await self.model.complete(
+                "Hello", self.opts(priority)
+            )
+            started.append(name)
+            await prediction
+
+        tasks = [
+            asyncio.ensure_future(run(f"batch{i}", "batch")) for i in range(3)
+        ]
+        await asyncio.sleep(0.01)
+        tasks.append(asyncio.ensure_future(run("chat", "interactive")))
+        await asyncio.gather(*tasks)
+        self.assertEqual(started[:2], ["batch0", "chat"])
+        stats = self.scheduler.stats()
+        self.assertEqual(stats["batch"]["admitted"], 3)
+        self.assertEqual(stats["interactive"]["admitted"], 1)
+        self.assertEqual(self.scheduler.running(), 0)
+
+    async def test_caps_running_predictions_per_model(self) -> None:
+        self.scheduler.set_limit("mock-model", 2)
+        tasks = [
+            asyncio.ensure_future(
+                self.model.complete("Hello", self.opts("batch"))
+            )
+            for _ in range(5)
+        ]
+        await asyncio.sleep(0.01)
+        self.assertEqual(self.scheduler.running("mock-model"), 2)
+        self.assertEqual(self.scheduler.queued("mock-model"), 3)
+        for prediction in await asyncio.gather(*tasks):
+            await prediction
+        self.assertEqual(self.server.counts["channel:predict"], 5)
+
+    async def test_cancels_queued_before_dispatch(self) -> None:
+        running = await self.model.complete("Hello", self.opts("batch"))
+        signal = AsyncAbortSignal()
+        queued = asyncio.ensure_future(
+            self.model.complete("Hello", self.opts("batch", signal=signal))
+        )
+        await asyncio.sleep(0.01)
+        await signal.abort()
+        with self.assertRaises(QueueCancelledError):
+            await queued
+        await running
+        self.assertEqual(self.server.counts["channel:predict"], 1)
+        self.assertEqual(self.scheduler.stats()["batch"]["cancelled"], 1)
@@ -0,0 +1,48 @@
+import unittest
+from lmstudio_sdk import ChatSession
+from mock_case import SyncMockServerMixin
+
+
+def text(role: str, content: str) -> dict:
+    return {"role": role, "content": [{"type": "text", "text": content}]}
+
+
+class TestChatSession(SyncMockServerMixin, unittest.TestCase):
+    server_kwargs = {"num_fragments": 3, "fragment_rate": 1000}
+
+    def test_respond_with_session(self) -> None:
+        session = ChatSession("Be brief.")
+        session.append("Hello")
+        result = self.model.respond(session).result()
+        session.append(result)
+        self.assertEqual(
+            session.context(),
+            {
+                "history": [
+                    text("system", "Be brief."),
+                    text("user", "Hello"),
+                    text("assistant", result.content),
+                ]
+            },
+        )
+        results = self.model.respond_many([session, [{"content": "Hi"}]])
+        self.assertEqual(len(results), 2)
+
+    def test_edit_by_index(self) -> None:
+        session = ChatSession(
+            messages=[
+                {"role": "user", "content": "Hi"},
+                {"role": "assistant", "content": "Hello!"},
+                {"role": "user", "content": "Tell me a joke"},
+            ]
+        )
+        taken = session.context()
+        session.edit(-1, "Tell me a story")
+        session.append("Make it short")
+        self.assertEqual(taken["history"][-1], text("user", "Tell me a joke"))
+        self.assertEqual(session[2], text("user", "Tell me a story"))
+        session.truncate(2)
+        del session[0]
+        self.assertEqual(list(session), [text("assistant", "Hello!")])
+        with self.assertRaises(ValueError):
+            session.append("Hi", "narrator")
@@ -0,0 +1,30 @@
+import unittest
+from mock_case import SyncMockServerMixin
+from lmstudio_sdk.utils import AhoCorasick
+
+FRAGMENTS = ["one ", "two ", "thr", "ee ", "four "] * 100
+
+
+class TestEarlyStop(SyncMockServerMixin, unittest.TestCase):
+    server_kwargs = {"fragments": FRAGMENTS, "fragment_rate": 1000}
+
+    def complete(self, stop_when: dict):
+        prediction = self.model.complete("Hello", {"stop_when": stop_when})
+        return prediction.result()
+
+    def test_strings_across_fragments(self) -> None:
+        result = self.complete({"strings": ["five", "ee fo"]})
+        self.assertEqual(result.content, "one two three four ")
+        self.assertEqual(result.stats.stop_reason, "userStopped")
+        self.assertEqual(self.server.counts["cancel"], 1)
+
+    def test_regex_and_budget(self) -> None:
+        self.assertEqual(
+            self.complete({"regex": r"th?re+"}).content, "one two three "
+        )
+        self.assertEqual(self.complete({"max_chars": 8}).content, "one two ")
+
+    def test_aho_corasick_overlapping(self) -> None:
+        matcher = AhoCorasick(["he", "she", "his", "hers"])
+        self.assertIsNone(matcher.feed("us"))
+        self.assertEqual(matcher.feed("hers"), "she")
@@ -0,0 +1,50 @@
+import json
+import unittest
+from lmstudio_sdk import JSONSchemaError
+from mock_case import SyncMockServerMixin
+
+DOCUMENT = {
+    "results": [{"id": i, "name": "item %d" % i} for i in range(5)],
+    "done": True,
+}
+SCHEMA = {
+    "type": "object",
+    "properties": {
+        "results": {
+            "type": "array",
+            "items": {
+                "type": "object",
+                "properties": {
+                    "id": {"type": "integer"},
+                    "name": {"type": "string"},
+                },
+                "required": ["id", "name"],
+            },
+        },
+        "done": {"type": "boolean"},
+    },
+}
+TEXT = json.dumps(DOCUMENT)
+
+
+class TestJSONStreaming(SyncMockServerMixin, unittest.TestCase):
+    server_kwargs = {
+        "fragments": [TEXT[i : i + 3] for i in range(0, len(TEXT), 3)]
+    }
+
+    def test_items_stream_as_they_close(self) -> None:
+        prediction = self.model.complete("Hello")
+        items = list(prediction.json_items(["results"], SCHEMA))
+        self.assertEqual(items, DOCUMENT["results"])
+
+    def test_partials_end_with_document(self) -> None:
+        prediction = self.model.complete("Hello")
+        partials = list(prediction.json_partials(SCHEMA))
+        self.assertGreater(len(partials), len(DOCUMENT["results"]))
+        self.assertEqual(partials[-1], DOCUMENT)
+
+    def test_schema_mismatch_raises_early(self) -> None:
+        schema = {"type": "object", "additionalProperties": False}
+        prediction = self.model.complete("Hello")
+        with self.assertRaises(JSONSchemaError):
+            list(prediction.json_items(schema=schema))
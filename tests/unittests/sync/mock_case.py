@@ -0,0 +1,34 @@
+from typing import Any, Dict, Optional, Tuple
+from lmstudio_sdk import LMStudioClient, SyncLMStudioClient
+from lmstudio_sdk.backend.handles import LLMDynamicHandle
+from lmstudio_sdk.mock import MockLMStudioServer
+
+
+class SyncMockServerMixin:
+    """Runs each test against a mock server and a sync client.
+
+    Mix into a `unittest.TestCase`. Before each test, `server`, `client`
+    and `model` (a handle to "mock-model") are set up with a
+    `MockLMStudioServer(**server_kwargs)`, which runs on a background
+    thread; set `server_kwargs` to None to call `start_mock` from the
+    tests instead.
+    """
+
+    server_kwargs: Optional[Dict[str, Any]] = {}
+
+    def setUp(self) -> None:
+        if self.server_kwargs is not None:
+            self.server, self.client, self.model = self.start_mock(
+                **self.server_kwargs
+            )
+
+    def start_mock(
+        self, **server_kwargs
+    ) -> Tuple[MockLMStudioServer, SyncLMStudioClient, LLMDynamicHandle]:
+        """Start a mock server and a client, stopped after the test."""
+        server = MockLMStudioServer(**server_kwargs)
+        server.start()
+        self.addCleanup(server.stop)
+        client = LMStudioClient(base_url=server.base_url)
+        self.addCleanup(client.close)
+        return server, client, client.llm.create_dynamic_handle("mock-model")
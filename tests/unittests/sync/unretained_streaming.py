@@ -0,0 +1,39 @@
+import tracemalloc
+import unittest
+from mock_case import SyncMockServerMixin
+
+NUM_FRAGMENTS = 5000
+FRAGMENT = "x" * 256
+
+
+class TestUnretainedStreaming(SyncMockServerMixin, unittest.TestCase):
+    server_kwargs = {
+        "num_fragments": NUM_FRAGMENTS,
+        "fragment": FRAGMENT,
+        "fragment_rate": 10000,
+    }
+
+    def stream(self, opts: dict):
+        """Stream a prediction, returning its result and peak memory."""
+        tracemalloc.start()
+        try:
+            prediction = self.model.complete("Hello", opts)
+            received = sum(len(fragment) for fragment in prediction)
+            result = prediction.result()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+        self.assertEqual(received, NUM_FRAGMENTS * len(FRAGMENT))
+        return result, peak
+
+    def test_unretained_memory_is_bounded(self) -> None:
+        retained, retained_peak = self.stream({})
+        unretained, unretained_peak = self.stream({"retain": False})
+        self.assertEqual(len(retained.content), NUM_FRAGMENTS * len(FRAGMENT))
+        self.assertIsNone(unretained.content)
+        self.assertEqual(
+            unretained.stats.predicted_tokens_count, NUM_FRAGMENTS
+        )
+        # the retained content alone is over a megabyte
+        self.assertLess(unretained_peak, NUM_FRAGMENTS * len(FRAGMENT) / 4)
+        self.assertLess(unretained_peak, retained_peak / 4)